@@ -0,0 +1,20 @@
+# gunicorn.conf.py
+# Usage: RECOMMENDER_PRELOAD_MODEL=true gunicorn -c gunicorn.conf.py internship_backend.wsgi
+
+import os
+import sys
+
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '2'))
+
+# Import the app (and, with RECOMMENDER_PRELOAD_MODEL=true, load + warm the model) in the master
+# before forking, so the model weights are shared copy-on-write between workers.
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Each worker gets its own slice of the CPU instead of every worker spawning one torch thread per core.
+    threads = os.environ.get('RECOMMENDER_TORCH_THREADS')
+    if threads and 'torch' in sys.modules:
+        import torch
+        torch.set_num_threads(int(threads))
@@ -12,5 +12,13 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'internship_backend.settings')
+os.environ.setdefault('RECOMMENDER_ASYNC_VIEWS', 'True')
+os.environ.setdefault('RECOMMENDER_MICRO_BATCHING', 'True')
 
 application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.RECOMMENDER_PRELOAD_MODEL:
+    from recommender import model_registry
+    model_registry.preload()
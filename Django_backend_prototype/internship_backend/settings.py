@@ -12,10 +12,16 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# The shared `matching` package (encoders, scoring) lives at the repository root, next to the scripts.
+# Appended, not prepended: the root's recommender.py script must not shadow the recommender app.
+if str(BASE_DIR.parent) not in sys.path:
+    sys.path.append(str(BASE_DIR.parent))
+
 load_dotenv(os.path.join(BASE_DIR, '.env'))
 
 # Quick-start development settings - unsuitable for production
@@ -45,6 +51,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Compresses responses for clients that send Accept-Encoding: gzip.
+    'django.middleware.gzip.GZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -129,3 +137,63 @@ STATICFILES_DIRS = [
 ]
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Recommender
+
+# Sentence embedding model used for internships and student profiles.
+RECOMMENDER_MODEL_NAME = os.environ.get('RECOMMENDER_MODEL_NAME', 'all-MiniLM-L6-v2')
+
+# How the model runs: torch, torch-int8, onnx, onnx-int8 (faster on CPU) or hashing (offline, for tests).
+# See matching/encoders.py. Each backend has its own fingerprint, so switching re-encodes the stored embeddings.
+RECOMMENDER_ENCODER_BACKEND = os.environ.get('RECOMMENDER_ENCODER_BACKEND', 'torch')
+
+# Load and warm the model when the WSGI/ASGI app is imported (e.g. in the gunicorn master with --preload)
+# instead of on the first request.
+RECOMMENDER_PRELOAD_MODEL = os.environ.get('RECOMMENDER_PRELOAD_MODEL', 'False').lower() == 'true'
+
+# The recommender app logs model preloads and catalog reloads to stderr, which gunicorn collects
+# alongside its own error log.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'recommender': {
+            'handlers': ['console'],
+            'level': os.environ.get('RECOMMENDER_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
+
+
+# Micro-batching of query encodes: concurrent requests wait up to RECOMMENDER_BATCH_MAX_WAIT_MS
+# (or until RECOMMENDER_BATCH_MAX_SIZE texts are queued) and are encoded in one model call.
+# Off by default: gunicorn's sync workers have one request in flight, so nothing would coalesce and
+# every request would only pay the wait. asgi.py switches it on; set it for threaded workers too.
+RECOMMENDER_MICRO_BATCHING = os.environ.get('RECOMMENDER_MICRO_BATCHING', 'False').lower() == 'true'
+RECOMMENDER_BATCH_MAX_SIZE = int(os.environ.get('RECOMMENDER_BATCH_MAX_SIZE', '32'))
+RECOMMENDER_BATCH_MAX_WAIT_MS = float(os.environ.get('RECOMMENDER_BATCH_MAX_WAIT_MS', '5'))
+
+# Serve `recommendations/` from an async view so concurrent requests can share a batch under ASGI
+# (sync views all run on one thread there). asgi.py switches this on.
+RECOMMENDER_ASYNC_VIEWS = os.environ.get('RECOMMENDER_ASYNC_VIEWS', 'False').lower() == 'true'
+
+# Responses of `recommendations/` are cached per canonical profile (skill/interest order and case do not
+# matter) and dropped when the catalog version changes. 'locmem' is a per-worker LRU of
+# RECOMMENDER_RESPONSE_CACHE_SIZE entries; 'django' uses CACHES[RECOMMENDER_RESPONSE_CACHE_ALIAS]
+# (e.g. Redis, shared by all workers); 'off' disables it. Hit rates are reported at `metrics/`.
+RECOMMENDER_RESPONSE_CACHE = os.environ.get('RECOMMENDER_RESPONSE_CACHE', 'locmem')
+RECOMMENDER_RESPONSE_CACHE_SIZE = int(os.environ.get('RECOMMENDER_RESPONSE_CACHE_SIZE', '1024'))
+RECOMMENDER_RESPONSE_CACHE_TTL = float(os.environ.get('RECOMMENDER_RESPONSE_CACHE_TTL', '300'))
+RECOMMENDER_RESPONSE_CACHE_ALIAS = os.environ.get('RECOMMENDER_RESPONSE_CACHE_ALIAS', 'default')
+
+# orjson-backed JSON for API responses (falls back to DRF's encoder when orjson is not installed).
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'recommender.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
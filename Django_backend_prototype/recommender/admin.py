@@ -1,6 +1,7 @@
 from django.contrib import admin
-from .models import Internship
+from .models import Internship, Location
 
 admin.site.register(Internship)
+admin.site.register(Location)
 
 # Register your models here.
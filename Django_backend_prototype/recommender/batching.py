@@ -0,0 +1,103 @@
+# recommender/batching.py
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+
+class MicroBatchEncoder:
+    """
+    Coalesces concurrent single-text encode calls into one batched model call.
+
+    Callers put their text on a queue and wait on a Future. A background thread takes the first
+    queued text, keeps collecting for up to `max_wait_ms` (or until `max_batch_size` texts are
+    waiting), encodes them all at once and hands each vector back to its caller. Blocking callers
+    (WSGI threads) use encode(); coroutines (ASGI) await encode_async().
+    """
+
+    def __init__(self, encode_batch, max_batch_size=32, max_wait_ms=5.0):
+        self.encode_batch = encode_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._worker_pid = None
+        self._batch_sizes = Counter()
+        self._items = 0
+        self._max_queue_depth = 0
+
+    def submit(self, text):
+        """Queues one text and returns a Future that resolves to its embedding."""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((text, future))
+        depth = self._queue.qsize()
+        if depth > self._max_queue_depth:
+            self._max_queue_depth = depth
+        return future
+
+    def encode(self, text, timeout=None):
+        return self.submit(text).result(timeout)
+
+    async def encode_async(self, text):
+        return await asyncio.wrap_future(self.submit(text))
+
+    def stats(self):
+        """Queue depth and batch-size histogram since the process started."""
+        batches = sum(self._batch_sizes.values())
+        return {
+            'queue_depth': self._queue.qsize(),
+            'max_queue_depth': self._max_queue_depth,
+            'batches': batches,
+            'items': self._items,
+            'mean_batch_size': (self._items / batches) if batches else 0.0,
+            'batch_size_histogram': {str(size): count for size, count in sorted(self._batch_sizes.items())},
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+        }
+
+    def _ensure_worker(self):
+        # Threads do not survive fork(), so a gunicorn worker starts its own after the fork.
+        if self._worker is not None and self._worker_pid == os.getpid():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker_pid == os.getpid():
+                return
+            if self._worker_pid != os.getpid():
+                self._queue = queue.Queue()
+            self._worker_pid = os.getpid()
+            self._worker = threading.Thread(target=self._run, name='micro-batch-encoder', daemon=True)
+            self._worker.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            self._batch_sizes[len(batch)] += 1
+            self._items += len(batch)
+            try:
+                vectors = self.encode_batch([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
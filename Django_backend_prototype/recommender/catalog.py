@@ -0,0 +1,231 @@
+# recommender/catalog.py
+
+import logging
+import threading
+import time
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from .models import Internship, CatalogState
+from .serializers import InternshipSerializer
+from . import embeddings
+from .skills import SkillIndex
+from .locations import LocationIndex, split_locations
+from .ranges import RangeIndex, parse_duration, parse_stipend
+
+logger = logging.getLogger(__name__)
+
+# Fields returned to the client, in the same order InternshipSerializer renders them.
+SERIALIZED_FIELDS = [
+    field.name for field in Internship._meta.concrete_fields
+    if field.name not in InternshipSerializer.Meta.exclude
+]
+
+# Numeric columns parsed from stipend/duration at ingest; each gets a sorted RangeIndex in the snapshot.
+RANGE_FIELDS = ['stipend_min', 'stipend_max', 'duration_months']
+
+# How often (in seconds) a worker asks the database whether the catalog changed.
+CHECK_INTERVAL = getattr(settings, 'RECOMMENDER_CATALOG_CHECK_SECONDS', 2.0)
+
+# Upper bound on the (profiles x internships) scores search_many holds at once: about 16 MB of float32
+# scores plus the top-k selection's indices, instead of growing with the batch and catalog size.
+SEARCH_BLOCK_SCORES = getattr(settings, 'RECOMMENDER_SEARCH_BLOCK_SCORES', 4 * 1024 * 1024)
+
+
+class CatalogSnapshot:
+    """
+    Read-only, in-memory copy of the Internship table.
+    Embeddings live in one contiguous float32 matrix and every other field is kept column by column,
+    so filtering, scoring and serialising the top results never touch the ORM.
+    """
+
+    def __init__(self, version, ids, matrix, columns, row_cities, wfh_flags, range_columns):
+        self.version = version
+        self.ids = ids
+        self.embeddings = matrix
+        self.columns = columns
+        self.location_index = LocationIndex(row_cities, wfh_flags)
+        self.skill_index = SkillIndex(columns['skills'])
+        self.range_indexes = {field: RangeIndex(values) for field, values in range_columns.items()}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def filter_rows(self, location=None, wfh_only=False, skill_ids=None, ranges=None):
+        """
+        Sorted positions of rows matching the location / work-from-home preference.
+        With `skill_ids`, rows must also share at least one skill with the student.
+        `ranges` maps a RANGE_FIELDS column to an inclusive (low, high, include_unknown) triple, either
+        bound None; each one narrows the candidates to their intersection with its sorted slice.
+        """
+        rows = self.location_index.rows(location, wfh_only)
+        for field, (low, high, include_unknown) in (ranges or {}).items():
+            rows = self.range_indexes[field].restrict(rows, low, high, include_unknown)
+        if skill_ids is not None:
+            rows = rows[self.skill_index.rows_with_any(skill_ids)[rows]]
+        return rows
+
+    def search(self, query_vector, rows=None, k=5):
+        """
+        Returns (positions, scores) of the k best rows for an L2-normalised query, best first.
+        `rows` (sorted positions from filter_rows) limits the search to those rows; only their embeddings
+        are multiplied, so a narrow filter costs O(len(rows)) instead of a product over the whole catalog.
+        """
+        candidates = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.int64)
+        if not candidates.size:
+            return candidates, np.empty(0, dtype=np.float32)
+        if rows is None or 2 * candidates.size > len(self):
+            # Gathering most of the matrix costs more than one contiguous product over all of it.
+            candidate_scores = (self.embeddings @ query_vector)[candidates]
+        else:
+            candidate_scores = self.embeddings[candidates] @ query_vector
+        if k < candidates.size:
+            best = np.argpartition(-candidate_scores, k - 1)[:k]
+        else:
+            best = np.arange(candidates.size)
+        best = best[np.argsort(-candidate_scores[best], kind='stable')]
+        return candidates[best], candidate_scores[best]
+
+    def search_many(self, query_matrix, masks=None, k=5):
+        """
+        Batched search: (profiles x internships) matrix products, then a per-row top-k.
+        `masks` is an optional sequence of one boolean row per profile (or a 2-d array); masked-out rows
+        never rank. Profiles are scored SEARCH_BLOCK_SCORES // len(self) at a time, so the score block
+        (and the mask rows stacked for it) stays the same size however large the batch or the catalog.
+        Returns one (positions, scores) pair per profile, best first.
+        """
+        if not len(self):
+            empty = np.empty(0, dtype=np.int64)
+            return [(empty, np.empty(0, dtype=np.float32)) for _ in range(len(query_matrix))]
+        step = max(1, SEARCH_BLOCK_SCORES // len(self))
+        results = []
+        for start in range(0, len(query_matrix), step):
+            block_masks = None if masks is None else np.vstack(masks[start:start + step])
+            results.extend(self._search_block(query_matrix[start:start + step], block_masks, k))
+        return results
+
+    def _search_block(self, query_matrix, masks, k):
+        scores = query_matrix @ self.embeddings.T
+        if masks is not None:
+            scores[~masks] = -np.inf
+        k = min(k, scores.shape[1])
+        if k < scores.shape[1]:
+            best = np.argpartition(scores, -k, axis=1)[:, -k:]
+        else:
+            best = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind='stable')
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        results = []
+        for positions, row_scores in zip(best, best_scores):
+            keep = np.isfinite(row_scores)
+            results.append((positions[keep], row_scores[keep]))
+        return results
+
+    def rows(self, positions):
+        """Serialises the given rows exactly like InternshipSerializer would."""
+        return [{field: self.columns[field][i] for field in SERIALIZED_FIELDS} for i in positions]
+
+
+def current_version():
+    state = CatalogState.objects.filter(pk=1).values_list('version', flat=True).first()
+    return state or 0
+
+
+def bump_catalog_version():
+    """Marks the catalog as changed; every worker reloads its snapshot on the next check."""
+    with transaction.atomic():
+        if not CatalogState.objects.filter(pk=1).update(version=F('version') + 1):
+            CatalogState.objects.create(pk=1, version=1)
+    _state['checked_at'] = 0.0
+
+
+def load_snapshot():
+    """Reads the whole catalog once and builds a fresh snapshot."""
+    version = current_version()
+    fingerprint = embeddings.model_fingerprint()
+    columns = {field: [] for field in SERIALIZED_FIELDS}
+    vectors = []
+    stale_positions = []
+    stale_texts = []
+    row_cities = []
+    wfh_flags = []
+    range_columns = {field: [] for field in RANGE_FIELDS}
+
+    cities_by_id = {}
+    for internship_id, city in Internship.locations.through.objects.values_list('internship_id', 'location__name').iterator():
+        cities_by_id.setdefault(internship_id, []).append(city)
+
+    queryset = Internship.objects.order_by('id').values_list(*SERIALIZED_FIELDS, *RANGE_FIELDS, 'is_wfh', 'embedding', 'embedding_model')
+    for position, row in enumerate(queryset.iterator(chunk_size=2000)):
+        record = dict(zip(SERIALIZED_FIELDS, row))
+        for field in SERIALIZED_FIELDS:
+            columns[field].append(record[field])
+
+        is_wfh = row[-3]
+        cities = cities_by_id.get(record['id'])
+        if cities is None and not is_wfh:
+            # Rows written by bulk paths that have not been normalised yet
+            cities, is_wfh = split_locations(record['location'])
+        row_cities.append(cities or [])
+        wfh_flags.append(is_wfh)
+
+        stipend_min, stipend_max, duration_months = row[len(SERIALIZED_FIELDS):len(SERIALIZED_FIELDS) + len(RANGE_FIELDS)]
+        if stipend_max is None and duration_months is None:
+            duration_months = parse_duration(record['duration'])
+            stipend_min, stipend_max = parse_stipend(record['stipend'], duration_months)
+        range_columns['stipend_min'].append(stipend_min)
+        range_columns['stipend_max'].append(stipend_max)
+        range_columns['duration_months'].append(duration_months)
+
+        blob, model_name = row[-2], row[-1]
+        if blob and model_name == fingerprint:
+            vectors.append(embeddings.from_bytes(blob))
+        else:
+            vectors.append(None)
+            stale_positions.append(position)
+            stale_texts.append(embeddings.internship_text(record['title'], record['skills'], record['interests'], record['description']))
+
+    # Rows saved before embeddings existed (or by an older model) are encoded here;
+    # `manage.py backfill_embeddings` persists them so reloads stay cheap.
+    if stale_positions:
+        logger.warning("Encoding %d internships without a stored embedding; run backfill_embeddings.", len(stale_positions))
+        for position, vector in zip(stale_positions, embeddings.encode(stale_texts)):
+            vectors[position] = vector
+
+    if vectors:
+        matrix = np.ascontiguousarray(np.vstack(vectors), dtype=np.float32)
+    else:
+        matrix = np.empty((0, 0), dtype=np.float32)
+    matrix.setflags(write=False)
+    ids = np.asarray(columns['id'], dtype=np.int64)
+    ids.setflags(write=False)
+    return CatalogSnapshot(version, ids, matrix, columns, row_cities, wfh_flags, range_columns)
+
+
+_lock = threading.Lock()
+_state = {'snapshot': None, 'checked_at': 0.0}
+
+
+def get_snapshot():
+    """
+    Returns the worker's current snapshot, reloading it when the catalog version moved on.
+    The version is checked at most every CHECK_INTERVAL seconds; the new snapshot is built
+    aside and swapped in with a single assignment, so in-flight requests keep the old one.
+    """
+    snapshot = _state['snapshot']
+    now = time.monotonic()
+    if snapshot is not None and now - _state['checked_at'] < CHECK_INTERVAL:
+        return snapshot
+
+    with _lock:
+        snapshot = _state['snapshot']
+        if snapshot is not None and time.monotonic() - _state['checked_at'] < CHECK_INTERVAL:
+            return snapshot
+        if snapshot is None or current_version() != snapshot.version:
+            snapshot = load_snapshot()
+            _state['snapshot'] = snapshot
+        _state['checked_at'] = time.monotonic()
+        return snapshot
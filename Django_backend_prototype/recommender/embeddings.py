@@ -0,0 +1,59 @@
+# recommender/embeddings.py
+
+import hashlib
+import numpy as np
+from django.conf import settings
+from .batching import MicroBatchEncoder
+from .model_registry import get_model
+
+
+def model_fingerprint():
+    """Identifies the model, backend and output size that produced a stored embedding."""
+    model = get_model()
+    return f"{model.fingerprint}:{model.get_sentence_embedding_dimension()}"
+
+
+def internship_text(title, skills, interests, description):
+    """Builds the text that gets embedded for an internship."""
+    return f"{skills} {interests} {title} {description}"
+
+
+def content_hash(text):
+    """Hashes the embedded text so unchanged rows can skip re-encoding."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def encode(texts, batch_size=64):
+    """Encodes texts into L2-normalised float32 vectors, so a dot product is the cosine similarity."""
+    vectors = get_model().encode(list(texts), batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+    return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+def to_bytes(vector):
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def from_bytes(blob):
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+# Concurrent requests' profile texts are encoded together instead of one forward pass each.
+query_encoder = MicroBatchEncoder(
+    encode,
+    max_batch_size=getattr(settings, 'RECOMMENDER_BATCH_MAX_SIZE', 32),
+    max_wait_ms=getattr(settings, 'RECOMMENDER_BATCH_MAX_WAIT_MS', 5.0),
+)
+
+
+def encode_query(text):
+    """Encodes one student profile, micro-batched with other requests when enabled."""
+    if getattr(settings, 'RECOMMENDER_MICRO_BATCHING', False):
+        return query_encoder.encode(text)
+    return encode([text])[0]
+
+
+async def encode_query_async(text):
+    if getattr(settings, 'RECOMMENDER_MICRO_BATCHING', False):
+        return await query_encoder.encode_async(text)
+    from asgiref.sync import sync_to_async
+    return await sync_to_async(encode_query, thread_sensitive=False)(text)
@@ -0,0 +1,140 @@
+# recommender/locations.py
+
+import re
+import numpy as np
+
+# Spellings of "work from home" seen in scraped listings and sent by the frontend.
+WFH_NAMES = {'work from home', 'work-from-home', 'wfh', 'remote'}
+
+_HYBRID = re.compile(r'\(\s*hybrid\s*\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def canonical_location(name):
+    """Lower-cased city name without the "(Hybrid)" marker, e.g. "Mumbai(Hybrid) " -> "mumbai"."""
+    return _WHITESPACE.sub(' ', _HYBRID.sub('', name or '')).strip().lower()
+
+
+def is_wfh_location(name):
+    return canonical_location(name) in WFH_NAMES
+
+
+def split_locations(raw):
+    """
+    Normalises a location string such as "Delhi, Mumbai(Hybrid), Work From Home".
+    Returns (cities, is_wfh): the distinct canonical cities, and whether the listing is work-from-home.
+    """
+    cities = {}
+    wfh = False
+    for part in (raw or '').split(','):
+        city = canonical_location(part)
+        if not city:
+            continue
+        if city in WFH_NAMES:
+            wfh = True
+        else:
+            cities.setdefault(city, None)
+    return list(cities), wfh
+
+
+def sync_internship_locations(internship):
+    """Points an internship's `locations` relation at the (created on demand) Location rows of its location string."""
+    sync_locations([internship])
+
+
+def sync_locations(internships):
+    """Bulk version of sync_internship_locations: a fixed number of queries for any number of saved internships."""
+    from .models import Internship, Location
+    cities_by_id = {internship.pk: split_locations(internship.location)[0] for internship in internships}
+    names = {city for cities in cities_by_id.values() for city in cities}
+
+    Location.objects.bulk_create([Location(name=name) for name in names], ignore_conflicts=True)
+    location_ids = dict(Location.objects.filter(name__in=names).values_list('name', 'id'))
+
+    Through = Internship.locations.through
+    Through.objects.filter(internship_id__in=cities_by_id).delete()
+    Through.objects.bulk_create([
+        Through(internship_id=internship_id, location_id=location_ids[city])
+        for internship_id, cities in cities_by_id.items() for city in cities
+    ])
+
+
+class LocationIndex:
+    """
+    In-memory location -> bitmap index over the catalog snapshot.
+
+    Each city (and work-from-home) owns a packed bitmap with one bit per catalog row, so a location
+    filter is a dictionary lookup plus a bitwise OR/AND over n/8 bytes, with no string scanning.
+    The sorted row positions behind every bitmap are kept too, so `rows` hands a filter its
+    candidates in O(matches) instead of unpacking n bits.
+    """
+
+    def __init__(self, row_cities, wfh_flags):
+        self.size = len(row_cities)
+        postings = {}
+        for position, cities in enumerate(row_cities):
+            for city in cities:
+                postings.setdefault(city, []).append(position)
+        self.postings = {city: self._frozen(rows) for city, rows in postings.items()}
+        self.bitmaps = {city: self._pack(rows) for city, rows in self.postings.items()}
+        wfh_flags = np.asarray(wfh_flags, dtype=bool)
+        self.wfh = np.packbits(wfh_flags)
+        self.wfh_rows = self._frozen(np.flatnonzero(wfh_flags))
+        self.everything = np.packbits(np.ones(self.size, dtype=bool))
+        self.all_rows = self._frozen(np.arange(self.size))
+        self._nothing = np.zeros_like(self.everything)
+        self._resolved = {}
+
+    @staticmethod
+    def _frozen(rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        rows.setflags(write=False)
+        return rows
+
+    def _pack(self, rows):
+        mask = np.zeros(self.size, dtype=bool)
+        mask[rows] = True
+        return np.packbits(mask)
+
+    def _lookup(self, location, wfh_only):
+        """(bitmap, sorted rows) matching the preference. "Any" (or nothing) matches every row."""
+        if wfh_only:
+            return self.wfh, self.wfh_rows
+        if not location or location == "Any":
+            return self.everything, self.all_rows
+        city = canonical_location(location)
+        if city in WFH_NAMES:
+            return self.wfh, self.wfh_rows
+        resolved = self._resolved.get(city)
+        if resolved is None:
+            resolved = self._resolve(city)
+        return resolved
+
+    def _resolve(self, city):
+        # Every known city containing the text, the exact one included ("delhi" -> "delhi" and "new delhi"),
+        # which keeps the old `location__icontains` behaviour. Resolved per distinct query, not per request.
+        bitmap = self._nothing
+        matched = []
+        for name, city_bitmap in self.bitmaps.items():
+            if city in name:
+                bitmap = bitmap | city_bitmap
+                matched.append(self.postings[name])
+        if len(matched) == 1:
+            rows = matched[0]
+        else:
+            rows = self._frozen(np.unique(np.concatenate(matched)) if matched else [])
+        resolved = (bitmap, rows)
+        if len(self._resolved) < 10000:
+            self._resolved[city] = resolved
+        return resolved
+
+    def bitmap(self, location=None, wfh_only=False):
+        """Packed bitmap of rows matching the preference. "Any" (or nothing) matches every row."""
+        return self._lookup(location, wfh_only)[0]
+
+    def rows(self, location=None, wfh_only=False):
+        """Sorted positions of rows matching the preference (read-only)."""
+        return self._lookup(location, wfh_only)[1]
+
+    def mask(self, location=None, wfh_only=False):
+        return np.unpackbits(self.bitmap(location, wfh_only), count=self.size).astype(bool)
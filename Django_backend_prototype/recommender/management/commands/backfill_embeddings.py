@@ -0,0 +1,58 @@
+# recommender/management/commands/backfill_embeddings.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from recommender.models import Internship
+from recommender import embeddings
+from recommender.catalog import bump_catalog_version
+
+EMBEDDING_FIELDS = ['embedding', 'embedding_hash', 'embedding_model']
+
+
+class Command(BaseCommand):
+    help = "Computes missing or stale Internship embeddings in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=256, help="Rows encoded per model call.")
+        parser.add_argument('--force', action='store_true', help="Re-encode every row, even if it is up to date.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        force = options['force']
+
+        fingerprint = embeddings.model_fingerprint()
+        pending = []
+        scanned = updated = 0
+
+        for internship in Internship.objects.order_by('id').iterator(chunk_size=batch_size):
+            scanned += 1
+            text = internship.embedding_text()
+            text_hash = embeddings.content_hash(text)
+            if (not force and internship.embedding and internship.embedding_model == fingerprint
+                    and internship.embedding_hash == text_hash):
+                continue
+            internship.embedding_hash = text_hash
+            internship.embedding_model = fingerprint
+            pending.append((internship, text))
+            if len(pending) >= batch_size:
+                updated += self._flush(pending, batch_size)
+                pending = []
+
+        if pending:
+            updated += self._flush(pending, batch_size)
+
+        # bulk_update skips post_save, so tell the workers' snapshots explicitly.
+        if updated:
+            bump_catalog_version()
+
+        self.stdout.write(self.style.SUCCESS(f"Scanned {scanned} internships, re-encoded {updated}."))
+
+    def _flush(self, pending, batch_size):
+        vectors = embeddings.encode([text for _, text in pending], batch_size=batch_size)
+        rows = []
+        for (internship, _), vector in zip(pending, vectors):
+            internship.embedding = embeddings.to_bytes(vector)
+            rows.append(internship)
+        with transaction.atomic():
+            Internship.objects.bulk_update(rows, EMBEDDING_FIELDS)
+        return len(rows)
@@ -0,0 +1,60 @@
+# recommender/management/commands/batch_recommend.py
+
+import json
+import os
+import sys
+import time
+from django.core.management.base import BaseCommand, CommandError
+from recommender.catalog import get_snapshot
+from recommender.payloads import RESULT_FIELDS, ROADMAP_MODES, parse_fields, render_batch_result
+from recommender.ranking import recommend_many
+from recommender.renderers import dumps
+
+
+def read_profiles(path):
+    """Yields profiles from a .jsonl file (one per line) or a .json file holding a list."""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.json'):
+            data = json.load(f)
+            yield from (data.get('profiles', []) if isinstance(data, dict) else data)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class Command(BaseCommand):
+    help = "Scores a file of student profiles against the catalog and writes one NDJSON line per profile."
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help="Profiles as .jsonl (one JSON object per line) or a .json list.")
+        parser.add_argument('--output', default='-', help="Where to write NDJSON results (default: stdout).")
+        parser.add_argument('--top-n', type=int, default=5, help="Recommendations per profile.")
+        parser.add_argument('--chunk-size', type=int, default=256, help="Profiles encoded and scored per batch.")
+        parser.add_argument('--fields', help=f"Comma-separated result fields to keep (any of: {', '.join(RESULT_FIELDS)}).")
+        parser.add_argument('--roadmaps', choices=ROADMAP_MODES, default='inline',
+                            help="'ref' writes each learning roadmap once per line instead of under every missing skill.")
+
+    def handle(self, *args, **options):
+        if not os.path.isfile(options['input']):
+            raise CommandError(f"Profiles file not found: {options['input']}")
+        try:
+            fields = parse_fields(options['fields'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        profiles = read_profiles(options['input'])
+
+        out = sys.stdout.buffer if options['output'] == '-' else open(options['output'], 'wb')
+        started = time.perf_counter()
+        count = 0
+        try:
+            results = recommend_many(get_snapshot(), profiles, top_n=options['top_n'], chunk_size=options['chunk_size'])
+            for result in results:
+                out.write(dumps(render_batch_result(result, fields, options['roadmaps'])) + b'\n')
+                count += 1
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+
+        elapsed = time.perf_counter() - started
+        self.stderr.write(self.style.SUCCESS(f"Scored {count} profiles in {elapsed:.2f}s ({count / max(elapsed, 1e-9):.1f} profiles/s)."))
@@ -0,0 +1,237 @@
+# recommender/management/commands/ingest_internships.py
+
+import csv
+import hashlib
+import itertools
+import json
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from recommender.models import Internship
+from recommender import embeddings
+from recommender.catalog import bump_catalog_version
+from recommender.locations import split_locations, sync_locations
+from recommender.signals import catalog_signals_disconnected
+
+# CSV header (case-insensitive) -> Internship field. Covers the scraper's CSV, its incremental log and the SIH copies.
+COLUMN_ALIASES = {
+    'title': 'title',
+    'company': 'company',
+    'location': 'location',
+    'locations': 'location',
+    'duration': 'duration',
+    'stipend': 'stipend',
+    'description': 'description',
+    'apply_link': 'apply_link',
+    'apply link': 'apply_link',
+    'link': 'apply_link',
+    'skills': 'skills',
+    'interests': 'interests',
+    'id': 'source_id',
+    'status': 'status',
+}
+
+# The scraped columns the fallback listing id is computed from, in scraping.incremental's order.
+ID_FIELDS = ['title', 'company', 'location', 'stipend', 'skills']
+CONTENT_FIELDS = ['title', 'company', 'location', 'duration', 'stipend', 'description', 'apply_link', 'skills', 'interests']
+EMBEDDING_FIELDS = ['embedding', 'embedding_hash', 'embedding_model']
+DERIVED_FIELDS = ['is_wfh', 'stipend_min', 'stipend_max', 'duration_months']
+
+EXPIRED = 'expired'
+
+# The scraper glues Internshala's "Actively hiring" badge onto the company name.
+_HIRING_BADGE = re.compile(r'\s*Actively hiring\s*$', re.IGNORECASE)
+
+
+def source_id(scraped):
+    """
+    Same fallback id as scraping.incremental.listing_id (a hash of the scraped ID_FIELDS values), so CSV and
+    incremental-log rows line up. Title + company alone would merge one role posted in several cities.
+    """
+    return 'h' + hashlib.sha1('\x1f'.join(scraped).encode('utf-8')).hexdigest()[:16]
+
+
+def legacy_source_id(title, company):
+    """The title + company fallback id of earlier ingests; such rows are re-keyed the next time they are seen."""
+    return 'h' + hashlib.sha1(f"{title}\x1f{company}".encode('utf-8')).hexdigest()[:16]
+
+
+def read_rows(path):
+    """Streams the CSV one dict at a time (utf-8-sig, so a BOM header does not break column names)."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        yield from csv.DictReader(f)
+
+
+def normalize(rows):
+    """Maps raw CSV rows onto Internship fields: aliased columns, trimmed values, max_length respected."""
+    max_lengths = {field: Internship._meta.get_field(field).max_length for field in CONTENT_FIELDS}
+    for raw in rows:
+        row = {field: '' for field in CONTENT_FIELDS}
+        status = ''
+        listing_id = None
+        for column, value in raw.items():
+            field = COLUMN_ALIASES.get((column or '').strip().lower())
+            value = (value or '').strip()
+            if field == 'status':
+                status = value.lower()
+            elif field == 'source_id':
+                listing_id = value or None
+            elif field:
+                row[field] = value
+        scraped = [row[field] for field in ID_FIELDS]
+        row['company'] = _HIRING_BADGE.sub('', row['company'])
+        if row['skills'] == 'N/A':
+            row['skills'] = ''
+        if not row['title']:
+            continue
+        for field, max_length in max_lengths.items():
+            if max_length and len(row[field]) > max_length:
+                row[field] = row[field][:max_length]
+        row['source_id'] = listing_id or source_id(scraped)
+        row['legacy_id'] = None if listing_id else legacy_source_id(row['title'], row['company'])
+        row['status'] = status
+        yield row
+
+
+def latest_in_batch(rows):
+    """
+    The last version of each listing within one batch, in input order. Only the batch is deduped:
+    batches are upserted in input order, so a later version in a later batch simply overwrites the
+    earlier one, and memory does not grow with the file.
+    """
+    last = {row['source_id']: position for position, row in enumerate(rows)}
+    return [row for position, row in enumerate(rows) if last[row['source_id']] == position]
+
+
+def batches(rows, size):
+    """Groups the stream into lists of `size`."""
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = "Streams a scraped internships CSV into the Internship table (parse, normalise, dedupe, bulk upsert)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help="internships.csv from scraper.py (plain or --incremental log).")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows upserted per transaction.")
+        parser.add_argument('--encode-batch-size', type=int, default=256, help="Texts per model forward pass.")
+        parser.add_argument('--delta', help="internships.delta.json from an incremental scrape: only apply those changes.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        self.encode_batch_size = options['encode_batch_size']
+        self.fingerprint = embeddings.model_fingerprint()
+        self.counts = dict.fromkeys(['read', 'created', 'updated', 'unchanged', 'deleted', 'encoded'], 0)
+
+        path = options['csv_path']
+        try:
+            # read_rows only opens the file once iterated, so check it up front.
+            open(path, 'rb').close()
+        except OSError as e:
+            raise CommandError(e)
+        rows = normalize(read_rows(path))
+
+        removed = []
+        if options['delta']:
+            try:
+                with open(options['delta'], encoding='utf-8') as f:
+                    delta = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read delta file {options['delta']}: {e}")
+            wanted = set(delta.get('added', [])) | set(delta.get('updated', []))
+            removed = delta.get('removed', [])
+            rows = (row for row in rows if row['source_id'] in wanted)
+
+        for batch in batches(rows, options['batch_size']):
+            self.counts['read'] += len(batch)
+            batch = latest_in_batch(batch)
+            with transaction.atomic():
+                self._upsert([row for row in batch if row['status'] != EXPIRED])
+                self._delete([row['source_id'] for row in batch if row['status'] == EXPIRED])
+
+        for start in range(0, len(removed), options['batch_size']):
+            with transaction.atomic():
+                self._delete(removed[start:start + options['batch_size']])
+
+        # bulk_create/bulk_update skip post_save, so invalidate the workers' snapshots once at the end.
+        if self.counts['created'] or self.counts['updated'] or self.counts['deleted']:
+            bump_catalog_version()
+
+        elapsed = time.perf_counter() - started
+        c = self.counts
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {c['read']} rows in {elapsed:.1f}s: {c['created']} created, {c['updated']} updated, "
+            f"{c['unchanged']} unchanged, {c['deleted']} deleted, {c['encoded']} re-encoded."
+        ))
+
+    def _upsert(self, rows):
+        existing = Internship.objects.in_bulk([row['source_id'] for row in rows], field_name='source_id')
+        legacy = Internship.objects.in_bulk(
+            [row['legacy_id'] for row in rows if row['legacy_id'] and row['source_id'] not in existing],
+            field_name='source_id',
+        )
+        created, updated, relocated, pending = [], [], [], []
+
+        for row in rows:
+            internship = existing.get(row['source_id'])
+            rekeyed = False
+            if internship is None and row['legacy_id'] in legacy:
+                # Stored under the old title + company id: the first listing that maps to it takes it over.
+                internship = legacy.pop(row['legacy_id'])
+                internship.source_id = row['source_id']
+                rekeyed = True
+            if internship is None:
+                internship = Internship(source_id=row['source_id'], **{f: row[f] for f in CONTENT_FIELDS})
+                created.append(internship)
+                relocated.append(internship)
+            else:
+                changed = [f for f in CONTENT_FIELDS if getattr(internship, f) != row[f]]
+                if not changed and not rekeyed:
+                    if internship.embedding_model == self.fingerprint and internship.embedding:
+                        self.counts['unchanged'] += 1
+                        continue
+                for field in changed:
+                    setattr(internship, field, row[field])
+                updated.append(internship)
+                if 'location' in changed:
+                    relocated.append(internship)
+
+            internship.is_wfh = split_locations(internship.location)[1]
+            internship.parse_ranges()
+            text = internship.embedding_text()
+            text_hash = embeddings.content_hash(text)
+            if (not internship.embedding or internship.embedding_hash != text_hash
+                    or internship.embedding_model != self.fingerprint):
+                internship.embedding_hash = text_hash
+                internship.embedding_model = self.fingerprint
+                pending.append((internship, text))
+
+        # One large encode call per batch instead of one forward pass per saved row.
+        if pending:
+            vectors = embeddings.encode([text for _, text in pending], batch_size=self.encode_batch_size)
+            for (internship, _), vector in zip(pending, vectors):
+                internship.embedding = embeddings.to_bytes(vector)
+            self.counts['encoded'] += len(pending)
+
+        if created:
+            Internship.objects.bulk_create(created)
+        if updated:
+            Internship.objects.bulk_update(updated, CONTENT_FIELDS + EMBEDDING_FIELDS + DERIVED_FIELDS + ['source_id'])
+        if relocated:
+            sync_locations(relocated)
+        self.counts['created'] += len(created)
+        self.counts['updated'] += len(updated)
+
+    def _delete(self, source_ids):
+        if source_ids:
+            # Without the per-row post_delete receiver; handle() bumps the catalog version once at the end.
+            with catalog_signals_disconnected():
+                deleted, per_model = Internship.objects.filter(source_id__in=source_ids).delete()
+            self.counts['deleted'] += per_model.get(Internship._meta.label, 0)
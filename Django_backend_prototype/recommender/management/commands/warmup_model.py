@@ -0,0 +1,18 @@
+# recommender/management/commands/warmup_model.py
+
+from django.core.management.base import BaseCommand
+from recommender import model_registry
+
+
+class Command(BaseCommand):
+    help = "Loads the sentence embedding model, runs a dummy encode and reports how long each step took."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', default=None, help="Model name (defaults to RECOMMENDER_MODEL_NAME).")
+
+    def handle(self, *args, **options):
+        name = options['model'] or model_registry.DEFAULT_MODEL_NAME
+        result = model_registry.warmup(name)
+        self.stdout.write(self.style.SUCCESS(
+            f"{name}: loaded in {result.get('load_seconds', 0.0):.2f}s, warmed up in {result['warmup_seconds']:.2f}s"
+        ))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommender', '0002_remove_internship_match_reason'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='internship',
+            name='embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='embedding_hash',
+            field=models.CharField(blank=True, editable=False, help_text='SHA-256 of the embedded text', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='embedding_model',
+            field=models.CharField(blank=True, editable=False, help_text='Model fingerprint of the embedding', max_length=200),
+        ),
+    ]
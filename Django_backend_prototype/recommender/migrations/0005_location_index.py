@@ -0,0 +1,73 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:13
+
+import re
+
+from django.db import migrations, models
+
+# A frozen copy of recommender.locations.split_locations as it was when this migration was written,
+# so later changes to the app code cannot change what this migration does.
+WFH_NAMES = {'work from home', 'work-from-home', 'wfh', 'remote'}
+_HYBRID = re.compile(r'\(\s*hybrid\s*\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def split_locations(raw):
+    cities = {}
+    wfh = False
+    for part in (raw or '').split(','):
+        city = _WHITESPACE.sub(' ', _HYBRID.sub('', part)).strip().lower()
+        if not city:
+            continue
+        if city in WFH_NAMES:
+            wfh = True
+        else:
+            cities.setdefault(city, None)
+    return list(cities), wfh
+
+
+def normalise_existing_locations(apps, schema_editor):
+    Internship = apps.get_model('recommender', 'Internship')
+    Location = apps.get_model('recommender', 'Location')
+    Through = Internship.locations.through
+
+    internships = list(Internship.objects.only('location'))
+    cities_by_id = {}
+    for internship in internships:
+        cities_by_id[internship.pk], internship.is_wfh = split_locations(internship.location)
+    Internship.objects.bulk_update(internships, ['is_wfh'], batch_size=1000)
+
+    names = {city for cities in cities_by_id.values() for city in cities}
+    Location.objects.bulk_create([Location(name=name) for name in names], ignore_conflicts=True)
+    location_ids = dict(Location.objects.values_list('name', 'id'))
+    Through.objects.bulk_create([
+        Through(internship_id=internship_id, location_id=location_ids[city])
+        for internship_id, cities in cities_by_id.items() for city in cities
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommender', '0004_catalogstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='is_wfh',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='locations',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='internships', to='recommender.location'),
+        ),
+        migrations.RunPython(normalise_existing_locations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommender', '0005_location_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='internship',
+            name='source_id',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:02
+
+import re
+
+from django.db import migrations, models
+
+# A frozen copy of recommender.ranges.parse_duration/parse_stipend as they were when this migration
+# was written, so later changes to the app code cannot change what this migration does.
+_AMOUNT = re.compile(r'\d[\d,]*(?:\.\d+)?')
+_PER_MONTH = {'week': 52 / 12, 'month': 1, 'year': 1 / 12}
+_UNPAID = ('no stipend', 'unpaid')
+_DURATION = re.compile(r'(\d+(?:\.\d+)?)(?:\s*(?:-|to)\s*(\d+(?:\.\d+)?))?\s*(day|week|month|year)s?', re.IGNORECASE)
+_MONTHS_PER = {'day': 12 / 365, 'week': 12 / 52, 'month': 1, 'year': 12}
+
+
+def parse_duration(raw):
+    match = _DURATION.search(raw or '')
+    if not match:
+        return None
+    low, high, unit = match.groups()
+    return round(float(high or low) * _MONTHS_PER[unit.lower()], 2)
+
+
+def parse_stipend(raw, duration_months=None):
+    text = (raw or '').strip().lower()
+    if text.startswith(_UNPAID):
+        return 0, 0
+    amounts = [float(amount.replace(',', '')) for amount in _AMOUNT.findall(text.split('+')[0])[:2]]
+    if not amounts:
+        return None, None
+    if 'lump' in text:
+        if not duration_months:
+            return None, None
+        factor = 1 / duration_months
+    else:
+        factor = next((per_month for unit, per_month in _PER_MONTH.items() if unit in text), 1)
+    low, high = min(amounts) * factor, max(amounts) * factor
+    return int(round(low)), int(round(high))
+
+
+def parse_existing_ranges(apps, schema_editor):
+    Internship = apps.get_model('recommender', 'Internship')
+    internships = list(Internship.objects.only('stipend', 'duration'))
+    for internship in internships:
+        internship.duration_months = parse_duration(internship.duration)
+        internship.stipend_min, internship.stipend_max = parse_stipend(internship.stipend, internship.duration_months)
+    Internship.objects.bulk_update(internships, ['stipend_min', 'stipend_max', 'duration_months'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommender', '0006_internship_source_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='internship',
+            name='duration_months',
+            field=models.FloatField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='stipend_max',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='stipend_min',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(parse_existing_ranges, migrations.RunPython.noop),
+    ]
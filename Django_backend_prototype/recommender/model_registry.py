@@ -0,0 +1,68 @@
+# recommender/model_registry.py
+
+import logging
+import threading
+import time
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = getattr(settings, 'RECOMMENDER_MODEL_NAME', 'all-MiniLM-L6-v2')
+ENCODER_BACKEND = getattr(settings, 'RECOMMENDER_ENCODER_BACKEND', 'torch')
+
+_models = {}
+_timings = {}
+_lock = threading.Lock()
+
+
+def get_model(name=None):
+    """
+    Returns the encoder for model `name` on RECOMMENDER_ENCODER_BACKEND, loading it on first use.
+    torch / onnxruntime are imported here rather than at module import,
+    so migrate/shell/test runs never pay for them.
+    """
+    name = name or DEFAULT_MODEL_NAME
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _models.get(name)
+        if model is None:
+            started = time.perf_counter()
+            from matching.encoders import load_encoder
+            model = load_encoder(name, ENCODER_BACKEND)
+            _timings.setdefault(name, {})['load_seconds'] = time.perf_counter() - started
+            _models[name] = model
+    return model
+
+
+def is_loaded(name=None):
+    return (name or DEFAULT_MODEL_NAME) in _models
+
+
+def warmup(name=None):
+    """Loads the model (if needed) and runs a dummy encode so the first real request is not slow."""
+    name = name or DEFAULT_MODEL_NAME
+    model = get_model(name)
+    started = time.perf_counter()
+    model.encode(["warmup python communication"], convert_to_numpy=True)
+    _timings[name]['warmup_seconds'] = time.perf_counter() - started
+    return timings(name)
+
+
+def timings(name=None):
+    """Load and warmup durations (in seconds) recorded for a model."""
+    return dict(_timings.get(name or DEFAULT_MODEL_NAME, {}))
+
+
+def preload():
+    """
+    Loads and warms the default model in the current process. Called from wsgi/asgi when
+    RECOMMENDER_PRELOAD_MODEL is set, so under `gunicorn --preload` the weights are loaded once
+    in the master and shared copy-on-write by every forked worker.
+    """
+    result = warmup()
+    logger.info("Preloaded %s: loaded in %.2fs, warmed up in %.2fs",
+                DEFAULT_MODEL_NAME, result.get('load_seconds', 0.0), result['warmup_seconds'])
+    return result
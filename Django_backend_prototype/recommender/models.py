@@ -1,6 +1,14 @@
 # recommender/models.py
 from django.db import models
 
+class Location(models.Model):
+    """A canonical (lower-cased) city an internship can be based in."""
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
 class Internship(models.Model):
     title = models.CharField(max_length=200)
     company = models.CharField(max_length=200)
@@ -12,5 +20,73 @@ class Internship(models.Model):
     skills = models.CharField(max_length=255, help_text="Comma-separated skills")
     interests = models.CharField(max_length=255, help_text="Comma-separated interests")
 
+    # Listing id from the scraper (or a hash of title + company), used to upsert on re-ingest.
+    source_id = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
+
+    # Normalised form of `location`, kept in sync on save.
+    locations = models.ManyToManyField(Location, related_name='internships', blank=True, editable=False)
+    is_wfh = models.BooleanField(default=False, db_index=True, editable=False)
+
+    # Numeric forms of `stipend` (rupees per month) and `duration`, kept in sync on save; None when unparseable.
+    stipend_min = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
+    stipend_max = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
+    duration_months = models.FloatField(null=True, blank=True, db_index=True, editable=False)
+
+    # Precomputed sentence embedding of title/skills/interests/description.
+    embedding = models.BinaryField(null=True, blank=True, editable=False)
+    embedding_hash = models.CharField(max_length=64, blank=True, editable=False, help_text="SHA-256 of the embedded text")
+    embedding_model = models.CharField(max_length=200, blank=True, editable=False, help_text="Model fingerprint of the embedding")
+
+    def __str__(self):
+        return self.title
+
+    def embedding_text(self):
+        from . import embeddings
+        return embeddings.internship_text(self.title, self.skills, self.interests, self.description)
+
+    def embedding_is_stale(self):
+        """True when the stored embedding is missing or no longer matches the content/model."""
+        from . import embeddings
+        return (
+            not self.embedding
+            or self.embedding_model != embeddings.model_fingerprint()
+            or self.embedding_hash != embeddings.content_hash(self.embedding_text())
+        )
+
+    def refresh_embedding(self, force=False):
+        """Re-encodes the internship only if the embedded fields (or the model) changed."""
+        from . import embeddings
+        if not force and not self.embedding_is_stale():
+            return False
+        text = self.embedding_text()
+        self.embedding = embeddings.to_bytes(embeddings.encode([text])[0])
+        self.embedding_hash = embeddings.content_hash(text)
+        self.embedding_model = embeddings.model_fingerprint()
+        return True
+
+    def parse_ranges(self):
+        """Fills stipend_min/stipend_max/duration_months from the free-text stipend and duration."""
+        from .ranges import parse_duration, parse_stipend
+        self.duration_months = parse_duration(self.duration)
+        self.stipend_min, self.stipend_max = parse_stipend(self.stipend, self.duration_months)
+
+    def save(self, *args, **kwargs):
+        from .locations import split_locations
+        update_fields = kwargs.get('update_fields')
+        extra_fields = set()
+        if self.refresh_embedding():
+            extra_fields |= {'embedding', 'embedding_hash', 'embedding_model'}
+        self.is_wfh = split_locations(self.location)[1]
+        self.parse_ranges()
+        extra_fields |= {'is_wfh', 'stipend_min', 'stipend_max', 'duration_months'}
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | extra_fields
+        super().save(*args, **kwargs)
+
+
+class CatalogState(models.Model):
+    """Single-row counter bumped whenever the Internship catalog changes."""
+    version = models.PositiveBigIntegerField(default=0)
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f"catalog v{self.version}"
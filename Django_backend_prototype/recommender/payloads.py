@@ -0,0 +1,67 @@
+# recommender/payloads.py
+
+from .catalog import SERIALIZED_FIELDS
+from .ranking import ROADMAPS
+
+# Fields enrich_results adds to every serialised internship.
+ENRICHED_FIELDS = ['match_percentage', 'match_reason', 'missing_skills']
+RESULT_FIELDS = SERIALIZED_FIELDS + ENRICHED_FIELDS
+
+ROADMAP_MODES = ('inline', 'ref')
+
+
+def parse_fields(raw):
+    """
+    Sparse fieldset from a `?fields=title,company,...` parameter: the list of fields to return,
+    or None (every field) when the parameter is absent or empty. Unknown fields raise ValueError.
+    """
+    if not raw:
+        return None
+    fields = [field.strip() for field in raw.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in RESULT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def parse_roadmaps(raw):
+    """`?roadmaps=inline` (default) repeats each roadmap under its skill; `ref` sends each one once."""
+    mode = raw or 'inline'
+    if mode not in ROADMAP_MODES:
+        raise ValueError(f"Unknown roadmaps mode {mode!r}; expected one of {', '.join(ROADMAP_MODES)}")
+    return mode
+
+
+def render_results(results, fields=None, roadmaps='inline'):
+    """
+    Turns enrich_results output into the response payload.
+
+    With `fields`, each result carries only those keys. With roadmaps='inline' the payload is the
+    list of results, every missing skill holding its roadmap steps; with 'ref' it is
+    {"results": [...], "roadmaps": {key: steps}}, missing skills holding just the key.
+    The input (which may be a cached response) is never modified.
+    """
+    rendered = []
+    used = {}
+    for result in results:
+        keep = result.keys() if fields is None else [field for field in fields if field in result]
+        item = {field: result[field] for field in keep}
+        if 'missing_skills' in item:
+            missing = []
+            for entry in item['missing_skills']:
+                key = entry['roadmap']
+                used[key] = ROADMAPS[key]
+                missing.append({**entry, 'roadmap': key if roadmaps == 'ref' else ROADMAPS[key]})
+            item['missing_skills'] = missing
+        rendered.append(item)
+
+    if roadmaps == 'ref':
+        return {'results': rendered, 'roadmaps': used}
+    return rendered
+
+
+def render_batch_result(result, fields=None, roadmaps='inline'):
+    """render_results for one recommend_many line, leaving its index/id/error keys as they are."""
+    if 'recommendations' not in result:
+        return result
+    return {**result, 'recommendations': render_results(result['recommendations'], fields, roadmaps)}
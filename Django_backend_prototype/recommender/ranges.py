@@ -0,0 +1,82 @@
+# recommender/ranges.py
+
+import re
+import numpy as np
+
+# Internshala quotes stipends per month, week or year, or as a lump sum for the whole internship.
+_AMOUNT = re.compile(r'\d[\d,]*(?:\.\d+)?')
+_PER_MONTH = {'week': 52 / 12, 'month': 1, 'year': 1 / 12}
+_UNPAID = ('no stipend', 'unpaid')
+
+_DURATION = re.compile(r'(\d+(?:\.\d+)?)(?:\s*(?:-|to)\s*(\d+(?:\.\d+)?))?\s*(day|week|month|year)s?', re.IGNORECASE)
+# Months per duration unit.
+_MONTHS_PER = {'day': 12 / 365, 'week': 12 / 52, 'month': 1, 'year': 12}
+
+
+def parse_duration(raw):
+    """Months an internship lasts, from text such as "3 Months", "6 Weeks" or "2-3 Months" (the longer end). None if unknown."""
+    match = _DURATION.search(raw or '')
+    if not match:
+        return None
+    low, high, unit = match.groups()
+    return round(float(high or low) * _MONTHS_PER[unit.lower()], 2)
+
+
+def parse_stipend(raw, duration_months=None):
+    """
+    Monthly stipend range in rupees, (min, max), from text such as "₹ 5,000-8,000 /month",
+    "₹ 10,000 /month +Incentives" or "No Stipend" (0, 0). A lump sum is spread over `duration_months`
+    when that is known. (None, None) when the text carries no usable amount ("Performance based").
+    """
+    text = (raw or '').strip().lower()
+    if text.startswith(_UNPAID):
+        return 0, 0
+    # Amounts before any "+ incentives" part; "5,000-8,000" gives both ends of the range.
+    amounts = [float(amount.replace(',', '')) for amount in _AMOUNT.findall(text.split('+')[0])[:2]]
+    if not amounts:
+        return None, None
+    if 'lump' in text:
+        if not duration_months:
+            return None, None
+        factor = 1 / duration_months
+    else:
+        factor = next((per_month for unit, per_month in _PER_MONTH.items() if unit in text), 1)
+    low, high = min(amounts) * factor, max(amounts) * factor
+    return int(round(low)), int(round(high))
+
+
+class RangeIndex:
+    """
+    Sorted copy of one numeric column of the catalog snapshot.
+
+    Rows are ordered by value once, at snapshot build, so a range filter is two binary searches
+    (np.searchsorted, O(log n)) that return the matching rows as one contiguous slice of `order`.
+    Rows with an unknown value are kept apart in `unknown` and only match when asked to.
+    """
+
+    def __init__(self, values):
+        values = np.asarray([np.nan if value is None else value for value in values], dtype=np.float64)
+        self.size = len(values)
+        missing = np.isnan(values)
+        known = np.flatnonzero(~missing)
+        order = np.argsort(values[known], kind='stable')
+        self.order = known[order]
+        self.values = values[self.order]
+        self.unknown = np.flatnonzero(missing)
+
+    def rows_between(self, low=None, high=None, include_unknown=False):
+        """Positions whose value lies in [low, high]; either bound may be None (open)."""
+        start = 0 if low is None else np.searchsorted(self.values, low, side='left')
+        end = len(self.values) if high is None else np.searchsorted(self.values, high, side='right')
+        rows = self.order[start:max(start, end)]
+        return np.concatenate([rows, self.unknown]) if include_unknown else rows
+
+    def restrict(self, candidates, low=None, high=None, include_unknown=False):
+        """
+        The sorted `candidates` positions whose value lies in [low, high], still sorted. The matching
+        slice is scattered into a row mask and the candidates are looked up in it: O(slice + candidates),
+        with no sort.
+        """
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.rows_between(low, high, include_unknown)] = True
+        return candidates[mask[candidates]]
@@ -0,0 +1,208 @@
+# recommender/ranking.py
+
+import math
+import numpy as np
+from . import embeddings
+from .skills import canonical_skill, canonical_skills
+
+# A simple dictionary to hold pre-found YouTube tutorial links for skills
+YOUTUBE_TUTORIALS = {
+    'python': 'https://www.youtube.com/watch?v=eWRfhZUzrAc',
+    'java': 'https://www.youtube.com/watch?v=grEKMHGYCs8',
+    'marketing': 'https://www.youtube.com/watch?v=nU-IIXBWlS4',
+    'sales': 'https://www.youtube.com/watch?v=bSa0_Vp3o_M',
+    'ms office': 'https://www.youtube.com/watch?v=2-h6t4p6a_g',
+    'data analysis': 'https://www.youtube.com/watch?v=rCG36C4d3g8',
+    'communication': 'https://www.youtube.com/watch?v=Jwyb7I_3R2Y',
+    'teamwork': 'https://www.youtube.com/watch?v=s8a8aV3w7pU',
+    # Add other skills and links as needed
+}
+
+def get_youtube_link(skill):
+    """Finds a relevant YouTube link for a given skill."""
+    # Simple lookup, can be expanded with more advanced search if needed
+    return YOUTUBE_TUTORIALS.get(canonical_skill(skill), "https://www.youtube.com/results?search_query=how+to+learn+" + skill)
+
+def generate_learning_roadmap():
+    """Generates a generic learning roadmap."""
+    return [
+        "1. **Understand the Fundamentals:** Start with beginner tutorials to grasp the basic concepts.",
+        "2. **Hands-On Practice:** Apply what you've learned by working on small projects or exercises.",
+        "3. **Build a Project:** Create a simple, complete project to solidify your understanding.",
+        "4. **Seek Feedback:** Share your work with others to get constructive feedback and improve.",
+        "5. **Contribute & Collaborate:** Join online communities or contribute to open-source projects to learn from others."
+    ]
+
+# Learning roadmaps by key. Results refer to a roadmap by its key; payloads.render_results either
+# inlines the steps or sends each roadmap once in a table next to the results.
+ROADMAPS = {
+    'generic': generate_learning_roadmap(),
+}
+
+def roadmap_key(skill):
+    """Key in ROADMAPS of the roadmap for a missing skill (every skill shares the generic one for now)."""
+    return 'generic'
+
+def _optional_number(value):
+    """A numeric filter bound from the request body; missing or blank means no bound."""
+    if value is None or value == '':
+        return None
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"Not a finite number: {value!r}")
+    return number
+
+def profile_ranges(profile):
+    """
+    The profile's stipend/duration bounds as CatalogSnapshot.filter_rows ranges: a listing qualifies
+    when the top of its stipend range reaches `min_stipend` and it lasts at most `max_duration` months.
+    Listings with no known duration still qualify (the scraped CSV has no Duration column);
+    listings with no usable stipend ("Performance based") do not.
+    """
+    ranges = {}
+    if profile.get('min_stipend') is not None:
+        ranges['stipend_max'] = (profile['min_stipend'], None, False)
+    if profile.get('max_duration') is not None:
+        ranges['duration_months'] = (None, profile['max_duration'], True)
+    return ranges
+
+def _string_list(user_data, key):
+    """A list-of-strings field of the request body (skills, interests); missing means empty."""
+    values = user_data.get(key, [])
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise ValueError(f"{key} must be a list of strings")
+    return values
+
+def _optional_of(user_data, key, kind):
+    """A field that must be of type `kind` when present (None means not set)."""
+    value = user_data.get(key)
+    if value is not None and not isinstance(value, kind):
+        raise ValueError(f"{key} must be a {kind.__name__}")
+    return value
+
+def parse_profile(user_data):
+    """
+    Pulls the student's preferences out of the request body. The embedded `text` is built from the
+    canonical skills and interests, so profiles the response cache treats as equal (see
+    response_cache.canonical_profile) also get the same query vector. Fields of the wrong type raise
+    ValueError, so one malformed profile in a batch gets its own error line.
+    """
+    user_skills = _string_list(user_data, 'skills')
+    user_interests = _string_list(user_data, 'interests')
+    return {
+        'skills': user_skills,
+        'interests': user_interests,
+        'location': _optional_of(user_data, 'location', str),
+        'wfh_only': _optional_of(user_data, 'wfhOnly', bool),
+        'skill_match_only': bool(user_data.get('skillMatchOnly')),
+        'min_stipend': _optional_number(user_data.get('minStipend')),
+        'max_duration': _optional_number(user_data.get('maxDurationMonths')),
+        'text': ' '.join(canonical_skills(user_skills)) + ' ' + ' '.join(canonical_skills(user_interests)),
+    }
+
+def profile_rows(snapshot, profile):
+    """Rows the profile may be recommended: location/WFH and stipend/duration, plus (optionally) at least one shared skill."""
+    skill_ids = snapshot.skill_index.lookup(profile['skills']) if profile['skill_match_only'] else None
+    return snapshot.filter_rows(location=profile['location'], wfh_only=profile['wfh_only'], skill_ids=skill_ids,
+                                ranges=profile_ranges(profile))
+
+def profile_mask(snapshot, profile):
+    """profile_rows as a boolean mask over the catalog, for the batched search."""
+    mask = np.zeros(len(snapshot), dtype=bool)
+    mask[profile_rows(snapshot, profile)] = True
+    return mask
+
+def build_recommendations(snapshot, rows, user_profile_embedding, user_skills, top_n=5):
+    """Ranks the candidate rows against the profile embedding and enriches the top results."""
+    # Embeddings are L2-normalised, so one matrix-vector product gives every cosine similarity.
+    top_internships_indices, _ = snapshot.search(user_profile_embedding, rows, k=top_n)
+
+    return enrich_results(snapshot, top_internships_indices, user_skills)
+
+def enrich_results(snapshot, positions, user_skills):
+    """
+    Serialises the given catalog rows and adds match percentage, match reason and resources for missing skills.
+    Roadmaps are left as ROADMAPS keys; payloads.render_results turns them into the response format.
+    """
+    response_data = snapshot.rows(positions)
+    skill_index = snapshot.skill_index
+    user_skill_ids = skill_index.lookup(user_skills)
+
+    for position, internship_data in zip(positions, response_data):
+        matching_ids, missing_ids = skill_index.match(position, user_skill_ids)
+        internship_skill_count = len(matching_ids) + len(missing_ids)
+        matching_skills = skill_index.names_of(matching_ids)
+        missing_skills = skill_index.names_of(missing_ids)
+        match_percentage = int((len(matching_ids) / internship_skill_count) * 100) if internship_skill_count else 0
+
+        # Generate a more detailed match reason
+        reason = f"This internship is a great fit because it aligns with your interest in **{internship_data.get('interests', 'various sectors')}**."
+        if matching_skills:
+            reason += f" It also matches your skills in **{', '.join(matching_skills)}**."
+
+
+        internship_data['match_percentage'] = match_percentage
+        internship_data['match_reason'] = reason
+        internship_data['missing_skills'] = [
+            {
+                'skill': skill.title(),
+                'youtube_link': get_youtube_link(skill),
+                'roadmap': roadmap_key(skill)
+            } for skill in missing_skills
+        ]
+
+    return response_data
+
+def recommend_many(snapshot, profiles, top_n=5, chunk_size=256):
+    """
+    Scores many student profiles against the catalog, yielding one result per profile in input order.
+    Profiles are consumed `chunk_size` at a time: each chunk is encoded in one batch and ranked with a
+    single matrix product, with each profile's location/WFH preference applied as a row mask.
+    """
+    chunk = []
+    for index, user_data in enumerate(profiles):
+        chunk.append((index, user_data))
+        if len(chunk) >= chunk_size:
+            yield from _recommend_chunk(snapshot, chunk, top_n)
+            chunk = []
+    if chunk:
+        yield from _recommend_chunk(snapshot, chunk, top_n)
+
+def _recommend_chunk(snapshot, chunk, top_n):
+    parsed = []
+    for index, user_data in chunk:
+        try:
+            parsed.append((index, user_data, parse_profile(user_data)))
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            parsed.append((index, user_data, e))
+
+    valid = [(index, user_data, profile) for index, user_data, profile in parsed if isinstance(profile, dict)]
+    results = {}
+    if valid:
+        # Profiles in a batch usually share a handful of filters, so each distinct one is built once.
+        masks_by_filter = {}
+        masks = []
+        for _, _, profile in valid:
+            if profile['skill_match_only']:
+                masks.append(profile_mask(snapshot, profile))
+                continue
+            key = (profile['location'], bool(profile['wfh_only']), profile['min_stipend'], profile['max_duration'])
+            if key not in masks_by_filter:
+                masks_by_filter[key] = profile_mask(snapshot, profile)
+            masks.append(masks_by_filter[key])
+
+        query_matrix = embeddings.encode([profile['text'] for _, _, profile in valid])
+        # Left as a list of (shared) rows: search_many stacks only the rows of the block it is scoring.
+        ranked = snapshot.search_many(query_matrix, masks, k=top_n)
+        for (index, _, profile), (positions, _) in zip(valid, ranked):
+            results[index] = enrich_results(snapshot, positions, profile['skills'])
+
+    for index, user_data, profile in parsed:
+        result = {'index': index}
+        if isinstance(user_data, dict) and 'id' in user_data:
+            result['id'] = user_data['id']
+        if index in results:
+            result['recommendations'] = results[index]
+        else:
+            result['error'] = 'Invalid profile provided. Please check your input.'
+        yield result
@@ -0,0 +1,173 @@
+# recommender/response_cache.py
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from .locations import canonical_location
+from .skills import canonical_skills
+
+
+def canonical_profile(profile):
+    """
+    The parts of a parsed profile that decide its recommendations, in a form that ignores skill order,
+    case, whitespace and duplicates: ["Python", "sql "] and ["SQL", "python"] are the same request.
+    """
+    return {
+        'skills': canonical_skills(profile['skills']),
+        'interests': canonical_skills(profile['interests']),
+        'location': canonical_location(profile['location']) if isinstance(profile['location'], str) else None,
+        'wfh_only': bool(profile['wfh_only']),
+        'skill_match_only': profile['skill_match_only'],
+        'min_stipend': profile.get('min_stipend'),
+        'max_duration': profile.get('max_duration'),
+    }
+
+
+def cache_key(catalog_version, profile, top_n=5):
+    """
+    Cache key for a profile's response. The catalog version is part of the key, so entries computed
+    against an older catalog can never be served once the catalog changes.
+    """
+    payload = json.dumps([catalog_version, top_n, canonical_profile(profile)], separators=(',', ':'))
+    return 'recommendations:' + hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class LocMemResponseCache:
+    """Per-process LRU of responses, bounded to `max_entries`, each entry living at most `ttl` seconds."""
+
+    def __init__(self, max_entries=1024, ttl=300.0):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, catalog_version):
+        """Drops every entry once the catalog moves to a new version (they could never be hit again)."""
+        if catalog_version == self._version:
+            return
+        with self._lock:
+            if catalog_version != self._version:
+                self.evictions += len(self._entries)
+                self._entries.clear()
+                self._version = catalog_version
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': 'locmem',
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            'evictions': self.evictions,
+        }
+
+
+class DjangoResponseCache:
+    """
+    Responses stored in one of Django's CACHES (e.g. Redis or Memcached), shared by every worker.
+    Size and eviction are the cache backend's; stale catalog versions simply stop being looked up.
+    Hit/miss counters are per process.
+    """
+
+    def __init__(self, alias='default', ttl=300.0):
+        self.alias = alias
+        self.ttl = float(ttl)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def get(self, key):
+        value = self.cache.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.cache.set(key, value, timeout=self.ttl)
+
+    def invalidate(self, catalog_version):
+        pass
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': f'django:{self.alias}',
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+def build_response_cache():
+    """The cache selected by RECOMMENDER_RESPONSE_CACHE ('locmem', 'django' or 'off'), or None when off."""
+    backend = getattr(settings, 'RECOMMENDER_RESPONSE_CACHE', 'locmem')
+    ttl = getattr(settings, 'RECOMMENDER_RESPONSE_CACHE_TTL', 300.0)
+    if backend == 'locmem':
+        return LocMemResponseCache(getattr(settings, 'RECOMMENDER_RESPONSE_CACHE_SIZE', 1024), ttl)
+    if backend == 'django':
+        return DjangoResponseCache(getattr(settings, 'RECOMMENDER_RESPONSE_CACHE_ALIAS', 'default'), ttl)
+    if backend == 'off':
+        return None
+    raise ValueError(f"Unknown RECOMMENDER_RESPONSE_CACHE {backend!r}; expected locmem, django or off")
+
+
+response_cache = build_response_cache()
+
+
+def lookup(snapshot, profile):
+    """
+    Returns (key, cached response or None) for `profile` against `snapshot`'s catalog version.
+    Cached responses are shared between requests: callers must not mutate them.
+    """
+    if response_cache is None:
+        return None, None
+    response_cache.invalidate(snapshot.version)
+    key = cache_key(snapshot.version, profile)
+    return key, response_cache.get(key)
+
+
+def store(key, response_data):
+    if response_cache is not None and key is not None:
+        response_cache.set(key, response_data)
+
+
+def stats():
+    return response_cache.stats() if response_cache is not None else {'backend': 'off'}
@@ -6,5 +6,8 @@ from .models import Internship
 class InternshipSerializer(serializers.ModelSerializer):
     class Meta:
         model = Internship
-        # Explicitly list the fields you want to expose in your API
-        fields = '__all__'
\ No newline at end of file
+        # Everything except the columns derived at save time for ranking and filtering: the stored embedding
+        # and its hash/model fingerprint, the normalised locations/is_wfh, the ingest source_id and the parsed
+        # stipend/duration ranges. Clients get the original location, stipend and duration strings instead.
+        exclude = ['embedding', 'embedding_hash', 'embedding_model', 'locations', 'is_wfh', 'source_id',
+                   'stipend_min', 'stipend_max', 'duration_months']
\ No newline at end of file
@@ -0,0 +1,36 @@
+# recommender/signals.py
+
+from contextlib import contextmanager
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Internship
+from .catalog import bump_catalog_version
+from .locations import sync_internship_locations
+
+
+@receiver(post_save, sender=Internship)
+def internship_saved(sender, instance, update_fields=None, **kwargs):
+    """Keeps the normalised locations in sync, then invalidates the in-memory catalog snapshots."""
+    if update_fields is None or 'location' in update_fields:
+        sync_internship_locations(instance)
+    bump_catalog_version()
+
+
+@receiver(post_delete, sender=Internship)
+def internship_deleted(sender, **kwargs):
+    bump_catalog_version()
+
+
+@contextmanager
+def catalog_signals_disconnected():
+    """
+    Suspends the receivers above, for bulk writers (ingest_internships) that sync locations and bump
+    the catalog version once themselves instead of once per row.
+    """
+    post_save.disconnect(internship_saved, sender=Internship)
+    post_delete.disconnect(internship_deleted, sender=Internship)
+    try:
+        yield
+    finally:
+        post_save.connect(internship_saved, sender=Internship)
+        post_delete.connect(internship_deleted, sender=Internship)
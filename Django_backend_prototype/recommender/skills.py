@@ -0,0 +1,82 @@
+# recommender/skills.py
+
+import re
+import numpy as np
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def canonical_skill(skill):
+    """Lower-cases a skill and collapses whitespace, so "MS  Office" and "ms office" are the same skill."""
+    return _WHITESPACE.sub(' ', skill).strip().lower()
+
+
+def canonical_skills(skills):
+    """Sorted, de-duplicated canonical forms of a list of skills, blanks dropped: order and case do not matter."""
+    return sorted({canonical_skill(skill) for skill in skills} - {''})
+
+
+def split_skills(skills):
+    """Splits a comma-separated skill string into canonical skills (multi-word skills stay whole)."""
+    seen = {}
+    for skill in (skills or '').split(','):
+        skill = canonical_skill(skill)
+        if skill:
+            seen.setdefault(skill, None)
+    return list(seen)
+
+
+class SkillIndex:
+    """
+    Canonical skill dictionary for the catalog, built once when the snapshot is loaded.
+
+    Every distinct skill gets an integer id; each internship keeps a sorted array of its skill ids,
+    and each skill keeps a posting list of the catalog rows that ask for it. Matching a student
+    against an internship is then integer set arithmetic instead of string splitting.
+    """
+
+    def __init__(self, skill_strings):
+        self.ids = {}
+        self.names = []
+        row_skill_ids = []
+        postings = []
+        for position, skills in enumerate(skill_strings):
+            row = []
+            for skill in split_skills(skills):
+                skill_id = self.ids.get(skill)
+                if skill_id is None:
+                    skill_id = self.ids[skill] = len(self.names)
+                    self.names.append(skill)
+                    postings.append([])
+                row.append(skill_id)
+                postings[skill_id].append(position)
+            row_skill_ids.append(np.array(sorted(row), dtype=np.int32))
+        self.row_skill_ids = row_skill_ids
+        self.postings = [np.array(rows, dtype=np.int32) for rows in postings]
+
+    def __len__(self):
+        return len(self.row_skill_ids)
+
+    def lookup(self, skills):
+        """Sorted ids of the given skills (a list or a comma-separated string) that appear in the catalog."""
+        if isinstance(skills, str):
+            skills = [skills]
+        ids = {self.ids.get(canonical_skill(part)) for skill in skills for part in skill.split(',')}
+        ids.discard(None)
+        return np.array(sorted(ids), dtype=np.int32)
+
+    def match(self, position, student_ids):
+        """(matching ids, missing ids) for one catalog row, both in the row's skill order."""
+        row = self.row_skill_ids[position]
+        present = np.isin(row, student_ids, assume_unique=True)
+        return row[present], row[~present]
+
+    def rows_with_any(self, student_ids):
+        """Boolean mask of catalog rows that share at least one skill with the student."""
+        mask = np.zeros(len(self), dtype=bool)
+        for skill_id in student_ids:
+            mask[self.postings[skill_id]] = True
+        return mask
+
+    def names_of(self, skill_ids):
+        return [self.names[skill_id] for skill_id in skill_ids]
@@ -125,11 +125,14 @@ function getCookie(name) {
 const csrftoken = getCookie('csrftoken');
 
 // --- Recommendation Logic ---
+// Only the fields the cards and the details modal show, with each learning roadmap sent once.
+const RESULT_FIELDS = 'title,company,location,duration,stipend,description,apply_link,match_percentage,match_reason,missing_skills';
+
 const fetchRecommendations = (userData) => {
     wizardForm.classList.add('hidden');
     loader.classList.remove('hidden');
 
-    fetch(apiUrl, {
+    fetch(`${apiUrl}?fields=${RESULT_FIELDS}&roadmaps=ref`, {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
@@ -143,7 +146,11 @@ const fetchRecommendations = (userData) => {
     })
     .then(data => {
         loader.classList.add('hidden');
-        displayResults(data);
+        // Missing skills refer to their roadmap by key; resolve them against the roadmap table.
+        data.results.forEach(internship => {
+            internship.missing_skills.forEach(item => { item.roadmap = data.roadmaps[item.roadmap]; });
+        });
+        displayResults(data.results);
     })
     .catch(error => {
         console.error('Error fetching recommendations:', error);
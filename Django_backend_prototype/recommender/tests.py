@@ -1,3 +1,694 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+
+from . import catalog, embeddings, model_registry, response_cache
+from .batching import MicroBatchEncoder
+from .locations import LocationIndex, split_locations
+from .management.commands.ingest_internships import legacy_source_id
+from .models import CatalogState, Internship
+from .payloads import parse_fields, parse_roadmaps, render_results
+from .ranges import RangeIndex, parse_duration, parse_stipend
+from .ranking import ROADMAPS, parse_profile
+from .response_cache import LocMemResponseCache, cache_key
+from .skills import SkillIndex, split_skills
+
+
+def make_internship(title, location='Mumbai', skills='python', **fields):
+    values = {
+        'company': 'Acme', 'duration': '3 Months', 'stipend': '₹ 10,000 /month', 'description': 'Work on live projects.',
+        'apply_link': 'https://example.com/apply', 'interests': 'Technology',
+    }
+    values.update(fields)
+    return Internship.objects.create(title=title, location=location, skills=skills, **values)
+
+
+class RecommenderTestCase(TestCase):
+    """Runs on the offline hashing encoder, with no snapshot or cached response left over from another test."""
+
+    def setUp(self):
+        for patcher in (
+            mock.patch.object(model_registry, 'ENCODER_BACKEND', 'hashing'),
+            mock.patch.dict(model_registry._models, clear=True),
+            mock.patch.object(response_cache, 'response_cache', response_cache.LocMemResponseCache()),
+            mock.patch.dict(catalog._state, {'snapshot': None, 'checked_at': 0.0}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class BatchRecommendationsViewTests(RecommenderTestCase):
+    url = '/recommendations/batch/'
+
+    def setUp(self):
+        super().setUp()
+        make_internship('Python Developer')
+        make_internship('Sales Intern', location='Delhi', skills='sales')
+
+    def post(self, body, query=''):
+        return self.client.post(self.url + query, json.dumps(body), content_type='application/json')
+
+    def lines(self, response):
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    def test_streams_one_line_per_profile(self):
+        response = self.post({'profiles': [{'id': 'a', 'skills': ['python']}, {'id': 'b', 'skills': ['sales']}]}, '?top_n=1')
+        self.assertEqual(response.status_code, 200)
+        lines = self.lines(response)
+        self.assertEqual([line['id'] for line in lines], ['a', 'b'])
+        self.assertEqual([len(line['recommendations']) for line in lines], [1, 1])
+
+    def test_invalid_profile_gets_an_error_line(self):
+        lines = self.lines(self.post([{'skills': ['python']}, 5]))
+        self.assertIn('recommendations', lines[0])
+        self.assertIn('error', lines[1])
+
+    def test_profile_with_fields_of_the_wrong_type_gets_an_error_line(self):
+        bad = [{'skills': ['python'], 'location': ['Delhi']}, {'skills': ['python'], 'location': {'city': 'Delhi'}},
+               {'skills': ['python'], 'wfhOnly': 'yes'}, {'skills': 'python'}, {'skills': ['python'], 'interests': [1]}]
+        lines = self.lines(self.post([{'id': 'ok', 'skills': ['python']}, *bad, {'id': 'last', 'skills': ['sales']}]))
+        self.assertEqual(len(lines), len(bad) + 2)
+        self.assertIn('recommendations', lines[0])
+        self.assertTrue(all('error' in line for line in lines[1:-1]))
+        self.assertEqual(lines[-1]['id'], 'last')
+        self.assertIn('recommendations', lines[-1])
+
+    def test_rejects_a_body_that_is_not_a_list_of_profiles(self):
+        for body in (5, 'python', {'profiles': 5}):
+            with self.subTest(body=body):
+                self.assertEqual(self.post(body).status_code, 400)
+
+    def test_rejects_top_n_below_one_or_not_an_integer(self):
+        for top_n in ('0', '-1', 'two', '1.5'):
+            with self.subTest(top_n=top_n):
+                self.assertEqual(self.post([{'skills': ['python']}], f'?top_n={top_n}').status_code, 400)
+
+
+class SkillIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = SkillIndex(['Python, SQL', 'MS  Office, python', '', 'Sales'])
+
+    def test_split_skills_canonicalises_and_deduplicates(self):
+        self.assertEqual(split_skills(' Python ,MS  Office, python,,'), ['python', 'ms office'])
+
+    def test_postings_list_the_rows_of_each_skill(self):
+        self.assertEqual(self.index.postings[self.index.ids['python']].tolist(), [0, 1])
+        self.assertEqual(self.index.postings[self.index.ids['ms office']].tolist(), [1])
+        self.assertEqual(self.index.row_skill_ids[2].tolist(), [])
+
+    def test_lookup_ignores_case_order_and_unknown_skills(self):
+        self.assertEqual(self.index.lookup(['SQL', 'python', 'cooking']).tolist(), sorted([self.index.ids['sql'], self.index.ids['python']]))
+        self.assertEqual(self.index.lookup('sales, Python').tolist(), sorted([self.index.ids['sales'], self.index.ids['python']]))
+
+    def test_match_splits_a_row_into_matching_and_missing_skills(self):
+        matching, missing = self.index.match(0, self.index.lookup(['python']))
+        self.assertEqual(self.index.names_of(matching), ['python'])
+        self.assertEqual(self.index.names_of(missing), ['sql'])
+
+    def test_rows_with_any(self):
+        self.assertEqual(self.index.rows_with_any(self.index.lookup(['sql', 'sales'])).tolist(), [True, False, False, True])
+        self.assertFalse(self.index.rows_with_any(self.index.lookup([])).any())
+
+
+class LocationIndexTests(SimpleTestCase):
+    def setUp(self):
+        locations = ['Delhi', 'New Delhi, Mumbai(Hybrid)', 'Work From Home', 'Pune, Work From Home', '']
+        cities, wfh = zip(*(split_locations(location) for location in locations))
+        self.index = LocationIndex(cities, wfh)
+
+    def test_split_locations(self):
+        self.assertEqual(split_locations('Delhi, Mumbai(Hybrid), Work From Home, delhi'), (['delhi', 'mumbai'], True))
+        self.assertEqual(split_locations(' Pune '), (['pune'], False))
+        self.assertEqual(split_locations(''), ([], False))
+
+    def test_exact_city_also_matches_cities_containing_it(self):
+        self.assertEqual(self.index.mask('Delhi').tolist(), [True, True, False, False, False])
+        self.assertEqual(self.index.mask('new delhi').tolist(), [False, True, False, False, False])
+
+    def test_hybrid_marker_and_case_are_ignored(self):
+        self.assertEqual(self.index.mask('MUMBAI (Hybrid)').tolist(), [False, True, False, False, False])
+
+    def test_work_from_home(self):
+        expected = [False, False, True, True, False]
+        self.assertEqual(self.index.mask(wfh_only=True).tolist(), expected)
+        self.assertEqual(self.index.mask('Remote').tolist(), expected)
+        self.assertEqual(self.index.mask('Pune', wfh_only=True).tolist(), expected)
+
+    def test_any_location_and_unknown_city(self):
+        self.assertTrue(self.index.mask('Any').all())
+        self.assertTrue(self.index.mask(None).all())
+        self.assertFalse(self.index.mask('Chennai').any())
+
+    def test_rows_agree_with_the_mask(self):
+        for location, wfh_only in [('Delhi', False), ('new delhi', False), ('Mumbai', False), ('Pune', True),
+                                   ('Remote', False), ('Any', False), (None, False), ('Chennai', False)]:
+            with self.subTest(location=location, wfh_only=wfh_only):
+                rows = self.index.rows(location, wfh_only)
+                self.assertEqual(rows.tolist(), np.flatnonzero(self.index.mask(location, wfh_only)).tolist())
+                self.assertFalse(rows.flags.writeable)
+
+
+class ProductSizes(np.ndarray):
+    """Embedding matrix that records how many rows each matrix-vector product multiplies."""
+    sizes = []
+
+    def __matmul__(self, other):
+        ProductSizes.sizes.append(self.shape[0])
+        return np.asarray(self) @ other
+
+
+class CatalogSearchTests(SimpleTestCase):
+    def setUp(self):
+        count = 200
+        matrix = np.random.default_rng(0).standard_normal((count, 16)).astype(np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.snapshot = catalog.CatalogSnapshot(
+            1, np.arange(count), matrix.view(ProductSizes), {'skills': [''] * count}, [[]] * count, [False] * count,
+            {field: [None] * count for field in catalog.RANGE_FIELDS},
+        )
+        self.query = matrix[0]
+        self.scores = matrix @ self.query
+        ProductSizes.sizes = []
+
+    def brute_force(self, rows, k):
+        return rows[np.argsort(-self.scores[rows], kind='stable')[:k]]
+
+    def test_sparse_rows_multiply_only_the_candidates(self):
+        rows = np.arange(3, 200, 20)
+        positions, scores = self.snapshot.search(self.query, rows, k=5)
+        self.assertEqual(positions.tolist(), self.brute_force(rows, 5).tolist())
+        np.testing.assert_allclose(scores, self.scores[positions], rtol=1e-6)
+        self.assertEqual(ProductSizes.sizes, [len(rows)])
+
+    def test_dense_rows_and_no_rows(self):
+        rows = np.arange(1, 200)
+        positions, _ = self.snapshot.search(self.query, rows, k=5)
+        self.assertEqual(positions.tolist(), self.brute_force(rows, 5).tolist())
+        positions, _ = self.snapshot.search(self.query, k=5)
+        self.assertEqual(positions.tolist(), self.brute_force(np.arange(200), 5).tolist())
+        self.assertEqual(ProductSizes.sizes, [200, 200])
+
+    def test_empty_rows(self):
+        positions, scores = self.snapshot.search(self.query, np.empty(0, dtype=np.int64), k=5)
+        self.assertEqual((positions.size, scores.size), (0, 0))
+        self.assertEqual(ProductSizes.sizes, [])
+
+    def test_search_many_in_blocks_matches_search(self):
+        queries = np.asarray(self.snapshot.embeddings[:7])
+        masks = [np.arange(200) % (i + 2) == 0 for i in range(7)]
+        masks[3] = np.zeros(200, dtype=bool)
+        expected = [self.snapshot.search(query, np.flatnonzero(mask), k=5) for query, mask in zip(queries, masks)]
+        for block in (200, 3 * 200, 10 ** 6):
+            with self.subTest(block=block), mock.patch.object(catalog, 'SEARCH_BLOCK_SCORES', block):
+                ranked = self.snapshot.search_many(queries, masks, k=5)
+                self.assertEqual([positions.tolist() for positions, _ in ranked],
+                                 [positions.tolist() for positions, _ in expected])
+                for (_, scores), (_, expected_scores) in zip(ranked, expected):
+                    np.testing.assert_allclose(scores, expected_scores, rtol=1e-5)
+        unmasked = self.snapshot.search_many(queries, k=5)
+        self.assertEqual(unmasked[0][0].tolist(), self.brute_force(np.arange(200), 5).tolist())
+
+
+class InternshipLocationSyncTests(RecommenderTestCase):
+    def test_save_keeps_locations_and_wfh_in_sync(self):
+        internship = make_internship('Designer', location='Delhi, Work From Home')
+        self.assertTrue(internship.is_wfh)
+        self.assertEqual(list(internship.locations.values_list('name', flat=True)), ['delhi'])
+        internship.location = 'Pune'
+        internship.save()
+        internship.refresh_from_db()
+        self.assertFalse(internship.is_wfh)
+        self.assertEqual(list(internship.locations.values_list('name', flat=True)), ['pune'])
+
+
+class InternshipEmbeddingTests(RecommenderTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(embeddings, 'encode', wraps=embeddings.encode)
+        self.encode = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_save_encodes_a_new_row(self):
+        internship = make_internship('Python Developer')
+        self.assertEqual(self.encode.call_count, 1)
+        self.assertEqual(internship.embedding_hash, embeddings.content_hash(internship.embedding_text()))
+        self.assertEqual(internship.embedding_model, embeddings.model_fingerprint())
+        self.assertFalse(internship.embedding_is_stale())
+
+    def test_save_with_unchanged_embedded_fields_does_not_re_encode(self):
+        internship = make_internship('Python Developer')
+        self.encode.reset_mock()
+        internship = Internship.objects.get(pk=internship.pk)
+        internship.location = 'Pune'
+        internship.stipend = 'No Stipend'
+        internship.save()
+        self.assertEqual(self.encode.call_count, 0)
+
+    def test_changing_an_embedded_field_re_encodes(self):
+        internship = make_internship('Python Developer')
+        for field, value in (('title', 'Django Developer'), ('skills', 'python, sql'), ('description', 'Build APIs.')):
+            with self.subTest(field=field):
+                old_hash, old_embedding = internship.embedding_hash, bytes(internship.embedding)
+                self.encode.reset_mock()
+                setattr(internship, field, value)
+                internship.save()
+                internship.refresh_from_db()
+                self.assertEqual(self.encode.call_count, 1)
+                self.assertNotEqual(internship.embedding_hash, old_hash)
+                self.assertNotEqual(bytes(internship.embedding), old_embedding)
+                self.assertEqual(internship.embedding_hash, embeddings.content_hash(internship.embedding_text()))
+
+    def test_backfill_encodes_only_missing_and_stale_rows(self):
+        fresh = make_internship('Python Developer')
+        missing = make_internship('Sales Intern', skills='sales')
+        stale = make_internship('Designer', skills='figma')
+        other_model = make_internship('Writer', skills='blogging')
+        # queryset.update() skips save(), like rows written before embeddings existed
+        Internship.objects.filter(pk=missing.pk).update(embedding=None, embedding_hash='')
+        Internship.objects.filter(pk=stale.pk).update(skills='figma, photoshop')
+        Internship.objects.filter(pk=other_model.pk).update(embedding_model='another-model:384')
+        self.encode.reset_mock()
+
+        out = io.StringIO()
+        call_command('backfill_embeddings', stdout=out)
+        self.assertIn('Scanned 4 internships, re-encoded 3.', out.getvalue())
+        self.assertEqual(self.encode.call_count, 1)
+        encoded = self.encode.call_args.args[0]
+        self.assertEqual(sorted(encoded), sorted(Internship.objects.get(pk=pk).embedding_text()
+                                                 for pk in (missing.pk, stale.pk, other_model.pk)))
+        self.assertFalse(any(internship.embedding_is_stale() for internship in Internship.objects.all()))
+        self.assertNotIn(fresh.embedding_text(), encoded)
+
+        self.encode.reset_mock()
+        call_command('backfill_embeddings', stdout=io.StringIO())
+        self.assertEqual(self.encode.call_count, 0)
+
+
+class IngestInternshipsTests(RecommenderTestCase):
+    header = ['Title', 'Company', 'Location', 'Stipend', 'Skills']
+
+    def write_csv(self, rows, header=None):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(header or self.header)
+            writer.writerows(rows)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def ingest(self, *args):
+        out = io.StringIO()
+        call_command('ingest_internships', *args, '--batch-size', '2', stdout=out)
+        return out.getvalue()
+
+    def test_same_role_in_two_cities_stays_two_listings(self):
+        path = self.write_csv([
+            ['Delegate Acquisition', 'Times Internet', 'Mumbai', 'No Stipend', 'Sales'],
+            ['Delegate Acquisition', 'Times Internet', 'Gurgaon(Hybrid)', 'No Stipend', 'Sales'],
+        ])
+        self.ingest(path)
+        self.assertEqual(sorted(Internship.objects.values_list('location', flat=True)), ['Gurgaon(Hybrid)', 'Mumbai'])
+
+    def test_duplicates_across_batches_are_ingested_once_and_reruns_change_nothing(self):
+        row = ['Python Developer', 'Acme', 'Pune', '₹ 10,000 /month', 'Python']
+        path = self.write_csv([row, ['Sales', 'Acme', 'Delhi', 'No Stipend', 'Sales'], ['Design', 'Acme', 'Delhi', 'No Stipend', 'Figma'], row])
+        self.assertIn('3 created, 0 updated', self.ingest(path))
+        self.assertEqual(Internship.objects.count(), 3)
+        # The copy in the second batch is only compared against the row the first batch wrote.
+        self.assertIn('0 created, 0 updated, 4 unchanged, 0 deleted, 0 re-encoded', self.ingest(path))
+
+    def test_the_last_version_of_a_listing_wins_within_and_across_batches(self):
+        header = self.header + ['Id', 'Status']
+        path = self.write_csv([
+            ['Role', 'Acme', 'Pune', 'No Stipend', 'Python', '1', 'active'],
+            ['Role', 'Acme', 'Pune', 'No Stipend', 'Python, SQL', '1', 'active'],
+            ['Other', 'Acme', 'Delhi', 'No Stipend', 'Sales', '2', 'active'],
+            ['Role', 'Acme', 'Mumbai', 'No Stipend', 'Python, SQL', '1', 'active'],
+            ['Other', 'Acme', 'Delhi', 'No Stipend', 'Sales', '2', 'expired'],
+        ], header)
+        self.assertIn('Read 5 rows', self.ingest(path))
+        self.assertEqual(list(Internship.objects.values_list('source_id', 'location', 'skills')), [('1', 'Mumbai', 'Python, SQL')])
+
+    def test_rows_stored_under_the_title_company_id_are_rekeyed(self):
+        old = make_internship('Python Developer', location='Pune', company='Acme', source_id=legacy_source_id('Python Developer', 'Acme'))
+        path = self.write_csv([['Python Developer', 'Acme', 'Pune', '₹ 10,000 /month', 'Python'],
+                               ['Python Developer', 'Acme', 'Delhi', '₹ 10,000 /month', 'Python']])
+        self.assertIn('1 created, 1 updated', self.ingest(path))
+        old.refresh_from_db()
+        self.assertNotEqual(old.source_id, legacy_source_id('Python Developer', 'Acme'))
+        self.assertEqual(Internship.objects.count(), 2)
+
+    def test_expired_listings_bump_the_catalog_version_once(self):
+        header = self.header + ['Id', 'Status']
+        listings = [[f'Role {i}', 'Acme', 'Pune', 'No Stipend', 'Python', str(i), 'active'] for i in range(4)]
+        self.ingest(self.write_csv(listings, header))
+        version = CatalogState.objects.get(pk=1).version
+        expired = [row[:6] + ['expired'] for row in listings[:3]]
+        self.assertIn('3 deleted', self.ingest(self.write_csv(expired, header)))
+        self.assertEqual(CatalogState.objects.get(pk=1).version, version + 1)
+        self.assertEqual(Internship.objects.count(), 1)
+
+    def test_missing_files_are_command_errors(self):
+        with self.assertRaises(CommandError):
+            self.ingest('/nonexistent/internships.csv')
+        with self.assertRaises(CommandError):
+            self.ingest(self.write_csv([]), '--delta', '/nonexistent/internships.delta.json')
+
+
+class ResponseCacheKeyTests(SimpleTestCase):
+    def key(self, version=1, top_n=5, **profile):
+        return cache_key(version, parse_profile({'skills': [], 'interests': [], **profile}), top_n)
+
+    def test_skill_order_case_whitespace_and_duplicates_do_not_matter(self):
+        self.assertEqual(self.key(skills=['Python', 'sql '], interests=['Tech']),
+                         self.key(skills=['SQL', 'python', 'Python'], interests=['tech']))
+        self.assertEqual(self.key(location='Mumbai (Hybrid)'), self.key(location=' mumbai'))
+
+    def test_anything_that_changes_the_ranking_changes_the_key(self):
+        base = self.key(skills=['python'])
+        for other in (self.key(version=2, skills=['python']), self.key(top_n=10, skills=['python']),
+                      self.key(skills=['python', 'sql']), self.key(skills=['python'], location='Pune'),
+                      self.key(skills=['python'], wfhOnly=True), self.key(skills=['python'], skillMatchOnly=True)):
+            self.assertNotEqual(base, other)
+
+
+class LocMemResponseCacheTests(SimpleTestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LocMemResponseCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+
+    def test_entries_expire_after_ttl(self):
+        cache = LocMemResponseCache(ttl=60)
+        cache.set('a', 1)
+        with mock.patch('recommender.response_cache.time.monotonic', return_value=time.monotonic() + 61):
+            self.assertIsNone(cache.get('a'))
+
+    def test_a_new_catalog_version_drops_every_entry(self):
+        cache = LocMemResponseCache()
+        cache.invalidate(1)
+        cache.set('a', 1)
+        cache.invalidate(1)
+        self.assertEqual(cache.get('a'), 1)
+        cache.invalidate(2)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['entries'], 0)
+
+
+class RecommendationsViewTests(RecommenderTestCase):
+    url = '/recommendations/'
+
+    def setUp(self):
+        super().setUp()
+        make_internship('Python Developer', skills='python, sql')
+        make_internship('Sales Intern', location='Delhi', skills='sales, ms office')
+
+    def post(self, body, query=''):
+        return self.client.post(self.url + query, json.dumps(body), content_type='application/json')
+
+    def test_repeated_profile_is_served_from_the_cache_until_the_catalog_changes(self):
+        profile = {'skills': ['python'], 'interests': [], 'location': 'Mumbai'}
+        first = self.post(profile).json()
+        self.assertEqual(self.post({**profile, 'skills': ['Python ']}).json(), first)
+        self.assertEqual(response_cache.stats()['hits'], 1)
+
+        make_internship('Data Analyst', skills='python, excel')
+        titles = {result['title'] for result in self.post(profile).json()}
+        self.assertIn('Data Analyst', titles)
+        self.assertEqual(response_cache.stats()['hits'], 1)
+
+    def test_reordered_or_recased_profile_gets_the_uncached_response(self):
+        make_internship('Data Analyst', skills='python, excel, sql')
+        make_internship('AI Researcher', skills='machine learning, python', interests='AI')
+        first = {'skills': ['SQL', 'python'], 'interests': ['Technology', 'ai']}
+        second = {'skills': ['python', ' sql', 'Python'], 'interests': ['AI', 'technology']}
+        self.assertEqual(parse_profile(first)['text'], parse_profile(second)['text'])
+
+        uncached = self.post(second).json()
+        self.assertEqual(response_cache.stats()['hits'], 0)
+        with mock.patch.object(response_cache, 'response_cache', response_cache.LocMemResponseCache()):
+            self.post(first)
+            self.assertEqual(self.post(second).json(), uncached)
+            self.assertEqual(response_cache.stats()['hits'], 1)
+
+    def test_fields_and_roadmap_references_shape_the_payload(self):
+        body = self.post({'skills': ['python'], 'interests': []}, '?fields=title,missing_skills&roadmaps=ref').json()
+        self.assertEqual(set(body), {'results', 'roadmaps'})
+        self.assertTrue(body['results'])
+        for result in body['results']:
+            self.assertEqual(set(result), {'title', 'missing_skills'})
+            for entry in result['missing_skills']:
+                self.assertIn(entry['roadmap'], body['roadmaps'])
+
+    def test_profile_with_a_list_location_is_a_bad_request(self):
+        self.assertEqual(self.post({'skills': ['python'], 'interests': [], 'location': ['Delhi']}).status_code, 400)
+
+    def test_unknown_field_or_roadmaps_mode_is_a_bad_request(self):
+        profile = {'skills': ['python'], 'interests': []}
+        self.assertEqual(self.post(profile, '?fields=title,salary').status_code, 400)
+        self.assertEqual(self.post(profile, '?roadmaps=none').status_code, 400)
+
+
+class PayloadTests(SimpleTestCase):
+    def result(self):
+        return {'title': 'Python Developer', 'company': 'Acme', 'match_percentage': 50,
+                'missing_skills': [{'skill': 'Sql', 'youtube_link': '', 'roadmap': 'generic'}]}
+
+    def test_parse_fields_and_roadmaps(self):
+        self.assertIsNone(parse_fields(''))
+        self.assertEqual(parse_fields('title, company,'), ['title', 'company'])
+        with self.assertRaises(ValueError):
+            parse_fields('title,salary')
+        self.assertEqual(parse_roadmaps(None), 'inline')
+        with self.assertRaises(ValueError):
+            parse_roadmaps('none')
+
+    def test_inline_roadmaps_and_sparse_fields(self):
+        rendered = render_results([self.result()], fields=['title', 'missing_skills'])
+        self.assertEqual(rendered, [{'title': 'Python Developer',
+                                     'missing_skills': [{'skill': 'Sql', 'youtube_link': '', 'roadmap': ROADMAPS['generic']}]}])
+
+    def test_roadmap_references_leave_the_input_untouched(self):
+        results = [self.result()]
+        rendered = render_results(results, roadmaps='ref')
+        self.assertEqual(rendered['roadmaps'], {'generic': ROADMAPS['generic']})
+        self.assertEqual(rendered['results'][0]['missing_skills'][0]['roadmap'], 'generic')
+        self.assertEqual(results, [self.result()])
+
+
+class RangeParsingTests(SimpleTestCase):
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration('3 Months'), 3)
+        self.assertEqual(parse_duration('2-3 Months'), 3)
+        self.assertEqual(parse_duration('1 Year'), 12)
+        self.assertEqual(parse_duration('6 Weeks'), 1.38)
+        self.assertIsNone(parse_duration(''))
+
+    def test_parse_stipend(self):
+        self.assertEqual(parse_stipend('₹ 5,000-8,000 /month'), (5000, 8000))
+        self.assertEqual(parse_stipend('₹ 10,000 /month +Incentives'), (10000, 10000))
+        self.assertEqual(parse_stipend('₹ 1,000 /week'), (4333, 4333))
+        self.assertEqual(parse_stipend('No Stipend'), (0, 0))
+        self.assertEqual(parse_stipend('Performance based'), (None, None))
+
+    def test_lump_sum_is_spread_over_the_duration(self):
+        self.assertEqual(parse_stipend('₹ 30,000 lump sum', duration_months=3), (10000, 10000))
+        self.assertEqual(parse_stipend('₹ 30,000 lump sum'), (None, None))
+
+
+class RangeIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = RangeIndex([6, None, 2, 3, None, 12])
+
+    def test_rows_between_inclusive_bounds(self):
+        self.assertEqual(sorted(self.index.rows_between(3, 6).tolist()), [0, 3])
+        self.assertEqual(sorted(self.index.rows_between(None, 3).tolist()), [2, 3])
+        self.assertEqual(sorted(self.index.rows_between(6, None).tolist()), [0, 5])
+        self.assertEqual(self.index.rows_between(7, 11).tolist(), [])
+
+    def test_unknown_values_match_only_when_asked(self):
+        self.assertEqual(sorted(self.index.rows_between(None, 3, include_unknown=True).tolist()), [1, 2, 3, 4])
+
+    def test_restrict_intersects_with_candidates(self):
+        candidates = np.array([0, 1, 2, 5])
+        self.assertEqual(self.index.restrict(candidates, None, 6).tolist(), [0, 2])
+        self.assertEqual(self.index.restrict(candidates, None, 6, include_unknown=True).tolist(), [0, 1, 2])
+
+
+class RangeFilterTests(RecommenderTestCase):
+    def titles(self, **filters):
+        body = {'skills': ['python'], 'interests': [], **filters}
+        response = self.client.post('/recommendations/?fields=title', json.dumps(body), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return {result['title'] for result in response.json()}
+
+    def test_stipend_and_duration_bounds(self):
+        make_internship('Python Developer')
+        make_internship('Sales Intern', location='Delhi', skills='sales')
+        make_internship('Long Unpaid', stipend='Unpaid', duration='6 Months')
+        make_internship('Unknown Duration', duration='')
+        make_internship('Performance Based', stipend='Performance based')
+        titles = self.titles(minStipend=5000, maxDurationMonths=4)
+        self.assertEqual(titles, {'Python Developer', 'Sales Intern', 'Unknown Duration'})
+
+
+class StubModel:
+    fingerprint = 'stub-model#stub'
+
+    def __init__(self):
+        self.encoded = []
+
+    def get_sentence_embedding_dimension(self):
+        return 4
+
+    def encode(self, texts, **kwargs):
+        self.encoded.append(list(texts))
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+# Runs in a fresh interpreter, so nothing another test loaded can mask an import-time model load.
+LAZY_IMPORT_SCRIPT = '''
+import os, sys
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'internship_backend.settings')
+import django
+from django.conf import settings
+settings.DATABASES['default']['NAME'] = sys.argv[1]
+django.setup()
+import recommender.views
+from django.core.management import call_command
+call_command('migrate', verbosity=0)
+from recommender import model_registry
+print(sorted(model_registry._models), 'torch' in sys.modules, 'onnxruntime' in sys.modules)
+'''
+
+
+class ModelRegistryTests(SimpleTestCase):
+    def setUp(self):
+        for patcher in (
+            mock.patch.dict(model_registry._models, clear=True),
+            mock.patch.dict(model_registry._timings, clear=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.model = StubModel()
+        patcher = mock.patch('matching.encoders.load_encoder', return_value=self.model)
+        self.load_encoder = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_importing_views_and_migrating_leave_the_model_unloaded(self):
+        with tempfile.TemporaryDirectory() as directory:
+            result = subprocess.run(
+                [sys.executable, '-c', LAZY_IMPORT_SCRIPT, os.path.join(directory, 'db.sqlite3')],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=120,
+            )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split(), ['[]', 'False', 'False'])
+
+    def test_warmup_model_loads_the_model_once(self):
+        out = io.StringIO()
+        call_command('warmup_model', stdout=out)
+        self.assertTrue(model_registry.is_loaded())
+        self.assertEqual(self.load_encoder.call_count, 1)
+        self.assertEqual(self.model.encoded, [['warmup python communication']])
+        self.assertIn('warmed up in', out.getvalue())
+
+        self.assertIs(model_registry.get_model(), self.model)
+        call_command('warmup_model', stdout=io.StringIO())
+        self.assertEqual(self.load_encoder.call_count, 1)
+        self.assertEqual(set(model_registry.timings()), {'load_seconds', 'warmup_seconds'})
+
+    def test_preload_warms_the_model_and_logs_the_timings(self):
+        with self.assertLogs('recommender.model_registry', 'INFO') as logs:
+            model_registry.preload()
+        self.assertTrue(model_registry.is_loaded())
+        self.assertEqual(self.load_encoder.call_count, 1)
+        self.assertEqual(len(self.model.encoded), 1)
+        self.assertIn('Preloaded', logs.output[0])
+
+
+class StubBatchEncoder:
+    """Records every batch; holds the first one until released, so later submits pile up in the queue."""
+
+    def __init__(self):
+        self.batches = []
+        self.busy = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, texts):
+        if not self.batches:
+            self.busy.set()
+            self.release.wait(5)
+        self.batches.append(list(texts))
+        if 'boom' in texts:
+            raise RuntimeError('model failed')
+        return [f'vector:{text}' for text in texts]
+
+
+class MicroBatchEncoderTests(SimpleTestCase):
+    def setUp(self):
+        self.stub = StubBatchEncoder()
+        self.encoder = MicroBatchEncoder(self.stub, max_batch_size=4, max_wait_ms=50)
+
+    def submit_while_busy(self, texts):
+        """Submits `texts` while the worker is stuck on a first one-text batch, then lets it go."""
+        first = self.encoder.submit('first')
+        self.stub.busy.wait(5)
+        futures = [self.encoder.submit(text) for text in texts]
+        self.stub.release.set()
+        first.result(5)
+        return futures
+
+    def test_queued_submits_are_merged_up_to_max_batch_size(self):
+        texts = [f'text {i}' for i in range(10)]
+        futures = self.submit_while_busy(texts)
+        self.assertEqual([future.result(5) for future in futures], [f'vector:{text}' for text in texts])
+        self.assertEqual(self.stub.batches, [['first'], texts[0:4], texts[4:8], texts[8:10]])
+
+    def test_concurrent_callers_each_get_their_own_row(self):
+        self.stub.release.set()
+        results = {}
+
+        def call(i):
+            results[i] = self.encoder.encode(f'text {i}', timeout=5)
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(results, {i: f'vector:text {i}' for i in range(20)})
+        self.assertTrue(all(len(batch) <= 4 for batch in self.stub.batches))
+
+    def test_encoder_error_reaches_every_caller_in_the_batch_and_the_worker_survives(self):
+        futures = self.submit_while_busy(['a', 'boom', 'b'])
+        for future in futures:
+            with self.assertRaisesMessage(RuntimeError, 'model failed'):
+                future.result(5)
+        self.assertEqual(self.encoder.encode('after', timeout=5), 'vector:after')
+
+    def test_stats_add_up(self):
+        futures = self.submit_while_busy([f'text {i}' for i in range(10)])
+        for future in futures:
+            future.result(5)
+        stats = self.encoder.stats()
+        self.assertEqual(stats['batches'], 4)
+        self.assertEqual(stats['items'], 11)
+        self.assertEqual(stats['batch_size_histogram'], {'1': 1, '2': 1, '4': 2})
+        self.assertEqual(stats['mean_batch_size'], 11 / 4)
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertGreaterEqual(stats['max_queue_depth'], 10)
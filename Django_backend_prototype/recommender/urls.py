@@ -1,9 +1,16 @@
 # recommender/urls.py
 
+from django.conf import settings
 from django.urls import path
 from . import views
 
 urlpatterns = [
     path('',views.index, name='index'),
-    path('recommendations/', views.recommend_internships, name='recommendations'),
+    path(
+        'recommendations/',
+        views.recommend_internships_async if settings.RECOMMENDER_ASYNC_VIEWS else views.recommend_internships,
+        name='recommendations',
+    ),
+    path('recommendations/batch/', views.recommend_internships_batch, name='recommendations-batch'),
+    path('metrics/', views.metrics, name='metrics'),
 ]
\ No newline at end of file
@@ -1,141 +1,151 @@
 # recommender/views.py
 
+import json
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from .models import Internship
-from .serializers import InternshipSerializer
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-import pandas as pd
-from django.db.models import Q
-import re
+from . import embeddings, response_cache
+from .catalog import get_snapshot
+from .payloads import parse_fields, parse_roadmaps, render_batch_result, render_results
+from .ranking import parse_profile, profile_rows, build_recommendations, recommend_many
+from .renderers import dumps
 from rest_framework.exceptions import APIException
 
-# A simple dictionary to hold pre-found YouTube tutorial links for skills
-YOUTUBE_TUTORIALS = {
-    'python': 'https://www.youtube.com/watch?v=eWRfhZUzrAc',
-    'java': 'https://www.youtube.com/watch?v=grEKMHGYCs8',
-    'marketing': 'https://www.youtube.com/watch?v=nU-IIXBWlS4',
-    'sales': 'https://www.youtube.com/watch?v=bSa0_Vp3o_M',
-    'ms office': 'https://www.youtube.com/watch?v=2-h6t4p6a_g',
-    'data analysis': 'https://www.youtube.com/watch?v=rCG36C4d3g8',
-    'communication': 'https://www.youtube.com/watch?v=Jwyb7I_3R2Y',
-    'teamwork': 'https://www.youtube.com/watch?v=s8a8aV3w7pU',
-    # Add other skills and links as needed
-}
-
-def get_youtube_link(skill):
-    """Finds a relevant YouTube link for a given skill."""
-    # Simple lookup, can be expanded with more advanced search if needed
-    return YOUTUBE_TUTORIALS.get(skill.lower().replace(" ", ""), "https://www.youtube.com/results?search_query=how+to+learn+" + skill)
-
-def generate_learning_roadmap():
-    """Generates a generic learning roadmap."""
-    return [
-        "1. **Understand the Fundamentals:** Start with beginner tutorials to grasp the basic concepts.",
-        "2. **Hands-On Practice:** Apply what you've learned by working on small projects or exercises.",
-        "3. **Build a Project:** Create a simple, complete project to solidify your understanding.",
-        "4. **Seek Feedback:** Share your work with others to get constructive feedback and improve.",
-        "5. **Contribute & Collaborate:** Join online communities or contribute to open-source projects to learn from others."
-    ]
-
 def index(request):
     return render(request, 'recommender/index.html')
 
-# Load the sentence transformer model
-model = SentenceTransformer('all-MiniLM-L6-v2')
+def _payload_options(query):
+    """(fields, roadmaps) from the `fields` and `roadmaps` query parameters; see payloads.py."""
+    return parse_fields(query.get('fields')), parse_roadmaps(query.get('roadmaps'))
 
 @api_view(['POST'])
 def recommend_internships(request):
+    """
+    Top recommendations for one student profile.
+    `?fields=title,company,...` returns only those fields; `?roadmaps=ref` sends each learning roadmap
+    once instead of under every missing skill.
+    """
     try:
-        user_data = request.data
-        user_skills = user_data.get('skills', [])
-        user_interests = user_data.get('interests', [])
-        user_location = user_data.get('location')
-        user_wfh = user_data.get('wfhOnly')
-
-        user_profile_text = ' '.join(user_skills) + ' ' + ' '.join(user_interests)
-
-        base_query = Q()
-        if user_wfh:
-            base_query &= Q(location__icontains="Work From Home")
-        elif user_location and user_location != "Any":
-            base_query &= Q(location__icontains=user_location)
-
-        internships = Internship.objects.filter(base_query)
-
-        if not internships:
-            return Response([], status=200)
-
-        internship_data = list(internships.values('id', 'title', 'skills', 'interests', 'description'))
-        df = pd.DataFrame(internship_data)
-
-        if df.empty:
-            return Response([], status=200)
-
-        df['combined_features'] = df['skills'] + ' ' + df['interests'] + ' ' + df['title'] + ' ' + df['description']
-
-        internship_embeddings = model.encode(df['combined_features'].tolist())
-        user_profile_embedding = model.encode([user_profile_text])
-
-        cosine_similarities = cosine_similarity(user_profile_embedding, internship_embeddings)
-        similarity_scores = list(enumerate(cosine_similarities[0]))
-        sorted_internships = sorted(similarity_scores, key=lambda x: x[1], reverse=True)
-        top_internships_indices = [i[0] for i in sorted_internships[:5]]
-
-        recommended_internships_ids = df.iloc[top_internships_indices]['id'].tolist()
-
-        recommended_internships = sorted(
-            Internship.objects.filter(id__in=recommended_internships_ids),
-            key=lambda x: recommended_internships_ids.index(x.id)
-        )
-
-        serializer = InternshipSerializer(recommended_internships, many=True)
-        response_data = serializer.data
-
-        # --- New Feature Logic ---
-        user_skills_set = set(skill.lower() for skill in user_skills)
-
-        for internship_data in response_data:
-            internship_skills_str = internship_data.get('skills', '')
-            # Split skills by comma and strip whitespace
-            internship_skills = set(skill.strip().lower() for skill in re.split(r'[, ]+', internship_skills_str) if skill)
-
+        fields, roadmaps = _payload_options(request.query_params)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=400)
 
-            if not internship_skills:
-                match_percentage = 0
-                missing_skills = []
+    try:
+        profile = parse_profile(request.data)
+
+        snapshot = get_snapshot()
+        key, response_data = response_cache.lookup(snapshot, profile)
+        if response_data is None:
+            rows = profile_rows(snapshot, profile)
+            if rows.size:
+                user_profile_embedding = embeddings.encode_query(profile['text'])
+                response_data = build_recommendations(snapshot, rows, user_profile_embedding, profile['skills'])
             else:
-                matching_skills = user_skills_set.intersection(internship_skills)
-                missing_skills_set = internship_skills.difference(user_skills_set)
-                match_percentage = int((len(matching_skills) / len(internship_skills)) * 100) if internship_skills else 0
-                missing_skills = list(missing_skills_set)
-
+                response_data = []
+            response_cache.store(key, response_data)
 
-            # Generate a more detailed match reason
-            reason = f"This internship is a great fit because it aligns with your interest in **{internship_data.get('interests', 'various sectors')}**."
-            if matching_skills:
-                reason += f" It also matches your skills in **{', '.join(list(matching_skills))}**."
+        return Response(render_results(response_data, fields, roadmaps), status=200)
 
+    except (APIException, ValueError, KeyError, TypeError) as e:
+        print(f"A validation or data error occurred: {e}")
+        return Response({'error': 'Invalid data provided. Please check your input.'}, status=400)
+    except Exception as e:
+        # A general catch-all for unexpected server errors
+        print(f"An unexpected server error occurred: {e}")
+        return Response({'error': 'An unexpected error occurred on the server.'}, status=500)
+
+@csrf_exempt
+@require_POST
+async def recommend_internships_async(request):
+    """
+    Same contract as recommend_internships, for ASGI deployments. The query encode is awaited on the
+    micro-batching encoder, so concurrent requests are encoded together instead of queuing up
+    behind each other on Django's single sync-view thread.
+    """
+    try:
+        fields, roadmaps = _payload_options(request.GET)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
 
-            internship_data['match_percentage'] = match_percentage
-            internship_data['match_reason'] = reason
-            internship_data['missing_skills'] = [
-                {
-                    'skill': skill.title(),
-                    'youtube_link': get_youtube_link(skill),
-                    'roadmap': generate_learning_roadmap()
-                } for skill in missing_skills
-            ]
-
+    try:
+        profile = parse_profile(json.loads(request.body or b'{}'))
+
+        snapshot = await sync_to_async(get_snapshot)()
+        key, response_data = response_cache.lookup(snapshot, profile)
+        if response_data is None:
+            rows = profile_rows(snapshot, profile)
+            if rows.size:
+                user_profile_embedding = await embeddings.encode_query_async(profile['text'])
+                response_data = build_recommendations(snapshot, rows, user_profile_embedding, profile['skills'])
+            else:
+                response_data = []
+            response_cache.store(key, response_data)
 
-        return Response(response_data, status=200)
+        return HttpResponse(dumps(render_results(response_data, fields, roadmaps)), content_type='application/json')
 
-    except (APIException, KeyError, TypeError) as e:
+    except (ValueError, AttributeError, KeyError, TypeError) as e:
         print(f"A validation or data error occurred: {e}")
-        return Response({'error': 'Invalid data provided. Please check your input.'}, status=400)
+        return JsonResponse({'error': 'Invalid data provided. Please check your input.'}, status=400)
     except Exception as e:
-        # A general catch-all for unexpected server errors
         print(f"An unexpected server error occurred: {e}")
-        return Response({'error': 'An unexpected error occurred on the server.'}, status=500)
\ No newline at end of file
+        return JsonResponse({'error': 'An unexpected error occurred on the server.'}, status=500)
+
+def _read_profiles(request):
+    """Yields profiles from a JSON array body, or lazily line by line from an NDJSON body."""
+    if request.content_type in ('application/x-ndjson', 'application/jsonl'):
+        for line in request:
+            if line.strip():
+                yield json.loads(line)
+        return
+    body = json.loads(request.body or b'[]')
+    profiles = body.get('profiles', []) if isinstance(body, dict) else body
+    if not isinstance(profiles, list):
+        raise ValueError('Expected a JSON array of profiles or {"profiles": [...]}.')
+    yield from profiles
+
+def _parse_top_n(raw):
+    """`?top_n=` as a positive integer (default 5)."""
+    top_n = int(raw)
+    if top_n < 1:
+        raise ValueError(f"top_n must be at least 1, got {top_n}")
+    return top_n
+
+@csrf_exempt
+@require_POST
+def recommend_internships_batch(request):
+    """
+    Bulk variant of recommend_internships for nightly placement runs.
+    Accepts a JSON array (or {"profiles": [...]}, or NDJSON lines) of profiles and streams back one
+    NDJSON line per profile, so memory stays flat no matter how many students are submitted.
+    """
+    try:
+        top_n = _parse_top_n(request.GET.get('top_n', 5))
+        fields, roadmaps = _payload_options(request.GET)
+        profiles = _read_profiles(request)
+        first = next(profiles, None)
+    except ValueError as e:
+        print(f"A validation or data error occurred: {e}")
+        return JsonResponse({'error': f'Invalid data provided: {e}'}, status=400)
+    if first is None:
+        return StreamingHttpResponse(iter(()), content_type='application/x-ndjson')
+
+    def lines():
+        def all_profiles():
+            yield first
+            yield from profiles
+        for result in recommend_many(get_snapshot(), all_profiles(), top_n=top_n):
+            yield dumps(render_batch_result(result, fields, roadmaps)) + b'\n'
+
+    return StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+
+@api_view(['GET'])
+def metrics(request):
+    """Runtime counters for the recommendation pipeline."""
+    return Response({
+        'query_encoder': embeddings.query_encoder.stats(),
+        'response_cache': response_cache.stats(),
+    }, status=200)
@@ -10,60 +10,13 @@ Original file is located at
 # You will need sentence-transformers
 # pip install -U sentence-transformers
 
-import csv
-from sentence_transformers import SentenceTransformer, util
-import torch
+import os
+import sys
 
-# --- HELPER FUNCTIONS ---
-def create_internship_text(internship):
-    """Creates a more natural, descriptive sentence from internship data."""
-    title = internship.get('Title', 'an internship role')
-    skills = internship.get('Skills', 'various skills')
-    return f"Seeking an intern for a {title} position. The ideal candidate should have experience in skills such as {skills}."
-
-def calculate_keyword_score(student_skills, internship_skills):
-    """Calculates a score based on the overlap of skills (Jaccard Similarity)."""
-    student_set = set([skill.strip().lower() for skill in student_skills.split(',')])
-    internship_set = set([skill.strip().lower() for skill in internship_skills.split(',')])
-    intersection = student_set.intersection(internship_set)
-    union = student_set.union(internship_set)
-    return 0.0 if not union else len(intersection) / len(union)
-
-# --- CORE LOGIC ---
-def find_recommendations(student_profile, all_internships, model):
-    """Finds and ranks recommendations by calculating embeddings on the fly."""
-    print(f"\n🔎 Finding recommendations for a student in '{student_profile['location_preference']}'...")
-
-    # Step 1: Filter internships by location
-    filtered_internships = [
-        internship for internship in all_internships
-        if internship['Location'].lower() == student_profile['location_preference'].lower()
-    ]
-    if not filtered_internships:
-        return [], 0
-
-    # Step 2: Prepare text (no special prefixes needed for this model)
-    student_text = f"A student with key skills in: {student_profile['skills']}."
-    internship_texts = [create_internship_text(internship) for internship in filtered_internships]
-
-    # Step 3: Generate embeddings for both student and internships in real-time
-    print(f"🧠 Generating embeddings for {len(filtered_internships)} internships...")
-    student_embedding = model.encode(student_text, convert_to_tensor=True)
-    internship_embeddings = model.encode(internship_texts, convert_to_tensor=True, show_progress_bar=True)
-
-    # Step 4: Calculate similarity
-    semantic_scores = util.cos_sim(student_embedding, internship_embeddings)
-
-    # Step 5: Combine scores and rank
-    recommendations = []
-    for i, internship in enumerate(filtered_internships):
-        sem_score = semantic_scores[0][i].item()
-        key_score = calculate_keyword_score(student_profile['skills'], internship.get('Skills', ''))
-        final_score = (0.6 * sem_score) + (0.4 * key_score)
-        recommendations.append({'final_score': final_score, 'internship': internship})
-
-    sorted_recommendations = sorted(recommendations, key=lambda x: x['final_score'], reverse=True)
-    return sorted_recommendations, len(filtered_internships)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from matching.embedding_cache import CachedEncoder
+from matching.encoders import load_encoder
+from matching.recommend import Recommender, load_catalog
 
 # --- MAIN EXECUTION BLOCK ---
 if __name__ == "__main__":
@@ -74,13 +27,12 @@ if __name__ == "__main__":
     print("Loading model and data...")
     # Switched to the new model name
     MODEL_NAME = 'sentence-transformers/paraphrase-multilingual-mpnet-base-v2'
-    model = SentenceTransformer(MODEL_NAME)
+    # ENCODER_BACKEND=onnx / onnx-int8 runs the same model faster on CPU (see matching/encoders.py).
+    # Internship embeddings are cached on disk, so only texts never seen before are encoded.
+    model = CachedEncoder(load_encoder(MODEL_NAME, os.environ.get('ENCODER_BACKEND', 'torch')))
 
-    all_internships = []
-    with open('internships.csv', mode='r', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            all_internships.append(row)
+    # Read through the columnar cache next to the CSV (rebuilt automatically when the CSV changes)
+    all_internships = load_catalog('internships.csv')
 
     print("✅ Model and data loaded.")
 
@@ -89,7 +41,13 @@ if __name__ == "__main__":
         'location_preference': 'Work From Home'
     }
 
-    all_recommendations, jobs_found_in_location = find_recommendations(student, all_internships, model)
+    # Ranked by matching.recommend, the same core the batch CLI uses. The catalog is embedded once
+    # (through the embedding cache); at most 5 matches (or FALLBACK_COUNT closest options) are displayed.
+    # LEXICAL_FIRST_STAGE=200 scores only the 200 best keyword matches (off by default).
+    print(f"\n🔎 Finding recommendations for a student in '{student['location_preference']}'...")
+    first_stage = int(os.environ.get('LEXICAL_FIRST_STAGE', 0)) or None
+    recommender = Recommender(all_internships, model, first_stage=first_stage)
+    all_recommendations, jobs_found_in_location = recommender.recommend(student, top_n=max(5, FALLBACK_COUNT))
 
     # First, try to get high-quality matches
     good_recommendations = [rec for rec in all_recommendations if rec['final_score'] >= MINIMUM_SCORE_THRESHOLD]
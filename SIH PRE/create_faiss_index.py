@@ -1,64 +1,110 @@
 # Save this as create_faiss_index.py
 # You will need to install faiss: pip install faiss-cpu (or faiss-gpu for CUDA)
+#
+# Keeps the internships.bundle/ index bundle in step with internships.csv: only new or changed
+# internships are encoded, removed ones are dropped by id, and each run writes a new bundle version
+# that a running recommendation_fiass.py picks up without a restart.
 
-import csv
-import pickle
-import numpy as np
-import faiss
-from sentence_transformers import SentenceTransformer
+import argparse
+import json
+import os
+import sys
 
-def create_internship_text(internship):
-    title = internship.get('Title', 'an internship role')
-    skills = internship.get('Skills', 'various skills')
-    return f"Seeking an intern for a {title} position. The ideal candidate should have experience in skills such as {skills}."
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import faiss
+from matching.ann import INDEX_KINDS
+from matching.bundle import BundleError, load_bundle
+from matching.catalog_cache import load_catalog_cache
+from matching.embedding_cache import CachedEncoder
+from matching.encoders import encoder_fingerprint, load_encoder
+from matching.quantization import PRECISIONS
+from matching.recommend import create_internship_text
+from matching.faiss_index import IncrementalIndex, diff_catalog
 
-# 1. Load the Model
 MODEL_NAME = 'sentence-transformers/paraphrase-multilingual-mpnet-base-v2'
-print(f"Loading model: {MODEL_NAME}...")
-model = SentenceTransformer(MODEL_NAME)
-print("Model loaded.")
+# ENCODER_BACKEND=onnx / onnx-int8 runs the same model faster on CPU (see matching/encoders.py);
+# the bundle records which backend's vectors it holds, so readers must use a compatible one.
+ENCODER_BACKEND = os.environ.get('ENCODER_BACKEND', 'torch')
+MODEL_ID = encoder_fingerprint(MODEL_NAME, ENCODER_BACKEND)
+BUNDLE_DIR = 'internships.bundle'
 
-# 2. Load CSV and prepare texts
-# 2. Load CSV and prepare texts
-# 2. Load CSV and prepare texts
-all_internships = []
+parser = argparse.ArgumentParser(description="Build or incrementally update the internships FAISS index.")
+parser.add_argument('--delta', help="Change feed ({added, updated, removed} ids, e.g. the scraper's delta file). "
+                                    "By default the CSV is diffed against the index.")
+parser.add_argument('--rebuild', action='store_true', help="Ignore the existing index and encode everything.")
+parser.add_argument('--index', dest='kind', choices=INDEX_KINDS, default='flat',
+                    help="Search structure: exact flat scan (fine for a few thousand rows) or an ANN index for large catalogs.")
+parser.add_argument('--nlist', type=int, help="IVF inverted lists (default ~4*sqrt(n)).")
+parser.add_argument('--pq-m', type=int, help="IVF-PQ bytes per vector (default dim/16).")
+parser.add_argument('--hnsw-m', type=int, default=32, help="HNSW graph neighbours per node.")
+parser.add_argument('--precision', choices=PRECISIONS, default='float32',
+                    help="Also store a compact float16/int8 copy for coarse scoring (float32 is kept for rescoring).")
+args = parser.parse_args()
 
-# --- THE FIX: Manually define the column headers ---
-# Based on your screenshot, these appear to be the correct headers.
-# Adjust them if you have more columns.
-column_names = ['id', 'Title', 'Locations', 'Skills'] 
-
-with open('internships.csv', mode='r', encoding='utf-8') as csvfile:
-    # First, skip the original (and flawed) header row from the file
-    next(csvfile) 
-    
-    # Now, use our manually defined column_names
-    reader = csv.DictReader(csvfile, fieldnames=column_names)
-    
-    for row in reader:
-        all_internships.append(row)
+# 1. Load the catalog and prepare texts. The CSV header starts with a byte-order mark ("\ufeffid"),
+# which the columnar cache strips; it is rebuilt automatically whenever internships.csv changes.
+all_internships = load_catalog_cache('internships.csv').rows()
 
 print(f"Loaded {len(all_internships)} internships.")
-internship_texts = [create_internship_text(internship) for internship in all_internships]
+internship_texts = {internship['id']: create_internship_text(internship) for internship in all_internships}
+internship_metadata = {internship['id']: {key: internship[key] for key in ('Title', 'Locations', 'Skills')}
+                       for internship in all_internships}
+
+# 2. Load the current bundle, unless it is missing, corrupt or was built with another model
+index = None
+same_layout = False # index kind, filters and precision already match the requested ones
+if not args.rebuild:
+    try:
+        bundle = load_bundle(BUNDLE_DIR, model_name=MODEL_ID, verify=True)
+        same_layout = ((bundle.manifest['ann'] or 'flat') == args.kind
+                       and 'location' in bundle.manifest.get('filters', [])
+                       and bundle.manifest.get('precision', 'float32') == args.precision)
+        index = IncrementalIndex.from_bundle(bundle)
+    except BundleError as e:
+        print(f"Building a fresh index: {e}")
+
+# 3. Work out what changed since the last build
+if index is not None and args.delta:
+    with open(args.delta, encoding='utf-8') as f:
+        changes = json.load(f)
+elif index is not None:
+    changes = diff_catalog(internship_texts, index.hashes)
+else:
+    changes = {'added': list(internship_texts), 'updated': [], 'removed': []}
+print(f"Changes: {len(changes.get('added', []))} added, {len(changes.get('updated', []))} updated, "
+      f"{len(changes.get('removed', []))} removed.")
+
+if not any(changes.values()) and index is not None and same_layout:
+    print("✅ FAISS index is already up to date.")
+    sys.exit(0)
+
+# 4. Generate embeddings for the changed internships only (the model is loaded only if needed)
+_model = []
 
-# 3. Generate all embeddings
-print("Generating embeddings for all internships...")
-all_embeddings = model.encode(internship_texts, convert_to_numpy=True, show_progress_bar=True)
-# Ensure embeddings are normalized for cosine similarity search
-faiss.normalize_L2(all_embeddings)
+def get_model():
+    if not _model:
+        print(f"Loading model: {MODEL_NAME} ({ENCODER_BACKEND})...")
+        _model.append(CachedEncoder(load_encoder(MODEL_NAME, ENCODER_BACKEND)))
+        print("Model loaded.")
+    return _model[0]
 
-# 4. Build and save the FAISS Index
-embedding_dimension = all_embeddings.shape[1]
-# We use IndexFlatIP, which is equivalent to cosine similarity for normalized vectors
-index = faiss.IndexFlatIP(embedding_dimension) 
-index.add(all_embeddings)
-print(f"FAISS index built with {index.ntotal} vectors.")
+def encode(texts):
+    print(f"Generating embeddings for {len(texts)} internships...")
+    embeddings = get_model().encode(texts, convert_to_numpy=True, show_progress_bar=True)
+    # Ensure embeddings are normalized for cosine similarity search
+    faiss.normalize_L2(embeddings)
+    return embeddings
 
-faiss.write_index(index, 'internships.faiss')
+if index is None:
+    # IndexIDMap2 over IndexFlatIP: cosine similarity for normalized vectors, addressable by internship id
+    index = IncrementalIndex(get_model().get_sentence_embedding_dimension(), MODEL_ID)
 
-# 5. Save the mapping from index position to our internship ID
-index_to_id_map = {i: internship['id'] for i, internship in enumerate(all_internships)}
-with open('index_to_id.pkl', 'wb') as f:
-    pickle.dump(index_to_id_map, f)
+encoded = index.apply(changes, internship_texts, encode)
 
-print("✅ FAISS index and ID map saved successfully.")
\ No newline at end of file
+# 5. Save as a new bundle version (embeddings, ids, metadata, model fingerprint, checksums)
+# Location posting lists let recommendation_fiass.py search inside one location instead of post-filtering
+location_filter = {internship['id']: [internship['Locations']] for internship in all_internships}
+version = index.save(BUNDLE_DIR, internship_metadata, kind=args.kind, filters={'location': location_filter},
+                     precision=args.precision,
+                     nlist=args.nlist, pq_m=args.pq_m, hnsw_m=args.hnsw_m)
+print(f"✅ Bundle {BUNDLE_DIR}/{version} ({args.kind}, {args.precision}) saved with {index.ntotal} vectors ({encoded} encoded).")
@@ -1,67 +1,85 @@
-import csv
-import pickle
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 import numpy as np
 import faiss
-from sentence_transformers import SentenceTransformer
+from matching.bundle import CURRENT, load_bundle
+from matching.encoders import encoder_fingerprint, load_encoder
+from matching.faiss_index import HotSwapIndex
+from matching.recommend import create_student_text
+from matching.scoring import SkillMatrix, hybrid_scores, top_k
 
-def calculate_keyword_score(student_skills, internship_skills):
-    student_set = set([skill.strip().lower() for skill in student_skills.split(',')])
-    internship_set = set([skill.strip().lower() for skill in internship_skills.split(',')])
-    intersection = student_set.intersection(internship_set)
-    union = student_set.union(internship_set)
-    return 0.0 if not union else len(intersection) / len(union)
+MODEL_NAME = 'sentence-transformers/paraphrase-multilingual-mpnet-base-v2'
+ENCODER_BACKEND = os.environ.get('ENCODER_BACKEND', 'torch')
+MODEL_ID = encoder_fingerprint(MODEL_NAME, ENCODER_BACKEND) # what create_faiss_index.py records in the bundle
+BUNDLE_DIR = 'internships.bundle'
+# Recall/speed knobs, only used when the bundle was built with --index ivf-flat/ivf-pq/hnsw
+NPROBE = 16
+EF_SEARCH = 128
 
-# Load all data into memory for quick lookups
-all_internships_map = {}
-column_names = ['id', 'Title', 'Locations', 'Skills'] # Manually define headers
-with open('internships.csv', mode='r', encoding='utf-8') as csvfile:
-    next(csvfile) # Skip the flawed header row
-    reader = csv.DictReader(csvfile, fieldnames=column_names)
-    for row in reader:
-        all_internships_map[row['id']] = row
+def open_index(dim=None, check_interval=2.0):
+    """
+    The index bundle written by create_faiss_index.py: embeddings, ids and metadata are memory-mapped,
+    so startup does not depend on the catalog size, and a new bundle version is picked up on the fly.
+    Refuses a bundle built with a different model or embedding dimension.
+    """
+    return HotSwapIndex(os.path.join(BUNDLE_DIR, CURRENT), check_interval,
+                        load=lambda _: load_bundle(BUNDLE_DIR, model_name=MODEL_ID, dim=dim,
+                                                nprobe=NPROBE, ef_search=EF_SEARCH))
 
 # --- CORE LOGIC with FAISS ---
-def find_recommendations_faiss(student_profile, model, index, index_to_id_map):
+def find_recommendations_faiss(student_profile, model, index):
     print(f"\n🔎 Finding recommendations for a student in '{student_profile['location_preference']}'...")
     
-    student_text = f"A student with key skills in: {student_profile['skills']}."
+    student_text = create_student_text(student_profile['skills'])
     student_embedding = model.encode([student_text], convert_to_numpy=True)
     faiss.normalize_L2(student_embedding)
 
     k = 200 # Retrieve a large pool of skill-matched candidates
-    distances, indices = index.search(student_embedding, k)
-    
-    all_top_candidates = []
-    for i, idx in enumerate(indices[0]):
-        if idx == -1: continue
-            
-        internship_id = index_to_id_map[idx]
-        internship = all_internships_map[internship_id]
-        
-        sem_score = distances[0][i]
-        key_score = calculate_keyword_score(student_profile['skills'], internship.get('Skills', ''))
-        final_score = (0.6 * sem_score) + (0.4 * key_score)
-        
-        all_top_candidates.append({'final_score': final_score, 'internship': internship})
+    # One bundle version for the whole request, even if a newer one lands meanwhile
+    bundle = index.current()
+    distances, positions = bundle.search(student_embedding, k)
+    found = positions[0] != -1 # ANN indexes pad with -1 when they find fewer than k
+    all_top_candidates = rank_candidates(bundle, distances[0][found], positions[0][found], student_profile['skills'])
+
+    # Search inside the preferred location itself, rather than hoping some of the global top-k are there:
+    # a small city's internships are found even when none of them make the global top 200.
+    in_location = bundle.filter_positions('location', student_profile['location_preference'])
+    distances, positions, stats = bundle.search_filtered(student_embedding, k, in_location)
+    print(f"   {len(in_location)} internships in this location; {stats['scanned']} vectors scanned ({stats['strategy']}).")
+    recommendations_in_location = rank_candidates(bundle, distances, positions, student_profile['skills'])
 
-    recommendations_in_location = [
-        rec for rec in all_top_candidates 
-        if rec['internship']['Locations'].lower().strip() == student_profile['location_preference'].lower()
-    ]
-    
     return recommendations_in_location, all_top_candidates
 
+def rank_candidates(bundle, sem_scores, positions, student_skills):
+    candidates = [bundle.metadata(position) for position in positions]
+    for position, candidate in zip(positions, candidates):
+        candidate['id'] = str(bundle.ids[position])
+
+    # Keyword scores only need the retrieved candidates, not a skill matrix over the whole catalog
+    key_scores = SkillMatrix(candidate.get('Skills', '') for candidate in candidates).jaccard(student_skills)
+    final_scores = hybrid_scores(sem_scores, key_scores)
+
+    return [
+        {'final_score': float(final_scores[i]), 'internship': candidates[i]}
+        for i in top_k(final_scores)
+    ]
+
 # --- MAIN EXECUTION BLOCK (MODIFIED FOR GUARANTEED FALLBACK) ---
 if __name__ == "__main__":
     MINIMUM_SCORE_THRESHOLD = 0.50
     FALLBACK_COUNT = 3
     
+    # HotSwapIndex logs each bundle reload
+    logging.basicConfig(level=logging.INFO, format="🔄 %(message)s")
+
     # Load model, FAISS index, and maps
     print("Loading model and FAISS index...")
-    model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-mpnet-base-v2')
-    index = faiss.read_index('internships.faiss')
-    with open('index_to_id.pkl', 'rb') as f:
-        index_to_id_map = pickle.load(f)
+    model = load_encoder(MODEL_NAME, ENCODER_BACKEND)
+    index = open_index(model.get_sentence_embedding_dimension())
+    index.current()
     print("✅ Ready to make recommendations.")
     
     print("\n--- Enter Your Preferences ---")
@@ -73,7 +91,7 @@ if __name__ == "__main__":
         'location_preference': user_location.strip()
     }
 
-    in_location_recs, global_recs = find_recommendations_faiss(student, model, index, index_to_id_map)
+    in_location_recs, global_recs = find_recommendations_faiss(student, model, index)
     
     good_in_location = [rec for rec in in_location_recs if rec['final_score'] >= MINIMUM_SCORE_THRESHOLD]
     good_global = [rec for rec in global_recs if rec['final_score'] >= MINIMUM_SCORE_THRESHOLD]
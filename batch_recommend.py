@@ -0,0 +1,80 @@
+# batch_recommend.py
+# Offline batch recommendations: a file of student profiles in, one ranked JSON line per profile out.
+# The catalog and model are loaded once, profiles are encoded in batches, and scoring is spread over a
+# process pool (see matching/recommend.py).
+#
+# Profiles: .jsonl ({"id": ..., "skills": "Python, SQL" or [...], "location": "Mumbai"} per line)
+# or .csv with id/skills/location columns.
+# Usage: python batch_recommend.py profiles.jsonl --output ranked.jsonl [--workers 4] [--top-n 5]
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from matching.embedding_cache import CachedEncoder
+from matching.encoders import BACKENDS, load_encoder
+from matching.recommend import Recommender, default_workers, load_catalog
+
+
+def read_profiles(path):
+    """Yields profiles lazily, so the input file is never held in memory."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if path.endswith('.csv'):
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank internships for a file of student profiles.")
+    parser.add_argument('profiles', help="Student profiles as .jsonl or .csv.")
+    parser.add_argument('--output', default='-', help="Ranked JSONL output (default: stdout).")
+    parser.add_argument('--catalog', default='internships.csv')
+    parser.add_argument('--model', default='sentence-transformers/paraphrase-multilingual-mpnet-base-v2')
+    parser.add_argument('--backend', choices=BACKENDS, default=os.environ.get('ENCODER_BACKEND', 'torch'))
+    parser.add_argument('--top-n', type=int, default=5)
+    parser.add_argument('--batch-size', type=int, default=256, help="Profiles encoded per model call.")
+    parser.add_argument('--workers', type=int, default=default_workers(), help="Scoring processes (1 = no pool).")
+    parser.add_argument('--semantic-weight', type=float, default=0.6)
+    parser.add_argument('--first-stage', type=int, default=None,
+                        help="Score only the N best TF-IDF skill matches per profile (default: score every internship).")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    internships = load_catalog(args.catalog)
+    # Only catalog texts go through the embedding cache; Recommender encodes profiles with the bare encoder.
+    model = CachedEncoder(load_encoder(args.model, args.backend))
+    recommender = Recommender(internships, model, args.semantic_weight, args.batch_size, args.first_stage)
+    ready = time.perf_counter()
+    print(f"Loaded {len(recommender)} internships and {args.model} ({args.backend}) in {ready - started:.1f}s.",
+          file=sys.stderr)
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    count = 0
+    try:
+        results = recommender.recommend_many(read_profiles(args.profiles), args.top_n, args.workers)
+        for profile, recommendations, in_location in results:
+            line = {
+                'index': count,
+                'id': profile.get('id'),
+                'internships_in_location': in_location,
+                'recommendations': [{'score': round(rec['final_score'], 6), **rec['internship']} for rec in recommendations],
+            }
+            out.write(json.dumps(line, ensure_ascii=False) + '\n')
+            count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - ready
+    print(f"Ranked {count} profiles in {elapsed:.2f}s ({count / max(elapsed, 1e-9):.1f} profiles/s, "
+          f"{args.workers} worker{'s' if args.workers != 1 else ''}).", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
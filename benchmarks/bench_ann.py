@@ -0,0 +1,92 @@
+# benchmarks/bench_ann.py
+# Recall@k, query latency and memory of the ANN index options against the exact flat index,
+# to pick an index kind and nprobe/efSearch per catalog size.
+# Usage: python benchmarks/bench_ann.py [--sizes 4000 100000 1000000] [--dim 768] [--k 200]
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import faiss
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from matching.ann import build_index, default_nlist, index_bytes, set_search_params
+
+# (kind, knob name, knob values) swept for every catalog size
+SWEEP = [
+    ('flat', None, [None]),
+    ('ivf-flat', 'nprobe', [1, 4, 16, 64]),
+    ('ivf-pq', 'nprobe', [4, 16, 64]),
+    ('hnsw', 'ef_search', [16, 64, 256]),
+]
+
+
+def synthetic_embeddings(count, dim, clusters=256, seed=0):
+    """L2-normalised vectors around `clusters` topic centres, roughly how listing embeddings group by role."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, clusters, size=count)] + 0.6 * rng.standard_normal((count, dim)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def measure(index, queries, k):
+    """Searches one query at a time, as the recommender does. Returns (ids, per-query seconds)."""
+    ids = np.empty((len(queries), k), dtype=np.int64)
+    timings = np.empty(len(queries))
+    for i in range(len(queries)):
+        started = time.perf_counter()
+        _, ids[i] = index.search(queries[i:i + 1], k)
+        timings[i] = time.perf_counter() - started
+    return ids, timings
+
+
+def recall_at_k(found, exact):
+    k = exact.shape[1]
+    return float(np.mean([len(np.intersect1d(f[f != -1], e)) / k for f, e in zip(found, exact)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark IVF-Flat / IVF-PQ / HNSW against the exact flat index.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4000, 100000])
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--k', type=int, default=200, help="Candidates retrieved per query (recall@k).")
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=1, help="faiss OpenMP threads while searching (1 = per-worker latency).")
+    args = parser.parse_args()
+
+    build_threads = faiss.omp_get_max_threads()
+    print(f"{'rows':>9} {'index':>9} {'knob':>14} {'build (s)':>10} {'memory (MB)':>12} "
+          f"{'recall@' + str(args.k):>11} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+
+    for size in args.sizes:
+        vectors = synthetic_embeddings(size + args.queries, args.dim)
+        catalog, queries = vectors[:size], vectors[size:]
+        exact = None
+
+        for kind, knob, values in SWEEP:
+            if kind.startswith('ivf') and default_nlist(size) < 2:
+                continue
+            faiss.omp_set_num_threads(build_threads)
+            started = time.perf_counter()
+            index = build_index(catalog, kind)
+            build_time = time.perf_counter() - started
+            faiss.omp_set_num_threads(args.threads)
+            memory = index_bytes(index) / 2 ** 20
+
+            for value in values:
+                if knob:
+                    set_search_params(index, **{knob: value})
+                found, timings = measure(index, queries, args.k)
+                if exact is None:
+                    exact = found
+                label = f"{knob}={value}" if knob else 'exact'
+                print(f"{size:>9} {kind:>9} {label:>14} {build_time:>10.2f} {memory:>12.1f} "
+                      f"{recall_at_k(found, exact):>11.3f} {np.percentile(timings, 50) * 1000:>9.2f} "
+                      f"{np.percentile(timings, 99) * 1000:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
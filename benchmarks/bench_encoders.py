@@ -0,0 +1,83 @@
+# benchmarks/bench_encoders.py
+# Parity and latency of the encoder backends in matching/encoders.py.
+# Parity: cosine similarity of every backend's embeddings with the PyTorch reference on real listing texts;
+# exits non-zero if any backend falls below --min-cosine. tests/test_encoders.py runs the same check
+# under the test runner.
+# Latency: median seconds per encode() call at batch sizes 1-64.
+# Usage: python benchmarks/bench_encoders.py [--model all-MiniLM-L6-v2] [--backends torch onnx onnx-int8]
+
+import argparse
+import csv
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from matching.encoders import BACKENDS, cosine_agreement, load_encoder
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# The reference backend is compared with itself, and hashing is a different model altogether.
+PARITY_BACKENDS = ('torch-int8', 'onnx', 'onnx-int8')
+
+
+def listing_texts(limit):
+    with open(os.path.join(ROOT, 'internships.csv'), newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    texts = [f"{row['Title']}. Skills: {row['Skills']}" for row in rows[:limit]]
+    # A few student-profile style queries too, which are shorter than the listings.
+    return texts + ['Python, SQL, Machine Learning', 'Content Writing', 'React, Node.js, MongoDB', 'Hindi']
+
+
+def median_seconds(encoder, texts, repeats):
+    encoder.encode(texts, batch_size=len(texts))  # warm up (allocations, ORT graph optimisation)
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        encoder.encode(texts, batch_size=len(texts))
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare encoder backends for parity and CPU latency.")
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument('--texts', type=int, default=256, help="Listing texts used for the parity check.")
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--min-cosine', type=float, default=0.99,
+                        help="Lowest acceptable per-text cosine with the torch reference.")
+    args = parser.parse_args()
+
+    texts = listing_texts(args.texts)
+    encoders = {backend: load_encoder(args.model, backend) for backend in args.backends}
+    reference = encoders.get('torch') or load_encoder(args.model, 'torch')
+
+    failed = []
+    print(f"Parity with torch on {len(texts)} texts ({args.model}):")
+    print(f"{'backend':>11} {'min cosine':>11} {'mean cosine':>12}")
+    for backend, encoder in encoders.items():
+        if backend not in PARITY_BACKENDS:
+            continue
+        agreement = cosine_agreement(reference, encoder, texts)
+        print(f"{backend:>11} {agreement.min():>11.5f} {agreement.mean():>12.5f}")
+        if agreement.min() < args.min_cosine:
+            failed.append(backend)
+
+    print(f"\nMedian latency per encode() call (ms):")
+    print(f"{'batch':>6} " + ' '.join(f"{backend:>11}" for backend in encoders))
+    for batch_size in args.batch_sizes:
+        batch = (texts * (batch_size // len(texts) + 1))[:batch_size]
+        timings = [median_seconds(encoder, batch, args.repeats) * 1000 for encoder in encoders.values()]
+        print(f"{batch_size:>6} " + ' '.join(f"{timing:>11.2f}" for timing in timings))
+
+    if failed:
+        print(f"\n❌ Below {args.min_cosine} cosine with the reference: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
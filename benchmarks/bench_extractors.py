@@ -0,0 +1,63 @@
+# benchmarks/bench_extractors.py
+# Times each HTML extraction backend over a corpus of saved listing pages, checks that they all
+# produce exactly the rows of the original html.parser extractor, and measures process-pool parsing.
+# Usage: python benchmarks/bench_extractors.py [--pages scraping/fixtures/internships] [--repeat 20]
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from scraping.parsing import EXTRACTORS, extract_with_html_parser
+
+DEFAULT_PAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scraping', 'fixtures', 'internships')
+
+
+def load_corpus(directory):
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), 'rb') as f:
+            pages.append((name, f.read()))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper's HTML extraction backends.")
+    parser.add_argument('--pages', default=DEFAULT_PAGES, help="Directory of saved listing pages.")
+    parser.add_argument('--repeat', type=int, default=20, help="Passes over the corpus per backend.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help="Processes for the pool run.")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.pages)
+    total_bytes = sum(len(body) for _, body in corpus)
+    print(f"{len(corpus)} pages, {total_bytes / 1024:.0f} KiB, {args.repeat} passes\n")
+
+    expected = {name: extract_with_html_parser(body, with_ids=True) for name, body in corpus}
+    baseline = None
+    print(f"{'backend':>12} {'ms/page':>9} {'MiB/s':>8} {'speedup':>8}  identical")
+    for backend, extract in EXTRACTORS.items():
+        identical = all(extract(body, with_ids=True) == expected[name] for name, body in corpus)
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, body in corpus:
+                extract(body)
+        elapsed = time.perf_counter() - started
+        per_page = elapsed / (args.repeat * len(corpus))
+        baseline = baseline or per_page
+        print(f"{backend:>12} {per_page * 1000:>9.3f} {total_bytes * args.repeat / elapsed / 2**20:>8.1f} "
+              f"{baseline / per_page:>7.1f}x  {'yes' if identical else 'NO'}")
+
+    fastest = 'lxml' if 'lxml' in EXTRACTORS else 'subtree'
+    bodies = [body for _ in range(args.repeat) for _, body in corpus]
+    with ProcessPoolExecutor(args.workers) as pool:
+        list(pool.map(EXTRACTORS[fastest], bodies[:args.workers]))  # start the workers outside the timing
+        started = time.perf_counter()
+        list(pool.map(EXTRACTORS[fastest], bodies, chunksize=max(1, len(bodies) // (args.workers * 4))))
+        elapsed = time.perf_counter() - started
+    print(f"\n{fastest} in a {args.workers}-process pool: {len(bodies) / elapsed:.0f} pages/s")
+
+
+if __name__ == '__main__':
+    main()
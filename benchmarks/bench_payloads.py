@@ -0,0 +1,105 @@
+# benchmarks/bench_payloads.py
+# Bytes on the wire and serialisation time of recommendation responses: the old payload (every field,
+# a roadmap under every missing skill, DRF's json encoder) against the frontend's sparse fieldset with
+# a roadmap table and the orjson renderer, raw and gzipped.
+# Results are built from internships.csv listings; the CSV has no descriptions, so each gets
+# --description-chars of text (scraped descriptions run to a few thousand characters).
+# Usage: python benchmarks/bench_payloads.py [--results 5 20 100]
+
+import argparse
+import csv
+import gzip
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'Django_backend_prototype'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'internship_backend.settings')
+os.environ.setdefault('DJANGO_SECRET_KEY', 'benchmark')
+
+import django
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer
+from recommender.payloads import render_results
+from recommender.ranking import get_youtube_link, roadmap_key
+from recommender.renderers import ORJSONRenderer
+from recommender.skills import split_skills
+
+STUDENT_SKILLS = {'python', 'sql', 'machine learning'}
+
+# What recommender/static/recommender/script.js asks for.
+FRONTEND_FIELDS = ['title', 'company', 'location', 'duration', 'stipend', 'description', 'apply_link',
+                   'match_percentage', 'match_reason', 'missing_skills']
+
+DESCRIPTION = ("Selected intern's day-to-day responsibilities include working with the team on live projects, "
+               "researching requirements, preparing reports and presenting findings to stakeholders. ")
+
+
+def enriched_results(count, description_chars):
+    """Results shaped like ranking.enrich_results output, from the first `count` CSV listings."""
+    with open(os.path.join(ROOT, 'internships.csv'), newline='', encoding='utf-8') as f:
+        rows = [row for _, row in zip(range(count), csv.DictReader(f))]
+    description = (DESCRIPTION * (description_chars // len(DESCRIPTION) + 1))[:description_chars]
+    results = []
+    for i, row in enumerate(rows):
+        skills = split_skills(row['Skills'])
+        matching = [skill for skill in skills if skill in STUDENT_SKILLS]
+        results.append({
+            'id': i + 1,
+            'title': row['Title'],
+            'company': row['Company'],
+            'location': row['Location'],
+            'duration': '3 Months',
+            'stipend': row['Stipend'],
+            'description': description,
+            'apply_link': f'https://internshala.com/internship/detail/{i + 1}',
+            'skills': row['Skills'],
+            'interests': 'Technology',
+            'match_percentage': int(len(matching) / len(skills) * 100) if skills else 0,
+            'match_reason': "This internship is a great fit because it aligns with your interest in **Technology**.",
+            'missing_skills': [
+                {'skill': skill.title(), 'youtube_link': get_youtube_link(skill), 'roadmap': roadmap_key(skill)}
+                for skill in skills if skill not in STUDENT_SKILLS
+            ],
+        })
+    return results
+
+
+def median_ms(render, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recommendation payload size and serialisation time.")
+    parser.add_argument('--results', type=int, nargs='+', default=[5, 20, 100], help="Results per response.")
+    parser.add_argument('--description-chars', type=int, default=1500)
+    parser.add_argument('--repeats', type=int, default=200)
+    args = parser.parse_args()
+
+    variants = {
+        'before': (JSONRenderer(), {}),
+        'fields+ref': (JSONRenderer(), {'fields': FRONTEND_FIELDS, 'roadmaps': 'ref'}),
+        'after (orjson)': (ORJSONRenderer(), {'fields': FRONTEND_FIELDS, 'roadmaps': 'ref'}),
+    }
+    print(f"{'results':>7} {'payload':>15} {'bytes':>9} {'gzip bytes':>11} {'render+encode (ms)':>19}")
+    for count in args.results:
+        results = enriched_results(count, args.description_chars)
+        for name, (renderer, options) in variants.items():
+            render = lambda: renderer.render(render_results(results, **options))
+            body = render()
+            print(f"{len(results):>7} {name:>15} {len(body):>9} {len(gzip.compress(body)):>11} "
+                  f"{median_ms(render, args.repeats):>19.3f}")
+
+
+if __name__ == '__main__':
+    main()
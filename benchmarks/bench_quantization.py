@@ -0,0 +1,87 @@
+# benchmarks/bench_quantization.py
+# Memory and ranking agreement of float16 / int8 catalog embeddings against float32, with and
+# without exact rescoring of the coarse top candidates, on held-out queries. Latency is reported for
+# one query per call and per query when --batch queries share a call: coarse scoring casts the compact
+# copy to float32 once per call, which dominates float16's single-query latency.
+# Usage: python benchmarks/bench_quantization.py [--sizes 4000 100000] [--bundle "SIH PRE/internships.bundle"]
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from bench_ann import synthetic_embeddings
+from matching.bundle import load_bundle
+from matching.quantization import PRECISIONS, coarse_scores, quantize, rescore
+
+
+def top_k(scores, k):
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+def overlap(found, exact):
+    return len(np.intersect1d(found, exact)) / len(exact)
+
+
+def evaluate(catalog, queries, k, rescore_depth, batch):
+    exact = [top_k(catalog @ query, k) for query in queries]
+    for precision in PRECISIONS:
+        compact, scale = quantize(catalog, precision)
+        coarse_agree, rescored_agree, top1_agree, timings = [], [], [], []
+        for query, truth in zip(queries, exact):
+            started = time.perf_counter()
+            coarse = coarse_scores(compact, scale, query)[0]
+            candidates = top_k(coarse, min(rescore_depth, len(coarse)))
+            rescored = candidates[top_k(rescore(catalog, query, candidates), k)]
+            timings.append(time.perf_counter() - started)
+
+            coarse_agree.append(overlap(candidates[:k], truth))
+            rescored_agree.append(overlap(rescored, truth))
+            top1_agree.append(rescored[0] == truth[0])
+
+        batch_timings = []
+        for start in range(0, len(queries), batch):
+            block = queries[start:start + batch]
+            started = time.perf_counter()
+            coarse = coarse_scores(compact, scale, block)
+            for query, query_coarse in zip(block, coarse):
+                candidates = top_k(query_coarse, min(rescore_depth, len(query_coarse)))
+                rescored = candidates[top_k(rescore(catalog, query, candidates), k)]
+            batch_timings.append((time.perf_counter() - started) / len(block))
+        print(f"{len(catalog):>9} {precision:>8} {compact.nbytes / 2 ** 20:>12.1f} {catalog.nbytes / compact.nbytes:>7.1f}x "
+              f"{np.mean(coarse_agree):>13.4f} {np.mean(rescored_agree):>15.4f} {np.mean(top1_agree):>9.4f} "
+              f"{np.percentile(timings, 50) * 1000:>9.2f} {np.mean(batch_timings) * 1000:>13.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark quantized embedding storage with exact rescoring.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4000, 100000])
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--bundle', help="Use a real index bundle's embeddings instead of synthetic ones.")
+    parser.add_argument('--k', type=int, default=10, help="Ranking depth compared against float32.")
+    parser.add_argument('--rescore', type=int, default=400, help="Coarse candidates rescored exactly.")
+    parser.add_argument('--queries', type=int, default=200, help="Held-out queries.")
+    parser.add_argument('--batch', type=int, default=32, help="Queries per coarse_scores call for the batched latency.")
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'storage':>8} {'memory (MB)':>12} {'saving':>8} "
+          f"{'coarse@' + str(args.k):>13} {'rescored@' + str(args.k):>15} {'top-1':>9} {'p50 (ms)':>9} {'batched ms/q':>13}")
+    if args.bundle:
+        # Hold out random catalog rows as queries and search the remaining rows.
+        vectors = np.asarray(load_bundle(args.bundle).matrix, dtype=np.float32)
+        held_out = np.random.default_rng(0).permutation(len(vectors))
+        evaluate(vectors[held_out[args.queries:]], vectors[held_out[:args.queries]], args.k, args.rescore, args.batch)
+    else:
+        for size in args.sizes:
+            vectors = synthetic_embeddings(size + args.queries, args.dim)
+            evaluate(vectors[:size], vectors[size:], args.k, args.rescore, args.batch)
+    print("float16 saves memory, not time: every coarse_scores call casts it to float32 (numpy has no float16 "
+          "BLAS), so batch queries or prefer int8.")
+
+
+if __name__ == '__main__':
+    main()
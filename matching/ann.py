@@ -0,0 +1,114 @@
+# matching/ann.py
+# Approximate nearest-neighbour index options over L2-normalised embeddings (inner product == cosine).
+# `flat` is exact brute force; the others trade a little recall for sub-linear search:
+#   ivf-flat  k-means coarse quantiser, full vectors in the lists      (tune nprobe)
+#   ivf-pq    same lists, vectors product-quantised to m bytes         (tune nprobe)
+#   hnsw      graph index, no training, more memory                    (tune ef_search)
+
+import math
+
+import numpy as np
+import faiss
+
+INDEX_KINDS = ('flat', 'ivf-flat', 'ivf-pq', 'hnsw')
+
+# faiss wants ~39 training points per centroid; below that it warns and clusters poorly.
+MIN_POINTS_PER_CENTROID = 39
+
+
+def default_nlist(count):
+    """~4*sqrt(n) inverted lists (faiss's usual guidance), capped so every list gets enough training points."""
+    return max(1, min(int(4 * math.sqrt(count)), count // MIN_POINTS_PER_CENTROID))
+
+
+def default_pq_m(dim):
+    """Sub-quantisers for IVF-PQ: one byte per 16 dimensions (48 for 768-d), and it must divide dim."""
+    m = max(1, dim // 16)
+    while dim % m:
+        m -= 1
+    return m
+
+
+def build_index(matrix, kind='flat', nlist=None, pq_m=None, pq_bits=8, hnsw_m=32, ef_construction=200, seed=0):
+    """
+    Builds an index of `kind` over the rows of `matrix`; search results are row positions.
+    IVF indexes are trained on (a sample of) the matrix itself.
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    count, dim = matrix.shape
+
+    if kind == 'flat':
+        index = faiss.IndexFlatIP(dim)
+    elif kind in ('ivf-flat', 'ivf-pq'):
+        nlist = nlist or default_nlist(count)
+        quantizer = faiss.IndexFlatIP(dim)
+        if kind == 'ivf-flat':
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        else:
+            # Each sub-quantiser trains 2**pq_bits centroids; use fewer bits than that on small catalogs.
+            pq_bits = max(1, min(pq_bits, int(math.log2(max(2, count // MIN_POINTS_PER_CENTROID)))))
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, pq_m or default_pq_m(dim), pq_bits, faiss.METRIC_INNER_PRODUCT)
+        index.cp.seed = seed
+        sample = matrix
+        max_training = nlist * 256
+        if count > max_training:
+            sample = matrix[np.random.default_rng(seed).choice(count, max_training, replace=False)]
+        index.train(sample)
+    elif kind == 'hnsw':
+        index = faiss.IndexHNSWFlat(dim, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = ef_construction
+    else:
+        raise ValueError(f"Unknown index kind {kind!r}; expected one of {', '.join(INDEX_KINDS)}")
+
+    index.add(matrix)
+    return index
+
+
+def set_search_params(index, nprobe=None, ef_search=None):
+    """Sets the recall/speed knob of whichever index this is; parameters that do not apply are ignored."""
+    if nprobe is not None and hasattr(index, 'nprobe'):
+        index.nprobe = nprobe
+    if ef_search is not None and hasattr(index, 'hnsw'):
+        index.hnsw.efSearch = ef_search
+    return index
+
+
+def index_kind(index):
+    if isinstance(index, faiss.IndexHNSW):
+        return 'hnsw'
+    if isinstance(index, faiss.IndexIVFPQ):
+        return 'ivf-pq'
+    if isinstance(index, faiss.IndexIVF):
+        return 'ivf-flat'
+    return 'flat'
+
+
+def index_bytes(index):
+    """Serialized size of the index, a close proxy for its resident memory."""
+    return int(faiss.serialize_index(index).nbytes)
+
+
+def search_params(index, selector=None, widen=1):
+    """
+    faiss SearchParameters for `index` restricted to `selector`, with its nprobe / efSearch multiplied by
+    `widen` (used to search harder when a filter leaves too few hits).
+    """
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=index.hnsw.efSearch * widen)
+    if isinstance(index, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(sel=selector, nprobe=min(index.nlist, index.nprobe * widen))
+    return faiss.SearchParameters(sel=selector)
+
+
+def distances_computed(index):
+    """Vectors compared by the last search on this thread's stats counters (IVF and HNSW only)."""
+    if isinstance(index, faiss.IndexHNSW):
+        return int(faiss.cvar.hnsw_stats.ndis)
+    if isinstance(index, faiss.IndexIVF):
+        return int(faiss.cvar.indexIVF_stats.ndis)
+    return int(index.ntotal)
+
+
+def reset_search_stats():
+    faiss.cvar.hnsw_stats.reset()
+    faiss.cvar.indexIVF_stats.reset()
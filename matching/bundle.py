@@ -0,0 +1,323 @@
+# matching/bundle.py
+# Versioned, memory-mapped index bundle: one directory per version holding the embedding matrix,
+# the internship ids, per-row metadata and a manifest with the model fingerprint and checksums.
+#
+#   internships.bundle/
+#       CURRENT                  name of the live version, swapped atomically
+#       v000003/
+#           manifest.json        format, model name, dim, count, sha256 + size of every file
+#           embeddings.npy       float32 (count, dim), L2-normalised
+#           embeddings.int8.npy  optional compact copy for coarse scoring (or .float16.npy),
+#           embeddings.scale.npy   with int8's per-dimension scale (see matching.quantization)
+#           ids.npy              fixed-width unicode (count,)
+#           metadata.jsonl       one JSON object per row
+#           metadata_offsets.npy int64 (count + 1,) byte offsets into metadata.jsonl
+#           index.faiss          optional ANN index over the rows (see matching.ann)
+#           filter.<name>.*.npy  optional posting lists: sorted values, offsets, row positions
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+
+import numpy as np
+import faiss
+
+from .ann import distances_computed, index_kind, reset_search_stats, search_params, set_search_params
+from .quantization import coarse_scores, quantize, rescore
+
+FORMAT = 'internship-bundle/1'
+CURRENT = 'CURRENT'
+
+
+class BundleError(ValueError):
+    """The bundle is missing, corrupt, or was built for a different model."""
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _atomic_write_text(path, text):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+
+def current_version(root):
+    """Name of the live version directory, or None if no bundle has been written yet."""
+    try:
+        with open(os.path.join(root, CURRENT), encoding='utf-8') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def filter_value(value):
+    """Filter values are matched case- and whitespace-insensitively."""
+    return ' '.join(str(value).split()).lower()
+
+
+def _write_filter(directory, name, row_values):
+    # Posting lists in CSR form: values[i] owns rows[offsets[i]:offsets[i + 1]], rows ascending.
+    postings = {}
+    for position, values in enumerate(row_values):
+        for value in {filter_value(value) for value in values}:
+            postings.setdefault(value, []).append(position)
+    values = sorted(postings)
+    offsets = np.cumsum([0] + [len(postings[value]) for value in values], dtype=np.int64)
+    rows = np.array([position for value in values for position in postings[value]], dtype=np.int64)
+    np.save(os.path.join(directory, f'filter.{name}.values.npy'), np.array(values, dtype=str))
+    np.save(os.path.join(directory, f'filter.{name}.offsets.npy'), offsets)
+    np.save(os.path.join(directory, f'filter.{name}.rows.npy'), rows)
+
+
+def write_bundle(root, ids, matrix, metadata, model_name, ann_index=None, filters=None, precision='float32', keep=2):
+    """
+    Writes a new version of the bundle and makes it live. The version directory is filled under a
+    temporary name and renamed into place before CURRENT is switched, so readers never see a partial
+    bundle. The newest `keep` versions are kept; older ones are deleted (open mmaps stay valid on POSIX).
+    `ann_index` (a faiss index whose results are row positions, e.g. from matching.ann.build_index)
+    is stored alongside; without one, searches are exact. `filters` maps a filter name to one list of
+    values per row (e.g. {'location': [['mumbai'], ...]}) for Bundle.search_filtered.
+    With `precision` 'float16' or 'int8', a compact copy of the matrix is stored for coarse scoring.
+    Returns the new version name.
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    if matrix.ndim != 2 or len(matrix) != len(ids) or len(metadata) != len(ids):
+        raise BundleError(f"{len(ids)} ids, {len(metadata)} metadata rows and a {matrix.shape} matrix do not line up")
+
+    os.makedirs(root, exist_ok=True)
+    previous = current_version(root)
+    version = f"v{int(previous[1:]) + 1 if previous else 1:06d}"
+    tmp_dir = tempfile.mkdtemp(dir=root, prefix='.tmp-')
+    try:
+        np.save(os.path.join(tmp_dir, 'embeddings.npy'), matrix)
+        if precision != 'float32':
+            compact, scale = quantize(matrix, precision)
+            np.save(os.path.join(tmp_dir, f'embeddings.{precision}.npy'), compact)
+            if scale is not None:
+                np.save(os.path.join(tmp_dir, 'embeddings.scale.npy'), scale)
+        np.save(os.path.join(tmp_dir, 'ids.npy'), np.array([str(i) for i in ids], dtype=str))
+
+        offsets = [0]
+        with open(os.path.join(tmp_dir, 'metadata.jsonl'), 'wb') as f:
+            for row in metadata:
+                line = json.dumps(row, ensure_ascii=False).encode('utf-8') + b'\n'
+                f.write(line)
+                offsets.append(offsets[-1] + len(line))
+        np.save(os.path.join(tmp_dir, 'metadata_offsets.npy'), np.array(offsets, dtype=np.int64))
+        if ann_index is not None:
+            faiss.write_index(ann_index, os.path.join(tmp_dir, 'index.faiss'))
+        for name, row_values in (filters or {}).items():
+            if len(row_values) != len(ids):
+                raise BundleError(f"Filter {name!r} has {len(row_values)} rows, expected {len(ids)}")
+            _write_filter(tmp_dir, name, row_values)
+
+        files = {
+            name: {'bytes': os.path.getsize(os.path.join(tmp_dir, name)), 'sha256': _sha256(os.path.join(tmp_dir, name))}
+            for name in sorted(os.listdir(tmp_dir))
+        }
+        manifest = {
+            'format': FORMAT,
+            'version': version,
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'model_name': model_name,
+            'dim': int(matrix.shape[1]),
+            'count': int(matrix.shape[0]),
+            'precision': precision,
+            'ann': index_kind(ann_index) if ann_index is not None else None,
+            'filters': sorted(filters or {}),
+            'files': files,
+        }
+        with open(os.path.join(tmp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.chmod(tmp_dir, 0o755)
+        os.rename(tmp_dir, os.path.join(root, version))
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    _atomic_write_text(os.path.join(root, CURRENT), version + '\n')
+
+    versions = sorted(name for name in os.listdir(root) if name.startswith('v') and name[1:].isdigit())
+    for old in versions[:-keep]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    return version
+
+
+class Bundle:
+    """
+    A loaded bundle version. Arrays are memory-mapped, so opening one costs the same for 4k or 4M
+    rows and pages are only read from disk when a search or lookup touches them.
+    With a compact (float16/int8) copy, exact scans score that copy and only the best `rescore`
+    candidates per query are read back from the float32 matrix.
+    """
+
+    def __init__(self, path, manifest, nprobe=None, ef_search=None, rescore=400):
+        self.path = path
+        self.manifest = manifest
+        self.version = manifest['version']
+        self.model_name = manifest['model_name']
+        self.dim = manifest['dim']
+        self.matrix = np.load(os.path.join(path, 'embeddings.npy'), mmap_mode='r')
+        self.ids = np.load(os.path.join(path, 'ids.npy'), mmap_mode='r')
+        self.offsets = np.load(os.path.join(path, 'metadata_offsets.npy'), mmap_mode='r')
+        self.precision = manifest.get('precision', 'float32')
+        self.rescore = rescore
+        self.compact = self.scale = None
+        if self.precision != 'float32':
+            self.compact = np.load(os.path.join(path, f'embeddings.{self.precision}.npy'), mmap_mode='r')
+            if self.precision == 'int8':
+                self.scale = np.load(os.path.join(path, 'embeddings.scale.npy'))
+        with open(os.path.join(path, 'metadata.jsonl'), 'rb') as f:
+            self._metadata = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.offsets[-1] else b''
+        self.ann = None
+        if manifest.get('ann'):
+            self.ann = set_search_params(faiss.read_index(os.path.join(path, 'index.faiss')), nprobe, ef_search)
+        self.filters = {
+            name: tuple(np.load(os.path.join(path, f'filter.{name}.{part}.npy'), mmap_mode='r')
+                        for part in ('values', 'offsets', 'rows'))
+            for name in manifest.get('filters', [])
+        }
+
+    @property
+    def ntotal(self):
+        return len(self.ids)
+
+    def metadata(self, position):
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return json.loads(self._metadata[start:end])
+
+    def search(self, query_vectors, k):
+        """
+        Top-k rows by inner product, returned as (scores, positions) like FAISS. Uses the bundle's ANN
+        index when it has one (positions may then be -1 past the last hit), else an exact scan of the matrix.
+        """
+        query_vectors = np.atleast_2d(np.asarray(query_vectors, dtype=np.float32))
+        if self.ann is not None:
+            return self.ann.search(np.ascontiguousarray(query_vectors), k)
+        return self._scan(query_vectors, k)
+
+    def scan_bytes(self):
+        """Bytes an exact scan reads: the compact copy if there is one, else the float32 matrix."""
+        return int((self.compact if self.compact is not None else self.matrix).nbytes)
+
+    def _scan(self, query_vectors, k, rows=None):
+        # Exact top-k over every row (or just `rows`); returns global positions.
+        if self.compact is None:
+            matrix = self.matrix if rows is None else self.matrix[rows]
+            scores, top = _exact_top_k(query_vectors @ matrix.T, k)
+        else:
+            coarse, top = _exact_top_k(coarse_scores(self.compact, self.scale, query_vectors, rows), max(k, self.rescore))
+            scores = np.empty_like(coarse)
+            for i, query_vector in enumerate(query_vectors):
+                scores[i] = rescore(self.matrix, query_vector, top[i] if rows is None else rows[top[i]])
+            order = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+            scores, top = np.take_along_axis(scores, order, axis=1), np.take_along_axis(top, order, axis=1)
+        return scores, (top if rows is None else rows[top])
+
+    def filter_positions(self, name, value):
+        """Ascending row positions whose `name` filter holds `value` (empty if none). O(log values) via mmap."""
+        if name not in self.filters:
+            raise BundleError(f"{self.path} has no {name!r} filter; rebuild it with create_faiss_index.py")
+        values, offsets, rows = self.filters[name]
+        value = filter_value(value)
+        i = int(np.searchsorted(values, value))
+        if i == len(values) or values[i] != value:
+            return np.empty(0, dtype=np.int64)
+        return rows[offsets[i]:offsets[i + 1]]
+
+    def search_filtered(self, query_vector, k, positions, exhaustive_limit=50000, max_widen=16):
+        """
+        Top-k among `positions` only, for one query. Returns (scores, positions, stats), where stats has
+        the strategy used and the number of vectors scanned. Never comes back empty while `positions` is not.
+
+        Small filters (or bundles without an ANN index) are scanned exactly: at most `exhaustive_limit`
+        dot products, however rare the location. Larger ones use the ANN index restricted to the filter
+        with an id selector, searching harder (nprobe/efSearch x4, up to `max_widen`) while fewer than
+        k hits come back, then falling back to the exact scan.
+        """
+        query_vector = np.atleast_2d(np.asarray(query_vector, dtype=np.float32))[:1]
+        positions = np.asarray(positions, dtype=np.int64)
+        k = min(k, len(positions))
+        if not k:
+            return np.empty(0, np.float32), np.empty(0, np.int64), {'strategy': 'empty', 'scanned': 0}
+
+        if self.ann is not None and len(positions) > exhaustive_limit:
+            selector = faiss.IDSelectorBatch(positions)
+            widen = 1
+            scanned = 0
+            while widen <= max_widen:
+                reset_search_stats()
+                scores, found = self.ann.search(np.ascontiguousarray(query_vector), k,
+                                                params=search_params(self.ann, selector, widen))
+                scanned += distances_computed(self.ann)
+                hits = found[0] != -1
+                if hits.sum() >= k:
+                    return scores[0][hits], found[0][hits], {'strategy': f'ann x{widen}', 'scanned': scanned}
+                widen *= 4
+        else:
+            scanned = 0
+
+        scores, found = self._scan(query_vector, k, positions)
+        return scores[0], found[0], {'strategy': 'exact', 'scanned': scanned + len(positions)}
+
+
+def _exact_top_k(scores, k):
+    k = min(k, scores.shape[1])
+    if not k:
+        return np.empty((len(scores), 0), np.float32), np.empty((len(scores), 0), np.int64)
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+    return np.take_along_axis(top_scores, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+
+def load_bundle(root, model_name=None, dim=None, verify=False, nprobe=None, ef_search=None, rescore=400):
+    """
+    Opens the live version under `root`. Fails fast with BundleError if the bundle was built with
+    another model or dimension, or if its files do not match the manifest (sizes always;
+    full sha256 checksums with `verify=True`, which reads every byte).
+    `nprobe` / `ef_search` tune the bundle's ANN index, if it has one, and `rescore` its compact scans.
+    """
+    version = current_version(root)
+    if version is None:
+        raise BundleError(f"No bundle found in {root}")
+    path = os.path.join(root, version)
+    try:
+        with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BundleError(f"Unreadable manifest in {path}: {e}") from e
+
+    if manifest.get('format') != FORMAT:
+        raise BundleError(f"{path} has format {manifest.get('format')!r}, expected {FORMAT!r}")
+    if model_name is not None and manifest['model_name'] != model_name:
+        raise BundleError(f"{path} was built with {manifest['model_name']}, not {model_name}")
+    if dim is not None and manifest['dim'] != dim:
+        raise BundleError(f"{path} holds {manifest['dim']}-d embeddings, the model produces {dim}-d")
+
+    for name, expected in manifest['files'].items():
+        file_path = os.path.join(path, name)
+        if not os.path.exists(file_path) or os.path.getsize(file_path) != expected['bytes']:
+            raise BundleError(f"{file_path} is missing or does not match the manifest")
+        if verify and _sha256(file_path) != expected['sha256']:
+            raise BundleError(f"{file_path} fails its checksum")
+
+    bundle = Bundle(path, manifest, nprobe, ef_search, rescore)
+    if bundle.matrix.shape != (manifest['count'], manifest['dim']) or len(bundle.ids) != manifest['count']:
+        raise BundleError(f"{path} arrays do not match the manifest shape")
+    return bundle
@@ -0,0 +1,233 @@
+# matching/catalog_cache.py
+# Typed, columnar copy of an internships CSV, so the recommenders stop re-parsing it on every start.
+# `internships.csv` is converted once into `internships.catalog.npz`:
+#   - repetitive text columns (Location, Company, ...) are categorical: int32 codes + the distinct values
+#   - other text columns are one UTF-8 buffer + row offsets
+#   - Skills is also stored pre-split, exactly as matching.scoring.split_skills splits it: a CSR of
+#     codes into the distinct skills, from which Catalog.skill_matrix() builds the keyword scorer
+# The cache records the CSV's size, mtime and sha256 and is rebuilt whenever the CSV changes.
+
+import csv
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Mapping
+
+import numpy as np
+
+from .scoring import SkillMatrix, split_skills
+
+FORMAT_VERSION = 3
+
+# Always categorical; other columns are when at most half of their values are distinct.
+CATEGORICAL_COLUMNS = {'Location', 'Locations', 'Company', 'Status'}
+
+
+def cache_path_for(csv_path):
+    return os.path.splitext(csv_path)[0] + '.catalog.npz'
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_stamp(csv_path):
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _encode_strings(values):
+    """One UTF-8 buffer plus n+1 offsets."""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def _decode_strings(data, offsets):
+    buffer = data.tobytes()
+    return [buffer[start:end].decode('utf-8') for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+def build_catalog_cache(csv_path, cache_path=None):
+    """Converts `csv_path` into the columnar cache (written atomically) and returns the cache path."""
+    cache_path = cache_path or cache_path_for(csv_path)
+    stamp = _source_stamp(csv_path)
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        columns = {name: [] for name in reader.fieldnames or []}
+        for row in reader:
+            for name, values in columns.items():
+                values.append(row.get(name) or '')
+
+    arrays = {}
+    categorical = []
+    for name, values in columns.items():
+        distinct = sorted(set(values))
+        if name in CATEGORICAL_COLUMNS or len(distinct) <= len(values) // 2:
+            codes = {value: code for code, value in enumerate(distinct)}
+            arrays[f'{name}.codes'] = np.fromiter((codes[value] for value in values), dtype=np.int32, count=len(values))
+            arrays[f'{name}.categories.data'], arrays[f'{name}.categories.offsets'] = _encode_strings(distinct)
+            categorical.append(name)
+        else:
+            arrays[f'{name}.data'], arrays[f'{name}.offsets'] = _encode_strings(values)
+
+    if 'Skills' in columns:
+        skill_codes = {}
+        indptr = [0]
+        codes = []
+        for skills in columns['Skills']:
+            codes.extend(skill_codes.setdefault(skill, len(skill_codes)) for skill in sorted(split_skills(skills)))
+            indptr.append(len(codes))
+        arrays['skills.values.data'], arrays['skills.values.offsets'] = _encode_strings(list(skill_codes))
+        arrays['skills.codes'] = np.asarray(codes, dtype=np.int32)
+        arrays['skills.indptr'] = np.asarray(indptr, dtype=np.int64)
+
+    meta = {
+        'format': FORMAT_VERSION,
+        'rows': len(next(iter(columns.values()), [])),
+        'columns': list(columns),
+        'categorical': categorical,
+        'source': {**stamp, 'sha256': file_sha256(csv_path)},
+    }
+    _write_cache(cache_path, meta, arrays)
+    return cache_path
+
+
+def _write_cache(cache_path, meta, arrays):
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(cache_path)), suffix='.npz')
+    with os.fdopen(fd, 'wb') as f:
+        np.savez(f, meta=json.dumps(meta), **arrays)
+    # mkstemp creates the file 0600; workers running as another user must still be able to read it.
+    os.chmod(temp_path, 0o644)
+    os.replace(temp_path, cache_path)
+
+
+class CatalogRow(Mapping):
+    """A read-only dict-like view of one catalog row; values are decoded on access."""
+
+    __slots__ = ('_catalog', '_position')
+
+    def __init__(self, catalog, position):
+        self._catalog = catalog
+        self._position = position
+
+    def __getitem__(self, name):
+        return self._catalog.value(name, self._position)
+
+    def __iter__(self):
+        return iter(self._catalog.columns)
+
+    def __len__(self):
+        return len(self._catalog.columns)
+
+    @property
+    def catalog(self):
+        return self._catalog
+
+    @property
+    def position(self):
+        return self._position
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class Catalog:
+    """The columnar catalog loaded from a cache file."""
+
+    def __init__(self, path):
+        with np.load(path) as stored:
+            self.meta = json.loads(str(stored['meta']))
+            arrays = {key: stored[key] for key in stored.files if key != 'meta'}
+        self.columns = self.meta['columns']
+        self.categorical = set(self.meta['categorical'])
+        # Categories are decoded once (a few thousand distinct strings instead of one str per row);
+        # free-text columns stay a single bytes buffer and are decoded per access.
+        self._categories = {
+            name: _decode_strings(arrays.pop(f'{name}.categories.data'), arrays.pop(f'{name}.categories.offsets'))
+            for name in self.categorical
+        }
+        self._buffers = {name: arrays.pop(f'{name}.data').tobytes() for name in self.columns if name not in self.categorical}
+        self._arrays = arrays
+
+    def __len__(self):
+        return self.meta['rows']
+
+    def value(self, name, position):
+        if name in self.categorical:
+            return self._categories[name][self._arrays[f'{name}.codes'][position]]
+        if name not in self._buffers:
+            raise KeyError(name)
+        offsets = self._arrays[f'{name}.offsets']
+        return self._buffers[name][offsets[position]:offsets[position + 1]].decode('utf-8')
+
+    def column(self, name):
+        """Every value of a column as a list of str."""
+        return [self.value(name, position) for position in range(len(self))]
+
+    def codes(self, name):
+        """(int32 codes, categories) of a categorical column."""
+        return self._arrays[f'{name}.codes'], self._categories[name]
+
+    def skill_matrix(self, positions=None):
+        """SkillMatrix of the pre-split Skills column (every row, or just `positions`), without re-splitting."""
+        vocabulary = _decode_strings(self._arrays['skills.values.data'], self._arrays['skills.values.offsets'])
+        return SkillMatrix.from_split(vocabulary, self._arrays['skills.indptr'], self._arrays['skills.codes'], positions)
+
+    def row(self, position):
+        return CatalogRow(self, position)
+
+    def rows(self):
+        """Dict-like views of every row, for code written against csv.DictReader output."""
+        return [CatalogRow(self, position) for position in range(len(self))]
+
+    def to_frame(self):
+        """A pandas DataFrame, with the categorical columns as pandas categoricals."""
+        import pandas as pd
+        data = {}
+        for name in self.columns:
+            if name in self.categorical:
+                codes, categories = self.codes(name)
+                data[name] = pd.Categorical.from_codes(codes, categories)
+            else:
+                data[name] = self.column(name)
+        return pd.DataFrame(data)
+
+
+def _is_fresh(cache_path, csv_path):
+    try:
+        with np.load(cache_path) as stored:
+            meta = json.loads(str(stored['meta']))
+    except (OSError, KeyError, ValueError):
+        return False
+    if meta.get('format') != FORMAT_VERSION:
+        return False
+    source = meta['source']
+    stamp = _source_stamp(csv_path)
+    if stamp['size'] != source['size']:
+        return False
+    # Same size and mtime: unchanged. Same size, new mtime (e.g. a fresh checkout): compare contents.
+    if stamp['mtime_ns'] == source['mtime_ns']:
+        return True
+    if file_sha256(csv_path) != source['sha256']:
+        return False
+    # Same contents: record the new mtime, so the next start does not hash the CSV again.
+    with np.load(cache_path) as stored:
+        arrays = {key: stored[key] for key in stored.files if key != 'meta'}
+    meta['source'] = {**source, **stamp}
+    _write_cache(cache_path, meta, arrays)
+    return True
+
+
+def load_catalog_cache(csv_path, cache_path=None):
+    """The columnar catalog for `csv_path`, (re)building the cache first if it is missing or stale."""
+    cache_path = cache_path or cache_path_for(csv_path)
+    if not _is_fresh(cache_path, csv_path):
+        build_catalog_cache(csv_path, cache_path)
+    return Catalog(cache_path)
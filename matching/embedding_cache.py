@@ -0,0 +1,126 @@
+# matching/embedding_cache.py
+# Content-addressed embedding cache shared by every script that encodes the catalog. Vectors are
+# stored in one SQLite table keyed on (encoder fingerprint, sha256 of the exact input text), so a
+# restart only encodes texts it has never seen, and identical skill strings are encoded once.
+
+import hashlib
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from .encoders import CACHE_DIR, Encoder, normalize
+
+DEFAULT_PATH = os.environ.get('EMBEDDING_CACHE', os.path.join(CACHE_DIR, 'embeddings.sqlite3'))
+
+# SQLite's default limit on bound parameters is 999 on older builds.
+LOOKUP_CHUNK = 500
+
+
+def text_key(text):
+    return hashlib.sha256(text.encode('utf-8')).digest()
+
+
+class EmbeddingCache:
+    """Append-only (fingerprint, text hash) -> float32 vector store."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            # Several scripts may share the file; WAL lets them read while another one appends.
+            self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS embeddings ('
+            ' fingerprint TEXT NOT NULL, text_hash BLOB NOT NULL, vector BLOB NOT NULL,'
+            ' PRIMARY KEY (fingerprint, text_hash)) WITHOUT ROWID'
+        )
+        self._connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, fingerprint, keys):
+        """{text hash: vector} for the keys that are cached under `fingerprint`."""
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_CHUNK):
+                chunk = keys[start:start + LOOKUP_CHUNK]
+                rows = self._connection.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE fingerprint = ? "
+                    f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                    [fingerprint, *chunk],
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, fingerprint, keys, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT OR IGNORE INTO embeddings (fingerprint, text_hash, vector) VALUES (?, ?, ?)',
+                ((fingerprint, key, vector.tobytes()) for key, vector in zip(keys, vectors)),
+            )
+
+    def encode(self, encoder, texts, fingerprint, batch_size=256, show_progress_bar=False):
+        """
+        Embeddings of `texts` (float32, one row per text). Each distinct text is looked up once, and
+        only the misses are sent to `encoder`, in batches of `batch_size`.
+        """
+        unique = list(dict.fromkeys(texts))
+        keys = [text_key(text) for text in unique]
+        found = self.get_many(fingerprint, keys)
+
+        missing = [i for i, key in enumerate(keys) if key not in found]
+        self.hits += len(unique) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            vectors = np.asarray(encoder.encode([unique[i] for i in missing], batch_size=batch_size,
+                                                convert_to_numpy=True, show_progress_bar=show_progress_bar),
+                                 dtype=np.float32)
+            self.put_many(fingerprint, [keys[i] for i in missing], vectors)
+            found.update(zip((keys[i] for i in missing), vectors))
+
+        if not unique:
+            return np.empty((0, encoder.get_sentence_embedding_dimension()), dtype=np.float32)
+        by_text = dict(zip(unique, (found[key] for key in keys)))
+        return np.stack([by_text[text] for text in texts])
+
+    def close(self):
+        self._connection.close()
+
+
+class CachedEncoder(Encoder):
+    """Wraps an encoder so every encode() call goes through an EmbeddingCache first."""
+
+    def __init__(self, encoder, cache=None):
+        super().__init__(encoder.model_name, encoder.get_sentence_embedding_dimension())
+        self.encoder = encoder
+        self.backend = encoder.backend
+        self.cache = cache or EmbeddingCache()
+
+    @property
+    def cache_key(self):
+        # The dimension guards against a model that is republished under the same name.
+        return f"{self.fingerprint}:{self.dim}"
+
+    def encode(self, sentences, batch_size=256, convert_to_numpy=True, normalize_embeddings=False,
+               show_progress_bar=False, **kwargs):
+        single = isinstance(sentences, str)
+        vectors = self.cache.encode(self.encoder, [sentences] if single else list(sentences), self.cache_key,
+                                    batch_size=batch_size, show_progress_bar=show_progress_bar)
+        if normalize_embeddings:
+            vectors = normalize(vectors)
+        return vectors[0] if single else vectors
+
+
+def uncached(encoder):
+    """
+    The encoder behind a CachedEncoder (any other encoder as it is). Student profiles and queries are
+    encoded through this: they are personal data that is rarely seen twice, so they are not persisted.
+    """
+    return encoder.encoder if isinstance(encoder, CachedEncoder) else encoder
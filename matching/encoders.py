@@ -0,0 +1,234 @@
+# matching/encoders.py
+# One Encoder interface over several ways of running the same sentence-embedding model on CPU:
+#   torch       the reference SentenceTransformer (PyTorch)
+#   torch-int8  the same model with its Linear layers dynamically quantized to int8
+#   onnx        the transformer exported once to ONNX and run with ONNX Runtime (no torch at query time)
+#   onnx-int8   that ONNX graph with dynamically int8-quantized weights
+#   hashing     a deterministic bag-of-words hashing encoder: offline, no model, for tests and benchmarks
+#
+# Encoders follow the SentenceTransformer calling convention (encode(...) and
+# get_sentence_embedding_dimension()), so the scripts can swap one in without other changes.
+
+import hashlib
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+BACKENDS = ('torch', 'torch-int8', 'onnx', 'onnx-int8', 'hashing')
+
+# Exported ONNX models (and their int8 variants) are cached here, one directory per model.
+CACHE_DIR = os.environ.get('ENCODER_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'sih-encoders'))
+
+
+def encoder_fingerprint(model_name, backend):
+    """
+    Identifies the vectors an encoder produces. Every backend gets its own fingerprint: even torch
+    and onnx only agree to float rounding, so vectors stored by one are never served as the other's.
+    """
+    return f"{model_name}#{backend}"
+
+
+def normalize(vectors):
+    """L2-normalises the rows of a 2-d array (all-zero rows are left as they are)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+class Encoder:
+    """Base class: subclasses implement `_encode_batch(list_of_texts) -> float32 (n, dim)`."""
+
+    backend = None
+
+    def __init__(self, model_name, dim):
+        self.model_name = model_name
+        self.dim = dim
+
+    @property
+    def fingerprint(self):
+        return encoder_fingerprint(self.model_name, self.backend)
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True, normalize_embeddings=False,
+               show_progress_bar=False, **kwargs):
+        """Encodes a text or a list of texts into float32 vectors (a single vector for a single text)."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if texts:
+            vectors = np.concatenate([
+                self._encode_batch(texts[start:start + batch_size]) for start in range(0, len(texts), batch_size)
+            ]).astype(np.float32, copy=False)
+        else:
+            vectors = np.empty((0, self.dim), dtype=np.float32)
+        if normalize_embeddings:
+            vectors = normalize(vectors)
+        return vectors[0] if single else vectors
+
+    def _encode_batch(self, texts):
+        raise NotImplementedError
+
+
+class HashingEncoder(Encoder):
+    """
+    Signed feature hashing of word unigrams and bigrams into `dim` buckets, L2-normalised.
+    Deterministic across processes and machines (blake2b, not Python's salted hash()).
+    """
+
+    backend = 'hashing'
+    _TOKEN = re.compile(r'[a-z0-9+#.]+')
+
+    def __init__(self, model_name='hashing', dim=384):
+        super().__init__(model_name, dim)
+
+    def _features(self, text):
+        words = self._TOKEN.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def _encode_batch(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+                vectors[row, digest % self.dim] += 1.0 if digest >> 63 else -1.0
+        return normalize(vectors)
+
+
+class TorchEncoder(Encoder):
+    """The SentenceTransformer itself, optionally with dynamically int8-quantized Linear layers."""
+
+    def __init__(self, model_name, quantize=False):
+        import torch
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(model_name, device='cpu')
+        if quantize:
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.model = model
+        self.backend = 'torch-int8' if quantize else 'torch'
+        super().__init__(model_name, model.get_sentence_embedding_dimension())
+
+    def _encode_batch(self, texts):
+        return self.model.encode(texts, batch_size=len(texts), convert_to_numpy=True)
+
+
+def export_onnx(model_name, directory):
+    """
+    Exports the SentenceTransformer's transformer to `directory`/model.onnx, next to its tokenizer and a
+    config.json describing the pooling, so OnnxEncoder can run it without torch or sentence_transformers.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize, Pooling
+
+    model = SentenceTransformer(model_name, device='cpu')
+    transformer = model[0]
+    pooling = next(module for module in model if isinstance(module, Pooling))
+    os.makedirs(directory, exist_ok=True)
+
+    inputs = transformer.tokenizer(['onnx export'], return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in inputs]
+
+    class Wrapped(torch.nn.Module):
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, *args):
+            return self.auto_model(**dict(zip(input_names, args))).last_hidden_state
+
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+    with torch.no_grad():
+        torch.onnx.export(Wrapped(transformer.auto_model).eval(), tuple(inputs[name] for name in input_names),
+                          os.path.join(directory, 'model.onnx'), input_names=input_names,
+                          output_names=['last_hidden_state'], dynamic_axes=dynamic_axes, opset_version=17,
+                          dynamo=False)
+
+    transformer.tokenizer.save_pretrained(directory)
+    config = {
+        'model_name': model_name,
+        'dim': model.get_sentence_embedding_dimension(),
+        'max_seq_length': model.max_seq_length,
+        # sentence-transformers < 5 exposes get_pooling_mode_str(); later versions a pooling_mode attribute
+        'pooling': pooling.get_pooling_mode_str() if hasattr(pooling, 'get_pooling_mode_str') else str(pooling.pooling_mode),
+        'normalize': any(isinstance(module, Normalize) for module in model),
+        'input_names': input_names,
+    }
+    with open(os.path.join(directory, 'config.json'), 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+    return config
+
+
+class OnnxEncoder(Encoder):
+    """The exported transformer on ONNX Runtime, with the SentenceTransformer's pooling done in numpy."""
+
+    _export_lock = threading.Lock()
+
+    def __init__(self, model_name, quantize=False, cache_dir=None, threads=None):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        directory = os.path.join(cache_dir or CACHE_DIR, model_name.replace('/', '__'))
+        with self._export_lock:
+            if not os.path.exists(os.path.join(directory, 'config.json')):
+                export_onnx(model_name, directory)
+            model_path = os.path.join(directory, 'model.onnx')
+            if quantize:
+                quantized_path = os.path.join(directory, 'model.int8.onnx')
+                if not os.path.exists(quantized_path):
+                    from onnxruntime.quantization import QuantType, quantize_dynamic
+                    quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+                model_path = quantized_path
+
+        with open(os.path.join(directory, 'config.json'), encoding='utf-8') as f:
+            self.config = json.load(f)
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self.tokenizer = AutoTokenizer.from_pretrained(directory)
+        self.backend = 'onnx-int8' if quantize else 'onnx'
+        super().__init__(model_name, self.config['dim'])
+
+    def _encode_batch(self, texts):
+        tokens = self.tokenizer(texts, padding=True, truncation=True,
+                                max_length=self.config['max_seq_length'], return_tensors='np')
+        feeds = {name: tokens[name].astype(np.int64) for name in self.config['input_names']}
+        hidden = self.session.run(None, feeds)[0]
+        mask = tokens['attention_mask'][..., None].astype(np.float32)
+
+        pooling = self.config['pooling']
+        if pooling == 'cls':
+            vectors = hidden[:, 0]
+        elif pooling == 'max':
+            vectors = np.where(mask > 0, hidden, -1e9).max(axis=1)
+        elif pooling == 'mean':
+            vectors = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        else:
+            raise ValueError(f"Pooling mode {pooling!r} is not supported by the ONNX backend")
+        return normalize(vectors) if self.config['normalize'] else vectors
+
+
+def load_encoder(model_name, backend='torch', **options):
+    """Builds the encoder for `model_name` on `backend` (one of BACKENDS)."""
+    if backend == 'torch':
+        return TorchEncoder(model_name, **options)
+    if backend == 'torch-int8':
+        return TorchEncoder(model_name, quantize=True, **options)
+    if backend == 'onnx':
+        return OnnxEncoder(model_name, **options)
+    if backend == 'onnx-int8':
+        return OnnxEncoder(model_name, quantize=True, **options)
+    if backend == 'hashing':
+        return HashingEncoder(model_name, **options)
+    raise ValueError(f"Unknown encoder backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+
+
+def cosine_agreement(reference, candidate, texts, batch_size=32):
+    """Per-text cosine similarity between two encoders' embeddings of the same texts."""
+    a = reference.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+    b = candidate.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+    return np.sum(a * b, axis=1)
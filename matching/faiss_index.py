@@ -0,0 +1,163 @@
+# matching/faiss_index.py
+# Id-mapped FAISS index that is maintained from a change feed instead of being rebuilt,
+# persisted as a versioned bundle so readers can pick up new versions while running.
+
+import hashlib
+import logging
+import os
+import time
+
+import numpy as np
+import faiss
+
+from .ann import build_index
+from .bundle import write_bundle
+
+logger = logging.getLogger(__name__)
+
+
+def faiss_id(internship_id):
+    """FAISS ids are int64: numeric internship ids are used as-is, anything else is hashed into 63 bits."""
+    internship_id = str(internship_id)
+    if internship_id.isdigit() and len(internship_id) < 19:
+        return int(internship_id)
+    return int(hashlib.sha1(internship_id.encode('utf-8')).hexdigest()[:15], 16)
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def diff_catalog(texts, hashes):
+    """
+    Change feed between the catalog {id: text} and what the index holds ({id: content hash}):
+    {'added': [...], 'updated': [...], 'removed': [...]}, the same shape as the scraper's delta file.
+    """
+    added, updated = [], []
+    for internship_id, text in texts.items():
+        known = hashes.get(internship_id)
+        if known is None:
+            added.append(internship_id)
+        elif known != content_hash(text):
+            updated.append(internship_id)
+    removed = [internship_id for internship_id in hashes if internship_id not in texts]
+    return {'added': added, 'updated': updated, 'removed': removed}
+
+
+class IncrementalIndex:
+    """
+    IndexIDMap2 over an inner-product index, keyed by internship id, plus the content hash of
+    every indexed text so an update only re-encodes what actually changed.
+    Vectors are expected L2-normalised (inner product == cosine similarity).
+    Persisted as a versioned bundle (see matching.bundle); the hashes travel in the row metadata.
+    """
+
+    def __init__(self, dim, model_name, index=None, hashes=None):
+        self.dim = dim
+        self.model_name = model_name
+        self.index = index if index is not None else faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        self.hashes = hashes or {}
+
+    @classmethod
+    def from_bundle(cls, bundle):
+        index = faiss.IndexIDMap2(faiss.IndexFlatIP(bundle.dim))
+        internship_ids = [str(internship_id) for internship_id in bundle.ids]
+        if internship_ids:
+            index.add_with_ids(np.ascontiguousarray(bundle.matrix, dtype=np.float32),
+                               np.array([faiss_id(i) for i in internship_ids], dtype=np.int64))
+        hashes = {internship_id: bundle.metadata(position)['content_hash']
+                  for position, internship_id in enumerate(internship_ids)}
+        return cls(bundle.dim, bundle.model_name, index, hashes)
+
+    @property
+    def ntotal(self):
+        return self.index.ntotal
+
+    def remove(self, internship_ids):
+        internship_ids = [i for i in internship_ids if i in self.hashes]
+        if internship_ids:
+            self.index.remove_ids(np.array([faiss_id(i) for i in internship_ids], dtype=np.int64))
+            for internship_id in internship_ids:
+                del self.hashes[internship_id]
+        return len(internship_ids)
+
+    def upsert(self, internship_ids, texts, vectors):
+        """Adds the vectors under their ids, replacing whatever those ids held before."""
+        self.remove(internship_ids)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.index.add_with_ids(vectors, np.array([faiss_id(i) for i in internship_ids], dtype=np.int64))
+        for internship_id, text in zip(internship_ids, texts):
+            self.hashes[internship_id] = content_hash(text)
+
+    def apply(self, changes, texts, encode):
+        """
+        Applies a change feed ({'added', 'updated', 'removed'} ids) given the current {id: text}.
+        `encode(list_of_texts)` is only called for ids whose text hash differs from the indexed one.
+        Returns the number of vectors encoded.
+        """
+        self.remove(changes.get('removed', []))
+        pending = [
+            internship_id for internship_id in dict.fromkeys(changes.get('added', []) + changes.get('updated', []))
+            if internship_id in texts and self.hashes.get(internship_id) != content_hash(texts[internship_id])
+        ]
+        if pending:
+            pending_texts = [texts[internship_id] for internship_id in pending]
+            self.upsert(pending, pending_texts, encode(pending_texts))
+        return len(pending)
+
+    def save(self, root, metadata, kind='flat', filters=None, precision='float32', **ann_options):
+        """
+        Writes the indexed vectors as a new bundle version under `root`; `metadata` maps id -> row dict
+        and `filters` maps a filter name to {id: [values]} (see Bundle.search_filtered).
+        `precision` adds a compact float16/int8 copy of the matrix for coarse scoring.
+        For any `kind` but 'flat', an ANN index (matching.ann.build_index options) is built over the
+        saved matrix and stored in the bundle; it is rebuilt on every save since IVF needs retraining anyway.
+        """
+        by_faiss_id = {faiss_id(internship_id): internship_id for internship_id in self.hashes}
+        internship_ids = [by_faiss_id[i] for i in faiss.vector_to_array(self.index.id_map)]
+        matrix = self.index.index.reconstruct_n(0, self.ntotal) if self.ntotal else np.empty((0, self.dim), np.float32)
+        rows = [dict(metadata.get(internship_id, {}), content_hash=self.hashes[internship_id])
+                for internship_id in internship_ids]
+        ann_index = build_index(matrix, kind, **ann_options) if kind != 'flat' and len(matrix) else None
+        row_filters = {name: [values.get(internship_id, []) for internship_id in internship_ids]
+                       for name, values in (filters or {}).items()}
+        return write_bundle(root, internship_ids, matrix, rows, self.model_name, ann_index=ann_index, filters=row_filters,
+                            precision=precision)
+
+    def search(self, query_vectors, k):
+        """Returns (scores, faiss ids); missing results have id -1."""
+        return self.index.search(np.ascontiguousarray(query_vectors, dtype=np.float32), k)
+
+
+class HotSwapIndex:
+    """
+    Serves whatever `load(path)` returns and loads it again as soon as the file at `path` is replaced,
+    without restarting the process: a FAISS index file by default, or a bundle's CURRENT pointer with
+    a bundle loader. The file is stat'ed at most every `check_interval` seconds;
+    searches already running keep the object they started with.
+    """
+
+    def __init__(self, path, check_interval=2.0, load=faiss.read_index):
+        self.path = path
+        self.check_interval = check_interval
+        self.load = load
+        self.index = None
+        self._file_key = None
+        self._checked_at = 0.0
+
+    def current(self):
+        now = time.monotonic()
+        if self.index is None or now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            stat = os.stat(self.path)
+            # os.replace gives the file a new inode, so this changes on every save.
+            file_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if file_key != self._file_key:
+                index = self.load(self.path)
+                if self.index is not None:
+                    logger.info("Reloaded %s (%d vectors).", self.path, index.ntotal)
+                self.index, self._file_key = index, file_key
+        return self.index
+
+    def search(self, query_vectors, k):
+        return self.current().search(np.ascontiguousarray(query_vectors, dtype=np.float32), k)
@@ -0,0 +1,158 @@
+# matching/lexical.py
+# TF-IDF retrieval over internship texts that stays sparse end to end: scoring a query is one sparse
+# matrix-vector product, and only the rows that share a term with it are ever ranked.
+# Weights match sklearn's TfidfVectorizer defaults (smooth idf, l2-normalised rows), but the index
+# keeps raw term counts so documents can be added later without refitting the existing ones.
+
+import json
+import os
+import tempfile
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+FORMAT_VERSION = 1
+
+
+class LexicalIndex:
+    """
+    Sparse (documents x terms) TF-IDF index.
+
+    Build it with LexicalIndex.fit(texts), grow it with add(texts), and query it with search() or
+    candidates(). Persist with save(path) / LexicalIndex.load(path).
+    """
+
+    def __init__(self, stop_words='english'):
+        self.stop_words = stop_words
+        self.analyzer = TfidfVectorizer(stop_words=stop_words, lowercase=True).build_analyzer()
+        self.vocabulary = {}
+        self.counts = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self.document_frequency = np.zeros(0, dtype=np.int64)
+        self._weights = None
+        self._idf = None
+
+    @classmethod
+    def fit(cls, texts, stop_words='english'):
+        index = cls(stop_words)
+        index.add(texts)
+        return index
+
+    def __len__(self):
+        return self.counts.shape[0]
+
+    def _count_rows(self, texts, grow):
+        """CSR term counts of `texts`; with `grow`, unseen terms are added to the vocabulary."""
+        indptr = [0]
+        indices = []
+        data = []
+        for text in texts:
+            row = {}
+            for term in self.analyzer(text or ''):
+                column = self.vocabulary.get(term)
+                if column is None:
+                    if not grow:
+                        continue
+                    column = self.vocabulary[term] = len(self.vocabulary)
+                row[column] = row.get(column, 0) + 1
+            indices.extend(row)
+            data.extend(row.values())
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(self.vocabulary)),
+        )
+
+    def add(self, texts):
+        """Appends documents and returns their row positions. Existing rows are not re-tokenised."""
+        start = len(self)
+        new_rows = self._count_rows(texts, grow=True)
+        terms = len(self.vocabulary)
+        # Widen the existing rows to the grown vocabulary; the CSR arrays are reused as they are.
+        old_rows = sparse.csr_matrix((self.counts.data, self.counts.indices, self.counts.indptr),
+                                     shape=(start, terms))
+        self.counts = sparse.vstack([old_rows, new_rows], format='csr')
+        frequency = np.bincount(new_rows.indices, minlength=terms)
+        frequency[:len(self.document_frequency)] += self.document_frequency
+        self.document_frequency = frequency
+        # Adding documents changes every idf, so the weighted matrix is rebuilt (lazily, in O(nnz)).
+        self._idf = None
+        self._weights = None
+        return np.arange(start, len(self))
+
+    @property
+    def idf(self):
+        if self._idf is None:
+            self._idf = (np.log((1 + len(self)) / (1 + self.document_frequency)) + 1).astype(np.float32)
+        return self._idf
+
+    @property
+    def weights(self):
+        """The l2-normalised TF-IDF matrix (sparse)."""
+        if self._weights is None:
+            idf = self.idf
+            self._weights = normalize(self.counts @ sparse.diags(idf, format='csr'), copy=False)
+        return self._weights
+
+    def transform(self, texts):
+        """TF-IDF rows for query texts; terms outside the vocabulary are ignored."""
+        return normalize(self._count_rows(texts, grow=False) @ sparse.diags(self.idf, format='csr'), copy=False)
+
+    def search(self, text, k=10, rows=None):
+        """
+        (positions, scores) of the k documents most similar to `text`, best first, optionally among
+        `rows` only. Documents sharing no term with the query score 0 and are never returned.
+        """
+        if not len(self) or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        matrix = self.weights
+        if rows is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+            matrix = matrix[rows]
+        hits = (matrix @ self.transform([text]).T).tocoo()
+        positions, scores = hits.row.astype(np.int64), hits.data.astype(np.float32)
+        keep = scores > 0
+        positions, scores = positions[keep], scores[keep]
+        if k < len(scores):
+            best = np.argpartition(-scores, k - 1)[:k]
+            positions, scores = positions[best], scores[best]
+        order = np.lexsort((positions, -scores))
+        positions, scores = positions[order], scores[order]
+        if rows is not None:
+            positions = rows[positions]
+        return positions, scores
+
+    def scores(self, text, rows=None):
+        """Dense cosine similarity of `text` with every document (or `rows`), e.g. for score fusion."""
+        matrix = self.weights if rows is None else self.weights[np.asarray(rows, dtype=np.int64)]
+        return (matrix @ self.transform([text]).T).toarray().ravel()
+
+    def candidates(self, text, k=200, rows=None):
+        """First-stage candidate generation: positions of the k best lexical matches, best first."""
+        return self.search(text, k, rows)[0]
+
+    def save(self, path):
+        """Writes the counts, document frequencies and vocabulary to one .npz file (atomically)."""
+        terms = np.empty(len(self.vocabulary), dtype=object)
+        for term, column in self.vocabulary.items():
+            terms[column] = term
+        meta = {'format': FORMAT_VERSION, 'stop_words': self.stop_words, 'shape': list(self.counts.shape)}
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.npz')
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, data=self.counts.data, indices=self.counts.indices, indptr=self.counts.indptr,
+                     document_frequency=self.document_frequency, terms=terms.astype(str), meta=json.dumps(meta))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as stored:
+            meta = json.loads(str(stored['meta']))
+            if meta.get('format') != FORMAT_VERSION:
+                raise ValueError(f"{path} has lexical index format {meta.get('format')}, expected {FORMAT_VERSION}")
+            index = cls(meta['stop_words'])
+            index.vocabulary = {str(term): column for column, term in enumerate(stored['terms'])}
+            index.counts = sparse.csr_matrix((stored['data'], stored['indices'], stored['indptr']), shape=tuple(meta['shape']))
+            index.document_frequency = stored['document_frequency']
+        return index
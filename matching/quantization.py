@@ -0,0 +1,53 @@
+# matching/quantization.py
+# Compact catalog embeddings: float16, or int8 with a per-dimension scale. Coarse scores come from
+# the compact copy; the best few hundred candidates are then rescored against the float32 vectors.
+
+import numpy as np
+
+PRECISIONS = ('float32', 'float16', 'int8')
+
+# Rows scored per block, so the float32 temporaries of a coarse int8 scan stay a few MB at any catalog size.
+BLOCK_ROWS = 65536
+
+
+def quantize(matrix, precision):
+    """Returns (compact matrix, per-dimension scale or None)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if precision == 'float32':
+        return matrix, None
+    if precision == 'float16':
+        return matrix.astype(np.float16), None
+    if precision == 'int8':
+        # Symmetric per-dimension scale: each column's largest magnitude maps to 127.
+        scale = np.abs(matrix).max(axis=0) / 127.0 if len(matrix) else np.ones(matrix.shape[1], np.float32)
+        scale = np.where(scale > 0, scale, 1.0).astype(np.float32)
+        return np.clip(np.rint(matrix / scale), -127, 127).astype(np.int8), scale
+    raise ValueError(f"Unknown precision {precision!r}; expected one of {', '.join(PRECISIONS)}")
+
+
+def coarse_scores(compact, scale, query_vectors, rows=None):
+    """
+    Approximate inner products between the queries and the compact rows (all, or just `rows`).
+    For int8 the scale is folded into the query: q . (x_int8 * scale) == (q * scale) . x_int8.
+
+    Each block is cast to float32 once per call and shared by every query in it. numpy has no float16
+    BLAS and converts float16 slowly, so a float16 scan costs about 10x a float32 one for a single
+    query (int8 about 2x): pass queries together to spread the cast, or prefer int8, which is smaller too.
+    """
+    query_vectors = np.atleast_2d(np.asarray(query_vectors, dtype=np.float32))
+    if scale is not None:
+        query_vectors = query_vectors * scale
+    count = len(compact) if rows is None else len(rows)
+    scores = np.empty((len(query_vectors), count), dtype=np.float32)
+    for start in range(0, count, BLOCK_ROWS):
+        block = compact[start:start + BLOCK_ROWS] if rows is None else compact[rows[start:start + BLOCK_ROWS]]
+        scores[:, start:start + len(block)] = query_vectors @ block.astype(np.float32, copy=False).T
+    return scores
+
+
+def rescore(exact_matrix, query_vector, candidates):
+    """Exact float32 scores for a single query's candidate rows (touches only those rows of an mmap)."""
+    order = np.argsort(candidates)  # ascending reads are kinder to a memory-mapped file
+    scores = np.empty(len(candidates), dtype=np.float32)
+    scores[order] = np.asarray(exact_matrix[candidates[order]], dtype=np.float32) @ np.asarray(query_vector, np.float32)
+    return scores
@@ -0,0 +1,205 @@
+# matching/recommend.py
+# The recommendation pipeline shared by the scripts and the batch CLI: load the catalog and the model
+# once, embed every internship once (through the on-disk embedding cache), then score any number of
+# student profiles with one matrix product per encode batch plus the hybrid keyword score. Profiles
+# bypass the embedding cache, so no student text is ever written to disk.
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .catalog_cache import CatalogRow, load_catalog_cache
+from .embedding_cache import uncached
+from .lexical import LexicalIndex
+from .scoring import SkillMatrix, hybrid_scores, top_k
+
+
+def create_internship_text(internship):
+    """Creates a more natural, descriptive sentence from internship data."""
+    title = internship.get('Title', 'an internship role')
+    skills = internship.get('Skills', 'various skills')
+    return f"Seeking an intern for a {title} position. The ideal candidate should have experience in skills such as {skills}."
+
+
+def create_student_text(skills):
+    return f"A student with key skills in: {skills}."
+
+
+def load_catalog(path):
+    """
+    Internship rows from a catalog CSV, as read-only dict-like rows of its columnar cache (see
+    matching/catalog_cache.py). An incremental scraper log (with Id/Status columns) is reduced to the
+    latest version of each listing that has not expired.
+    """
+    rows = load_catalog_cache(path).rows()
+    if rows and 'Status' in rows[0]:
+        latest = {row['Id']: row for row in rows}
+        rows = [row for row in latest.values() if row['Status'] != 'expired']
+    return rows
+
+
+def row_location(internship):
+    # SIH PRE's catalog calls the column "Locations"
+    return internship.get('Location', internship.get('Locations')) or ''
+
+
+def skill_matrix_for(internships):
+    """
+    SkillMatrix of the rows' Skills. Rows of one catalog cache (see load_catalog) are built from its
+    pre-split skills; any other rows are split here.
+    """
+    catalogs = {id(row.catalog): row.catalog for row in internships if isinstance(row, CatalogRow)}
+    if len(catalogs) == 1 and all(isinstance(row, CatalogRow) for row in internships):
+        catalog = next(iter(catalogs.values()))
+        if 'Skills' in catalog.columns:
+            return catalog.skill_matrix([row.position for row in internships])
+    return SkillMatrix(internship.get('Skills', '') for internship in internships)
+
+
+def profile_skills(profile):
+    """Skills as the comma-separated string the scorers expect (profiles may also send a list)."""
+    skills = profile.get('skills', '')
+    return ', '.join(skills) if isinstance(skills, (list, tuple)) else str(skills or '')
+
+
+def profile_location(profile):
+    location = profile.get('location_preference', profile.get('location'))
+    return location.strip().lower() if isinstance(location, str) and location.strip() else None
+
+
+class CatalogScorer:
+    """
+    Everything needed to rank a profile once its query vector is known: catalog embeddings, the skill
+    matrix and a location -> rows table. Holds neither the model nor the rows themselves, so it is
+    cheap to ship to worker processes, and workers only send back positions and scores.
+
+    With `first_stage`, only the `first_stage` best TF-IDF matches of the profile's skills in its
+    location are scored. Off by default: internships sharing no term with the skills (the paraphrase
+    matches the model is there for) never reach the semantic score.
+    """
+
+    def __init__(self, internships, embeddings, semantic_weight=0.6, first_stage=None):
+        self.embeddings = embeddings
+        self.semantic_weight = semantic_weight
+        self.skill_matrix = skill_matrix_for(internships)
+        self.first_stage = first_stage
+        self.lexical = LexicalIndex.fit(internship.get('Skills', '') for internship in internships) if first_stage else None
+        rows_by_location = {}
+        for position, internship in enumerate(internships):
+            rows_by_location.setdefault(row_location(internship).strip().lower(), []).append(position)
+        self.rows_by_location = {location: np.asarray(rows, dtype=np.int64) for location, rows in rows_by_location.items()}
+
+    def rank(self, profile, query_vector, top_n=5):
+        """(positions, scores, internships in the profile's location) for one profile, best first."""
+        location = profile_location(profile)
+        rows = None if location is None else self.rows_by_location.get(location, np.empty(0, dtype=np.int64))
+        if rows is not None and not len(rows):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32), 0
+        in_location = len(self.skill_matrix) if rows is None else len(rows)
+
+        if self.lexical is not None:
+            shortlist = self.lexical.candidates(profile_skills(profile), self.first_stage, rows=rows)
+            # A short list means few keyword matches: score the whole location instead, to keep recall.
+            if len(shortlist) >= self.first_stage:
+                rows = np.sort(shortlist)
+
+        embeddings = self.embeddings if rows is None else self.embeddings[rows]
+        semantic_scores = embeddings @ query_vector
+        keyword_scores = self.skill_matrix.jaccard(profile_skills(profile), rows=rows)
+        final_scores = hybrid_scores(semantic_scores, keyword_scores, self.semantic_weight)
+        best = top_k(final_scores, top_n)
+        positions = best if rows is None else rows[best]
+        return positions, final_scores[best], in_location
+
+    def rank_many(self, profiles, query_vectors, top_n=5):
+        return [self.rank(profile, vector, top_n) for profile, vector in zip(profiles, query_vectors)]
+
+
+_worker_scorer = None
+
+
+def _init_worker(scorer):
+    global _worker_scorer
+    _worker_scorer = scorer
+
+
+def _rank_chunk(args):
+    profiles, query_vectors, top_n = args
+    return _worker_scorer.rank_many(profiles, query_vectors, top_n)
+
+
+class Recommender:
+    """
+    Loads nothing itself: give it the catalog rows and an encoder (see matching/encoders.py).
+    The catalog is embedded once at construction; recommend() / recommend_many() only encode profiles,
+    with the encoder behind `model` when it is a CachedEncoder.
+    `first_stage` turns on CatalogScorer's TF-IDF shortlist.
+    """
+
+    def __init__(self, internships, model, semantic_weight=0.6, batch_size=256, first_stage=None):
+        self.internships = internships
+        self.model = model
+        self.query_model = uncached(model)
+        self.batch_size = batch_size
+        embeddings = model.encode([create_internship_text(internship) for internship in internships],
+                                  batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+        self.scorer = CatalogScorer(internships, np.asarray(embeddings, dtype=np.float32), semantic_weight, first_stage)
+
+    def __len__(self):
+        return len(self.internships)
+
+    def encode_profiles(self, profiles):
+        texts = [create_student_text(profile_skills(profile)) for profile in profiles]
+        return np.asarray(self.query_model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True,
+                                                  normalize_embeddings=True), dtype=np.float32)
+
+    def _recommendations(self, positions, scores):
+        return [{'final_score': float(score), 'internship': self.internships[position]}
+                for position, score in zip(positions, scores)]
+
+    def recommend(self, profile, top_n=5):
+        """(recommendations, internships in the profile's location) for a single profile."""
+        positions, scores, in_location = self.scorer.rank(profile, self.encode_profiles([profile])[0], top_n)
+        return self._recommendations(positions, scores), in_location
+
+    def recommend_many(self, profiles, top_n=5, workers=1):
+        """
+        Yields (profile, recommendations, internships in location) in input order. Profiles are encoded
+        batch_size at a time in this process (one model, loaded once); with workers > 1 the scoring
+        of each batch is spread over a process pool that received the catalog once at start-up.
+        """
+        pool = None
+        if workers > 1:
+            context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn')
+            pool = ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=(self.scorer,))
+        try:
+            for batch in _batches(profiles, self.batch_size):
+                vectors = self.encode_profiles(batch)
+                if pool is None:
+                    ranked = self.scorer.rank_many(batch, vectors, top_n)
+                else:
+                    step = -(-len(batch) // workers)
+                    chunks = [(batch[i:i + step], vectors[i:i + step], top_n) for i in range(0, len(batch), step)]
+                    ranked = [result for chunk in pool.map(_rank_chunk, chunks) for result in chunk]
+                for profile, (positions, scores, in_location) in zip(batch, ranked):
+                    yield profile, self._recommendations(positions, scores), in_location
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def default_workers():
+    return max(1, (os.cpu_count() or 1) - 1)
@@ -0,0 +1,89 @@
+# matching/scoring.py
+# Vectorised hybrid (semantic + keyword) scoring shared by the SIH recommendation scripts.
+
+import numpy as np
+from scipy import sparse
+
+
+def split_skills(skills):
+    """Splits a comma-separated skill string the way the scripts' original keyword score did (see benchmarks/bench_hybrid_scoring.py)."""
+    return set(skill.strip().lower() for skill in (skills or '').split(','))
+
+
+class SkillMatrix:
+    """
+    Sparse (internships x skills) incidence matrix built once from the catalog's skill strings.
+    Jaccard similarity against every internship is then a single sparse matrix-vector product
+    instead of re-splitting and lower-casing both skill strings per internship.
+    """
+
+    def __init__(self, skill_strings):
+        vocabulary = {}
+        indptr = [0]
+        indices = []
+        for skills in skill_strings:
+            for skill in split_skills(skills):
+                indices.append(vocabulary.setdefault(skill, len(vocabulary)))
+            indptr.append(len(indices))
+        self._build(vocabulary, indptr, indices)
+
+    @classmethod
+    def from_split(cls, vocabulary, indptr, indices, rows=None):
+        """
+        Builds the matrix from skills already split by split_skills (as the catalog cache stores them):
+        row i's skills are `vocabulary[indices[indptr[i]:indptr[i + 1]]]`. `rows` keeps only those rows.
+        """
+        matrix = cls.__new__(cls)
+        matrix._build({skill: code for code, skill in enumerate(vocabulary)}, indptr, indices, rows)
+        return matrix
+
+    def _build(self, vocabulary, indptr, indices, rows=None):
+        self.vocabulary = vocabulary
+        data = np.ones(len(indices), dtype=np.float32)
+        self.matrix = sparse.csr_matrix(
+            (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(vocabulary)),
+        )
+        if rows is not None:
+            self.matrix = self.matrix[np.asarray(rows, dtype=np.int64)]
+        self.row_sizes = np.diff(self.matrix.indptr).astype(np.float32)
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def jaccard(self, student_skills, rows=None):
+        """Jaccard similarity between the student's skills and every internship (or just `rows`)."""
+        student_set = split_skills(student_skills)
+        known = [self.vocabulary[skill] for skill in student_set if skill in self.vocabulary]
+        matrix, row_sizes = self.matrix, self.row_sizes
+        if rows is not None:
+            matrix, row_sizes = matrix[rows], row_sizes[rows]
+
+        student_vector = np.zeros(matrix.shape[1], dtype=np.float32)
+        student_vector[known] = 1.0
+        intersection = matrix @ student_vector
+        union = row_sizes + len(student_set) - intersection
+        return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def hybrid_scores(semantic_scores, keyword_scores, semantic_weight=0.6):
+    """Fuses semantic and keyword scores for all candidates at once."""
+    semantic_scores = np.asarray(semantic_scores, dtype=np.float32)
+    return semantic_weight * semantic_scores + (1.0 - semantic_weight) * np.asarray(keyword_scores, dtype=np.float32)
+
+
+def top_k(scores, k=None):
+    """Indices of the k highest scores, best first (ties keep catalog order). k=None ranks everything."""
+    scores = np.asarray(scores)
+    if k is not None and k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k is None or k >= scores.size:
+        candidates = np.arange(scores.size)
+    else:
+        # argpartition picks an arbitrary subset of the rows tied at the k-th score, so take every row
+        # above it and then the earliest of the tied rows.
+        threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > threshold)
+        candidates = np.concatenate([above, np.flatnonzero(scores == threshold)[:k - len(above)]])
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order]
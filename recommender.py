@@ -1,26 +1,42 @@
+import os
 import pandas as pd
-from sentence_transformers import SentenceTransformer
+from matching.catalog_cache import load_catalog_cache
+from matching.embedding_cache import CachedEncoder, uncached
+from matching.encoders import load_encoder
+from matching.lexical import LexicalIndex
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
 # --- All functions now use the new model ---
 
+def load_internships(data_path='internships.csv'):
+    # Columnar cache of the CSV (categorical Location/Company), rebuilt whenever the CSV changes
+    df = load_catalog_cache(data_path).to_frame()
+    if 'Status' in df.columns:
+        # Incremental scraper log: keep the latest version of each listing that has not expired
+        df = df.drop_duplicates('Id', keep='last')
+        df = df[df['Status'] != 'expired'].reset_index(drop=True)
+    df['Skills'] = df['Skills'].fillna('')
+    return df
+
 def create_advanced_model(data_path='internships.csv'):
     """
     Loads data and creates recommendation components using a pre-trained model.
     """
-    df = pd.read_csv(data_path)
-    df['Skills'] = df['Skills'].fillna('')
+    df = load_internships(data_path)
     
     # 1. Load a powerful pre-trained model
     # This model is great for understanding short text like skills.
     # The first time you run this, it will download the model (a few hundred MB).
-    model = SentenceTransformer('all-MiniLM-L6-v2')
+    # ENCODER_BACKEND=onnx / onnx-int8 runs the same model faster on CPU (see matching/encoders.py).
+    # Embeddings are cached on disk (matching/embedding_cache.py): a restart only encodes new skill strings.
+    model = CachedEncoder(load_encoder('all-MiniLM-L6-v2', os.environ.get('ENCODER_BACKEND', 'torch')))
     
     # 2. Convert all internship skills into numerical vectors (embeddings)
     # This might take a moment the first time.
     print("Creating skill embeddings... (This may take a moment)")
     skill_embeddings = model.encode(df['Skills'].tolist(), show_progress_bar=True)
+    print(f"Embedding cache: {model.cache.hits} cached, {model.cache.misses} newly encoded.")
     
     print("Advanced recommendation model created successfully.")
     return df, model, skill_embeddings
@@ -29,8 +45,8 @@ def get_advanced_recommendations(user_skills, df, model, skill_embeddings, top_n
     """
     Recommends internships by comparing semantic meaning.
     """
-    # Convert the user's query into a vector
-    user_embedding = model.encode([user_skills])
+    # Convert the user's query into a vector (queries are not written to the embedding cache)
+    user_embedding = uncached(model).encode([user_skills])
     
     # Calculate cosine similarity between user's skills and all internships
     cosine_similarities = cosine_similarity(user_embedding, skill_embeddings).flatten()
@@ -41,10 +57,35 @@ def get_advanced_recommendations(user_skills, df, model, skill_embeddings, top_n
     recommendations_df = df.iloc[top_indices]
     return recommendations_df
 
+def create_lexical_model(data_path='internships.csv'):
+    """
+    Model-free fallback: a sparse TF-IDF index over the internship skills (no download, no GPU).
+    """
+    df = load_internships(data_path)
+    lexical = LexicalIndex.fit(df['Skills'].tolist())
+    print(f"TF-IDF keyword model created ({len(lexical.vocabulary)} terms).")
+    return df, lexical
+
+def get_lexical_recommendations(user_skills, df, lexical, top_n=5):
+    """
+    Recommends internships by TF-IDF keyword similarity; only internships sharing a term are returned.
+    """
+    top_indices, _ = lexical.search(user_skills, top_n)
+    return df.iloc[top_indices]
+
 # --- Main execution block ---
 if __name__ == '__main__':
     # Create the model ONCE at the start
-    internship_df, model, skill_embeddings = create_advanced_model('internships.csv')
+    try:
+        internship_df, model, skill_embeddings = create_advanced_model('internships.csv')
+        recommend = lambda skills: get_advanced_recommendations(skills, internship_df, model, skill_embeddings)
+    except (OSError, ImportError) as e:
+        # e.g. offline with no cached model: keyword matching still gives useful results
+        if not os.path.exists('internships.csv'):
+            raise
+        print(f"Could not load the embedding model ({e}); falling back to TF-IDF keyword matching.")
+        internship_df, lexical = create_lexical_model('internships.csv')
+        recommend = lambda skills: get_lexical_recommendations(skills, internship_df, lexical)
     
     if internship_df is not None:
         # Loop to allow multiple queries
@@ -55,7 +96,7 @@ if __name__ == '__main__':
                 break
             
             # Get recommendations using the new advanced function
-            recommendations = get_advanced_recommendations(my_skills_input, internship_df, model, skill_embeddings)
+            recommendations = recommend(my_skills_input)
             
             print(f"\nTOP 5 RECOMMENDATIONS FOR: '{my_skills_input}'")
             print("="*50)
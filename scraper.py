@@ -1,77 +1,117 @@
+import argparse
 import requests
-from bs4 import BeautifulSoup
 import csv
 import time # Import the time module for delays
 
-def scrape_all_internshala_pages():
+from scraping.crawler import DEFAULT_BASE_URL, HEADERS, page_url
+from scraping.parsing import CSV_HEADER, DEFAULT_BACKEND, EXTRACTORS, extract_internships
+
+def scrape_all_internshala_pages(base_url=DEFAULT_BASE_URL, output='internships.csv', max_pages=100, backend=None):
     """
     Scrapes all pages of internship data from Internshala and saves it to a single CSV file.
     """
     # Open the CSV file once, before the loop starts
-    with open('internships.csv', 'w', newline='', encoding='utf-8') as file:
+    with open(output, 'w', newline='', encoding='utf-8') as file:
         writer = csv.writer(file)
         # Write the header row only once
-        writer.writerow(['Title', 'Company', 'Location', 'Stipend', 'Skills'])
+        writer.writerow(CSV_HEADER)
 
         # Loop through a large range of pages. The loop will break when a page has no internships.
-        for page_number in range(1, 101): # Assuming there are no more than 100 pages
-            URL = f"https://internshala.com/internships/page-{page_number}"
-            
+        for page_number in range(1, max_pages + 1): # Assuming there are no more than 100 pages
+            URL = page_url(base_url, page_number)
+
             print(f"Scraping page {page_number}...")
 
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36'
-            }
-            
             try:
-                response = requests.get(URL, headers=headers)
+                response = requests.get(URL, headers=HEADERS)
                 response.raise_for_status()
             except requests.exceptions.RequestException as e:
                 print(f"Error on page {page_number}: {e}")
                 break # Stop if a page request fails
 
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            internship_container = soup.find('div', id='internship_list_container')
-            if not internship_container:
+            internships = extract_internships(response.content, backend=backend)
+            if internships is None:
                 print(f"Could not find internship container on page {page_number}. Stopping.")
                 break
-                
-            internships = internship_container.find_all('div', class_='internship_meta')
 
             # This is the crucial stopping condition
             if not internships:
                 print(f"No more internships found on page {page_number}. Scraping finished.")
                 break
 
-            # Process all internships found on the current page
-            for internship in internships:
-                title_element = internship.select_one('h3')
-                title = title_element.get_text(strip=True) if title_element else 'N/A'
-
-                company_element = internship.find('div', class_='company_name')
-                company = company_element.get_text(strip=True) if company_element else 'N/A'
-
-                location_element = internship.find('div', class_='row-1-item locations')
-                location = location_element.get_text(strip=True) if location_element else 'Work from Home'
-
-                stipend_element = internship.find('a', class_='stipend')
-                stipend = stipend_element.get_text(strip=True) if stipend_element else 'No Stipend'
-                
-                skills_container = internship.find('div', class_='job_skills')
-                if skills_container:
-                    skill_elements = skills_container.find_all('div', class_='skill_container')
-                    skills = ', '.join([skill.get_text(strip=True) for skill in skill_elements])
-                else:
-                    skills = 'N/A'
-                
-                # Write the data for the current internship to the CSV
-                writer.writerow([title, company, location, stipend, skills])
-        
+            # Write the data for the current page's internships to the CSV
+            writer.writerows(internships)
+
             # Be a polite scraper and wait for a second before the next page
             time.sleep(1)
 
-    print(f"✅ All pages scraped successfully! Data saved to internships.csv")
+    print(f"✅ All pages scraped successfully! Data saved to {output}")
+
+def scrape_all_internshala_pages_async(base_url=DEFAULT_BASE_URL, output='internships.csv', max_pages=100,
+                                       concurrency=8, rate=2.0, max_retries=4, parse_workers=0, backend=None):
+    """
+    Same output as scrape_all_internshala_pages, but fetches pages concurrently over pooled
+    keep-alive connections, rate limited per host, retrying 429/5xx with jittered backoff.
+    A page that still fails is skipped instead of ending the whole crawl.
+    """
+    import asyncio
+    import functools
+    from scraping.crawler import Crawler
+
+    crawler = Crawler(base_url, concurrency=concurrency, rate=rate, burst=concurrency,
+                      max_retries=max_retries, parse_workers=parse_workers)
+    pages = asyncio.run(crawler.crawl(max_pages=max_pages, parse=functools.partial(extract_internships, backend=backend)))
+
+    failed = [page for page, rows in pages.items() if rows is None]
+    with open(output, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADER)
+        for rows in pages.values():
+            if rows:
+                writer.writerows(rows)
+
+    if failed:
+        print(f"⚠️ Could not fetch pages {failed}; their internships are missing from {output}")
+    print(f"✅ Scraped {len(pages) - len(failed)} pages. Data saved to {output}")
 
 if __name__ == '__main__':
-    scrape_all_internshala_pages()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape Internshala listings into a CSV file.")
+    parser.add_argument('--async', dest='use_async', action='store_true', help="Fetch pages concurrently.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only fetch until known listings, append new/changed rows and write a delta file.")
+    parser.add_argument('--full', action='store_true', help="With --incremental: crawl every page so vanished listings expire.")
+    parser.add_argument('--delta-output', help="Delta file (--incremental only; default: next to --output).")
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help="Site to crawl (e.g. a local fixture server).")
+    parser.add_argument('--output', default='internships.csv')
+    parser.add_argument('--max-pages', type=int, default=100)
+    # Crawler options. --incremental crawls through the same Crawler, one page at a time unless --async.
+    parser.add_argument('--concurrency', type=int, help="Pages in flight at once (--async; default 8).")
+    parser.add_argument('--rate', type=float, help="Requests per second per host (default 2, or 1 for a sequential --incremental).")
+    parser.add_argument('--max-retries', type=int, default=4, help="Retries on 429/5xx.")
+    parser.add_argument('--parse-workers', type=int, default=0, help="Parse pages in N worker processes.")
+    parser.add_argument('--parser', dest='backend', choices=sorted(EXTRACTORS), default=None,
+                        help=f"HTML extraction backend (default: {DEFAULT_BACKEND}).")
+    args = parser.parse_args()
+
+    crawler_options = ['concurrency', 'rate', 'max_retries', 'parse_workers']
+    given = [f"--{name.replace('_', '-')}" for name in crawler_options if getattr(args, name) != parser.get_default(name)]
+    if given and not (args.use_async or args.incremental):
+        parser.error(f"{', '.join(given)} can only be used with --async or --incremental")
+    if args.concurrency is not None and not args.use_async:
+        parser.error("--concurrency needs --async")
+    if (args.full or args.delta_output) and not args.incremental:
+        parser.error("--full and --delta-output can only be used with --incremental")
+    concurrency = args.concurrency or (8 if args.use_async else 1)
+    rate = args.rate or (2.0 if args.use_async else 1.0)
+
+    if args.incremental:
+        from scraping.incremental import scrape_incremental
+        scrape_incremental(args.base_url, args.output, args.delta_output, args.max_pages, full=args.full,
+                           concurrency=concurrency, rate=rate, max_retries=args.max_retries,
+                           parse_workers=args.parse_workers, backend=args.backend)
+    elif args.use_async:
+        scrape_all_internshala_pages_async(args.base_url, args.output, args.max_pages,
+                                           concurrency, rate, args.max_retries,
+                                           args.parse_workers, args.backend)
+    else:
+        scrape_all_internshala_pages(args.base_url, args.output, args.max_pages, args.backend)
@@ -0,0 +1,169 @@
+# scraping/crawler.py
+# Concurrent Internshala crawler: one pooled aiohttp session, bounded concurrency,
+# a token-bucket rate limit per host and jittered retries on 429/5xx.
+
+import asyncio
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .parsing import extract_internships
+
+DEFAULT_BASE_URL = 'https://internshala.com'
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36'
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def page_url(base_url, page_number):
+    return f"{base_url.rstrip('/')}/internships/page-{page_number}"
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, with bursts of up to `burst` requests."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class Crawler:
+    """Fetches listing pages concurrently and stops scheduling new pages once the listings run out."""
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, concurrency=8, rate=2.0, burst=4,
+                 max_retries=4, backoff=1.0, max_backoff=30.0, timeout=30.0, parse_workers=0):
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.parse_workers = parse_workers
+        self.end_reached = False
+        self._buckets = {}
+
+    def _bucket(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    def _delay(self, attempt, retry_after=None):
+        if retry_after is not None:
+            try:
+                return min(self.max_backoff, float(retry_after))
+            except ValueError:
+                pass
+        # Exponential backoff with "full jitter", so retrying workers do not stampede together.
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    async def fetch(self, session, url):
+        """
+        Returns the page body, or None once the retries are used up. A page that does not exist (404)
+        comes back as an empty body, the same as a page without listings: the crawl is past the end.
+        """
+        for attempt in range(self.max_retries + 1):
+            await self._bucket(url).acquire()
+            retry_after = None
+            try:
+                async with session.get(url) as response:
+                    if response.status == 404:
+                        return b''
+                    if response.status not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        return await response.read()
+                    retry_after = response.headers.get('Retry-After')
+                    problem = f"HTTP {response.status}"
+            except aiohttp.ClientResponseError as e:
+                print(f"Error on {url}: {e}")
+                return None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                problem = repr(e)
+
+            if attempt < self.max_retries:
+                delay = self._delay(attempt, retry_after)
+                print(f"{problem} on {url}, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(delay)
+        print(f"Giving up on {url} after {self.max_retries + 1} attempts")
+        return None
+
+    async def crawl(self, max_pages=100, parse=extract_internships, stop_after=None):
+        """
+        Crawls pages 1..max_pages and returns {page_number: rows}. Pages that failed map to None.
+        As soon as a page comes back without listings, pages after it are no longer scheduled
+        and any already fetched ones are dropped, matching the sequential scraper's stop condition;
+        `end_reached` then tells the caller the crawl saw the last listing page.
+        `stop_after(rows)` can end the crawl earlier: when it returns True, that page is the last one kept.
+        With `parse_workers`, pages are parsed in a process pool so parsing never stalls the event loop.
+        `parse` must then be picklable (a module-level function or a functools.partial of one).
+        """
+        results = {}
+        state = {'next_page': 1, 'last_page': max_pages}
+        self.end_reached = False
+        loop = asyncio.get_running_loop()
+        executor = ProcessPoolExecutor(self.parse_workers) if self.parse_workers else None
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.concurrency, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, headers=HEADERS, timeout=timeout) as session:
+
+            async def worker():
+                while state['next_page'] <= state['last_page']:
+                    page_number = state['next_page']
+                    state['next_page'] += 1
+
+                    print(f"Scraping page {page_number}...")
+                    body = await self.fetch(session, page_url(self.base_url, page_number))
+                    if page_number > state['last_page']:
+                        # Already in flight when an earlier page turned out to be the end.
+                        continue
+                    if body is None:
+                        results[page_number] = None
+                        continue
+                    if not body:
+                        rows = []
+                    elif executor is not None:
+                        rows = await loop.run_in_executor(executor, parse, body)
+                    else:
+                        rows = parse(body)
+                    if not rows:
+                        if page_number <= state['last_page']:
+                            print(f"No more internships found on page {page_number}. Scraping finished.")
+                        state['last_page'] = min(state['last_page'], page_number - 1)
+                        state['end'] = min(state.get('end', page_number), page_number)
+                        continue
+                    results[page_number] = rows
+                    if stop_after is not None and stop_after(rows):
+                        state['last_page'] = min(state['last_page'], page_number)
+
+            try:
+                await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+
+        # The last page kept is the one right before the first empty page, not an earlier stop.
+        self.end_reached = state.get('end') == state['last_page'] + 1
+        return {page: rows for page, rows in sorted(results.items()) if page <= state['last_page']}
@@ -0,0 +1,59 @@
+# scraping/fixture_server.py
+# A local stand-in for internshala.com that serves the saved listing pages in scraping/fixtures,
+# so the crawler can be exercised without touching the real site.
+# Pages that have no fixture are 404s, like requesting past the last page.
+# Usage: python -m scraping.fixture_server [--port 8080]
+#        python scraper.py --async --base-url http://127.0.0.1:8080
+
+import argparse
+import os
+import time
+
+from aiohttp import web
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+REQUESTS = web.AppKey('requests', list)
+FAULTS = web.AppKey('faults', dict)
+
+
+def make_app(fixture_dir=FIXTURE_DIR, faults=None):
+    """
+    The stand-in site as an aiohttp application.
+
+    `faults` maps a page number to the responses served for it before the fixture itself, as
+    (status, headers) pairs, e.g. {2: [(503, {}), (429, {'Retry-After': '1'})]}.
+    Every request is recorded in app[REQUESTS] as (page number, monotonic time).
+    """
+    app = web.Application()
+    app[REQUESTS] = []
+    app[FAULTS] = {page: list(responses) for page, responses in (faults or {}).items()}
+
+    async def listing_page(request):
+        page_number = int(request.match_info['page'])
+        request.app[REQUESTS].append((page_number, time.monotonic()))
+        pending = request.app[FAULTS].get(page_number)
+        if pending:
+            status, headers = pending.pop(0)
+            return web.Response(status=status, headers=headers)
+        path = os.path.join(fixture_dir, 'internships', f'page-{page_number}')
+        if not os.path.isfile(path):
+            raise web.HTTPNotFound()
+        with open(path, 'rb') as f:
+            return web.Response(body=f.read(), content_type='text/html')
+
+    app.router.add_get(r'/internships/page-{page:\d+}', listing_page)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the saved Internshala listing pages locally.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--fixtures', default=FIXTURE_DIR)
+    args = parser.parse_args()
+    web.run_app(make_app(args.fixtures), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# scraping/incremental.py
+# Incremental scraping: fingerprint every listing, stop paging once we are back among listings
+# we already have, append only what is new or changed, and write a delta for downstream builders.
+
+import asyncio
+import csv
+import functools
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+from .crawler import DEFAULT_BASE_URL, Crawler
+from .parsing import CSV_HEADER, extract_internships
+
+# The incremental CSV is an append-only log: one row per version of a listing.
+LOG_HEADER = CSV_HEADER + ['Id', 'Fingerprint', 'Status', 'Seen']
+
+ACTIVE = 'active'
+EXPIRED = 'expired'
+
+
+def listing_fingerprint(row):
+    """Content hash of title/company/location/stipend/skills; changes whenever the listing does."""
+    return hashlib.sha1('\x1f'.join(row[:5]).encode('utf-8')).hexdigest()
+
+
+def listing_id(row):
+    """
+    Internshala's own listing id when the page has one, else a hash of title/company/location/stipend/skills.
+    Title + company alone is not enough: one company posts the same role in several cities.
+    """
+    if len(row) > 5 and row[5]:
+        return str(row[5])
+    return 'h' + hashlib.sha1('\x1f'.join(row[:5]).encode('utf-8')).hexdigest()[:16]
+
+
+def read_listings(path):
+    """Latest version of every listing in an incremental CSV, keyed by Id (expired ones included)."""
+    listings = {}
+    if not os.path.exists(path):
+        return listings
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        if 'Id' not in (reader.fieldnames or []):
+            return listings
+        for row in reader:
+            listings[row['Id']] = row
+    return listings
+
+
+def current_listings(path):
+    """The listings that are still live, one row per Id, in first-seen order."""
+    return [row for row in read_listings(path).values() if row['Status'] != EXPIRED]
+
+
+def read_delta(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def delta_path_for(output):
+    """Default delta file next to the CSV: internships.csv -> internships.delta.json."""
+    return os.path.splitext(output)[0] + '.delta.json'
+
+
+def scrape_incremental(base_url=DEFAULT_BASE_URL, output='internships.csv', delta_output=None, max_pages=100,
+                       full=False, concurrency=1, rate=1.0, max_retries=4, parse_workers=0, backend=None):
+    """
+    Pages through the listings (newest first) until a whole page holds nothing new or changed,
+    then appends the new/changed rows to `output` and writes {added, updated, removed} ids to `delta_output`
+    (by default next to `output`, see delta_path_for).
+    Listings are only marked expired after a crawl that reached the last page (or with `full=True`),
+    because an early stop says nothing about the listings further down.
+    Pages are fetched by scraping.crawler.Crawler (`concurrency` pages in flight, `rate` requests per
+    second, retries on 429/5xx) and parsed with the `backend` extractor.
+    """
+    delta_output = delta_output or delta_path_for(output)
+    known = read_listings(output)
+    if os.path.exists(output) and not known:
+        # A plain CSV from the full scraper: start a fresh log next to nothing we could diff against.
+        print(f"{output} has no Id column yet; rebuilding it as an incremental log.")
+        os.replace(output, output + '.bak')
+
+    def is_fresh(row):
+        previous = known.get(listing_id(row))
+        return previous is None or previous['Status'] == EXPIRED or previous['Fingerprint'] != listing_fingerprint(row)
+
+    def holds_nothing_fresh(rows):
+        return not any(is_fresh(row) for row in rows)
+
+    crawler = Crawler(base_url, concurrency=concurrency, rate=rate, burst=concurrency,
+                      max_retries=max_retries, parse_workers=parse_workers)
+    pages = asyncio.run(crawler.crawl(
+        max_pages=max_pages,
+        parse=functools.partial(extract_internships, with_ids=True, backend=backend),
+        stop_after=holds_nothing_fresh if known and not full else None,
+    ))
+    failed = [page for page, rows in pages.items() if rows is None]
+    if failed:
+        print(f"Could not fetch pages {failed}; listings on them are neither updated nor expired.")
+    # Expiring needs every live listing to have been seen: the last page was reached and none failed.
+    reached_end = crawler.end_reached and not failed
+
+    seen_now = set()
+    changes = []  # (row, id, fingerprint, kind)
+    for rows in pages.values():
+        for row in rows or []:
+            internship_id = listing_id(row)
+            if internship_id in seen_now:
+                continue
+            seen_now.add(internship_id)
+            fingerprint = listing_fingerprint(row)
+            previous = known.get(internship_id)
+            if previous is None or previous['Status'] == EXPIRED:
+                changes.append((row, internship_id, fingerprint, 'added'))
+            elif previous['Fingerprint'] != fingerprint:
+                changes.append((row, internship_id, fingerprint, 'updated'))
+
+    removed = []
+    if reached_end:
+        removed = [internship_id for internship_id, row in known.items()
+                   if row['Status'] != EXPIRED and internship_id not in seen_now]
+
+    seen_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    write_header = not os.path.exists(output)
+    with open(output, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(LOG_HEADER)
+        for row, internship_id, fingerprint, _ in changes:
+            writer.writerow(row[:5] + [internship_id, fingerprint, ACTIVE, seen_at])
+        for internship_id in removed:
+            old = known[internship_id]
+            writer.writerow([old[column] for column in CSV_HEADER] + [internship_id, old['Fingerprint'], EXPIRED, seen_at])
+
+    delta = {
+        'generated_at': seen_at,
+        'source': output,
+        'added': [internship_id for _, internship_id, _, kind in changes if kind == 'added'],
+        'updated': [internship_id for _, internship_id, _, kind in changes if kind == 'updated'],
+        'removed': removed,
+    }
+    with open(delta_output, 'w', encoding='utf-8') as f:
+        json.dump(delta, f, indent=2)
+
+    print(f"✅ {len(delta['added'])} added, {len(delta['updated'])} updated, {len(removed)} expired. "
+          f"Delta saved to {delta_output}")
+    return delta
@@ -0,0 +1,133 @@
+# scraping/parsing.py
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+except ImportError:  # lxml is optional; the BeautifulSoup backends work without it
+    lxml = None
+
+CSV_HEADER = ['Title', 'Company', 'Location', 'Stipend', 'Skills']
+
+CONTAINER_ID = 'internship_list_container'
+
+
+def _extract_soup(internship_container, with_ids):
+    rows = []
+    for internship in internship_container.find_all('div', class_='internship_meta'):
+        title_element = internship.select_one('h3')
+        title = title_element.get_text(strip=True) if title_element else 'N/A'
+
+        company_element = internship.find('div', class_='company_name')
+        company = company_element.get_text(strip=True) if company_element else 'N/A'
+
+        location_element = internship.find('div', class_='row-1-item locations')
+        location = location_element.get_text(strip=True) if location_element else 'Work from Home'
+
+        stipend_element = internship.find('a', class_='stipend')
+        stipend = stipend_element.get_text(strip=True) if stipend_element else 'No Stipend'
+
+        skills_container = internship.find('div', class_='job_skills')
+        if skills_container:
+            skill_elements = skills_container.find_all('div', class_='skill_container')
+            skills = ', '.join([skill.get_text(strip=True) for skill in skill_elements])
+        else:
+            skills = 'N/A'
+
+        row = [title, company, location, stipend, skills]
+        if with_ids:
+            card = internship.find_parent(attrs={'internshipid': True})
+            row.append(card['internshipid'] if card else None)
+        rows.append(row)
+    return rows
+
+
+def extract_with_html_parser(html, with_ids=False):
+    """The original extractor: parse the whole page with Python's html.parser."""
+    soup = BeautifulSoup(html, 'html.parser')
+    internship_container = soup.find('div', id=CONTAINER_ID)
+    if not internship_container:
+        return None
+    return _extract_soup(internship_container, with_ids)
+
+
+def extract_with_subtree(html, with_ids=False):
+    """Same extractor, but html.parser only builds the listing container's subtree (no header/footer/scripts)."""
+    soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('div', id=CONTAINER_ID))
+    internship_container = soup.find('div', id=CONTAINER_ID)
+    if not internship_container:
+        return None
+    return _extract_soup(internship_container, with_ids)
+
+
+# XPath equivalents of BeautifulSoup's class_ matching: one class among several, or the exact class string.
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_CARDS = f".//div[{_has_class('internship_meta')}]"
+_TITLE = ".//h3"
+_COMPANY = f".//div[{_has_class('company_name')}]"
+_LOCATION = ".//div[normalize-space(@class)='row-1-item locations']"
+_STIPEND = f".//a[{_has_class('stipend')}]"
+_SKILLS = f".//div[{_has_class('job_skills')}]"
+_SKILL = f".//div[{_has_class('skill_container')}]"
+
+
+def _text(element):
+    # BeautifulSoup's get_text(strip=True): every text node stripped, empty ones dropped, joined with ''
+    return ''.join(text.strip() for text in element.xpath('.//text()'))
+
+
+def _first(element, path):
+    found = element.xpath(path)
+    return found[0] if found else None
+
+
+def extract_with_lxml(html, with_ids=False):
+    """C-speed extractor using lxml's HTML parser and XPath; produces the same rows as the BeautifulSoup one."""
+    document = lxml.html.fromstring(html)
+    internship_container = _first(document, f"//div[@id='{CONTAINER_ID}']")
+    if internship_container is None:
+        return None
+
+    rows = []
+    for internship in internship_container.xpath(_CARDS):
+        title_element = _first(internship, _TITLE)
+        company_element = _first(internship, _COMPANY)
+        location_element = _first(internship, _LOCATION)
+        stipend_element = _first(internship, _STIPEND)
+        skills_container = _first(internship, _SKILLS)
+
+        row = [
+            _text(title_element) if title_element is not None else 'N/A',
+            _text(company_element) if company_element is not None else 'N/A',
+            _text(location_element) if location_element is not None else 'Work from Home',
+            _text(stipend_element) if stipend_element is not None else 'No Stipend',
+            ', '.join(_text(skill) for skill in skills_container.xpath(_SKILL)) if skills_container is not None else 'N/A',
+        ]
+        if with_ids:
+            card = _first(internship, 'ancestor::*[@internshipid][1]')
+            row.append(card.get('internshipid') if card is not None else None)
+        rows.append(row)
+    return rows
+
+
+EXTRACTORS = {
+    'html.parser': extract_with_html_parser,
+    'subtree': extract_with_subtree,
+}
+if lxml is not None:
+    EXTRACTORS['lxml'] = extract_with_lxml
+
+DEFAULT_BACKEND = 'lxml' if lxml is not None else 'subtree'
+
+
+def extract_internships(html, with_ids=False, backend=None):
+    """
+    Extracts (title, company, location, stipend, skills) rows from one Internshala listing page.
+    Returns None when the page has no internship container at all, and [] when it has no listings.
+    With `with_ids`, each row also ends with the listing's `internshipid` attribute (or None).
+    `backend` picks the extractor from EXTRACTORS (fastest available by default).
+    """
+    return EXTRACTORS[backend or DEFAULT_BACKEND](html, with_ids)
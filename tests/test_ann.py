@@ -0,0 +1,71 @@
+# tests/test_ann.py
+# Recall@k of the ANN index options against the exact flat index on a small clustered corpus.
+# The floors are the ones the index options are documented to reach at these settings.
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from matching.ann import build_index, index_kind, set_search_params
+
+K = 10
+
+# (kind, build options, search options, minimum recall@K of the top K, and of the top 10*K)
+RECALL_FLOORS = [
+    ('ivf-flat', {}, {'nprobe': 16}, 0.95, 0.95),
+    ('hnsw', {}, {'ef_search': 128}, 0.95, 0.95),
+    # Product quantisation ranks coarsely: the true top-k is in its top 10*k, to be rescored exactly.
+    ('ivf-pq', {'pq_m': 16}, {'nprobe': 16}, 0.55, 0.95),
+]
+
+
+def clustered_rows(count, dim=64, clusters=64, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    rows = centres[rng.integers(0, clusters, size=count)] + 0.6 * rng.standard_normal((count, dim)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def recall(found, truth):
+    return float(np.mean([len(set(row) & set(true_row)) / truth.shape[1] for row, true_row in zip(found, truth)]))
+
+
+class RecallTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.matrix = clustered_rows(5000)
+        cls.queries = clustered_rows(200, seed=1)
+        _, cls.truth = build_index(cls.matrix, 'flat').search(cls.queries, K)
+
+    def test_flat_is_exact(self):
+        exact = np.argsort(-(self.queries @ self.matrix.T), axis=1, kind='stable')[:, :K]
+        self.assertEqual(recall(exact, self.truth), 1.0)
+
+    def test_ann_indexes_reach_their_recall_floor(self):
+        for kind, build_options, search_options, floor, candidate_floor in RECALL_FLOORS:
+            with self.subTest(kind=kind):
+                index = set_search_params(build_index(self.matrix, kind, **build_options), **search_options)
+                self.assertEqual(index_kind(index), kind)
+                _, found = index.search(self.queries, K)
+                self.assertGreaterEqual(recall(found, self.truth), floor)
+                _, candidates = index.search(self.queries, 10 * K)
+                self.assertGreaterEqual(recall(candidates, self.truth), candidate_floor)
+
+    def test_more_probes_never_lose_recall(self):
+        index = build_index(self.matrix, 'ivf-flat')
+        recalls = []
+        for nprobe in (1, 4, 16):
+            _, found = set_search_params(index, nprobe=nprobe).search(self.queries, K)
+            recalls.append(recall(found, self.truth))
+        self.assertEqual(recalls, sorted(recalls))
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            build_index(self.matrix[:10], 'lsh')
+
+
+if __name__ == '__main__':
+    unittest.main()
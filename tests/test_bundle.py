@@ -0,0 +1,167 @@
+# tests/test_bundle.py
+# The versioned, memory-mapped index bundle: fail-fast loading, atomic version switches and filtered search.
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from matching import bundle as bundle_module
+from matching.ann import build_index
+from matching.bundle import CURRENT, BundleError, current_version, load_bundle, write_bundle
+
+DIM = 32
+
+
+def unit_rows(count, seed=0):
+    matrix = np.random.default_rng(seed).standard_normal((count, DIM)).astype(np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+class BundleTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def write(self, count=50, seed=0, **options):
+        matrix = unit_rows(count, seed)
+        ids = [str(1000 + i) for i in range(count)]
+        metadata = [{'title': f'internship {i}'} for i in range(count)]
+        return write_bundle(self.root, ids, matrix, metadata, 'test-model', **options), matrix
+
+
+class LoadBundleTests(BundleTestCase):
+    def test_round_trip(self):
+        version, matrix = self.write()
+        bundle = load_bundle(self.root, model_name='test-model', dim=DIM, verify=True)
+        self.assertEqual(bundle.version, version)
+        np.testing.assert_array_equal(bundle.matrix, matrix)
+        self.assertEqual(bundle.ids[3], '1003')
+        self.assertEqual(bundle.metadata(3), {'title': 'internship 3'})
+
+    def test_no_bundle(self):
+        with self.assertRaises(BundleError):
+            load_bundle(self.root)
+
+    def test_other_model_or_dimension(self):
+        self.write()
+        with self.assertRaisesRegex(BundleError, 'built with test-model'):
+            load_bundle(self.root, model_name='other-model')
+        with self.assertRaisesRegex(BundleError, '32-d'):
+            load_bundle(self.root, dim=768)
+
+    def test_file_that_does_not_match_the_manifest(self):
+        version, _ = self.write()
+        path = os.path.join(self.root, version, 'embeddings.npy')
+        with open(path, 'r+b') as f:
+            f.seek(-4, os.SEEK_END)
+            f.write(b'\x00\x00\x80\x7f')
+        load_bundle(self.root)  # sizes still match; only verify reads every byte
+        with self.assertRaisesRegex(BundleError, 'checksum'):
+            load_bundle(self.root, verify=True)
+        with open(path, 'ab') as f:
+            f.write(b'\x00')
+        with self.assertRaisesRegex(BundleError, 'does not match the manifest'):
+            load_bundle(self.root)
+
+    def test_unreadable_manifest(self):
+        version, _ = self.write()
+        with open(os.path.join(self.root, version, 'manifest.json'), 'w') as f:
+            f.write('{')
+        with self.assertRaisesRegex(BundleError, 'Unreadable manifest'):
+            load_bundle(self.root)
+
+
+class WriteBundleTests(BundleTestCase):
+    def test_current_moves_only_after_the_version_is_complete(self):
+        self.write()
+        real_write = bundle_module._atomic_write_text
+        seen = {}
+
+        def check_then_write(path, text):
+            new_version = text.strip()
+            seen['current'] = current_version(self.root)
+            with open(os.path.join(self.root, new_version, 'manifest.json'), encoding='utf-8') as f:
+                manifest = json.load(f)
+            seen['files'] = all(os.path.exists(os.path.join(self.root, new_version, name)) for name in manifest['files'])
+            real_write(path, text)
+
+        with mock.patch.object(bundle_module, '_atomic_write_text', check_then_write):
+            version, _ = self.write(seed=1)
+        self.assertEqual(seen, {'current': 'v000001', 'files': True})
+        self.assertEqual(current_version(self.root), version)
+        load_bundle(self.root, verify=True)
+
+    def test_failed_write_leaves_the_live_version_alone(self):
+        self.write()
+        with mock.patch.object(bundle_module.np, 'save', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                self.write(seed=1)
+        self.assertEqual(current_version(self.root), 'v000001')
+        self.assertEqual(sorted(os.listdir(self.root)), [CURRENT, 'v000001'])
+
+    def test_old_versions_are_pruned(self):
+        for seed in range(4):
+            self.write(seed=seed)
+        self.assertEqual(sorted(os.listdir(self.root)), [CURRENT, 'v000003', 'v000004'])
+
+    def test_misaligned_inputs(self):
+        with self.assertRaises(BundleError):
+            write_bundle(self.root, ['1', '2'], unit_rows(3), [{}, {}], 'test-model')
+
+
+class SearchFilteredTests(BundleTestCase):
+    def setUp(self):
+        super().setUp()
+        count = 400
+        self.matrix = unit_rows(count, seed=2)
+        self.query = self.matrix[0]
+        # The location filter holds the rows least like the query, so none of them is in the global top-k.
+        self.rare = np.sort(np.argsort(self.matrix @ self.query)[:30])
+        self.locations = [['pune'] if i in set(self.rare.tolist()) else ['mumbai'] for i in range(count)]
+
+    def check(self, bundle, k=10, exact=True, **options):
+        _, global_top = bundle.search(self.query, k)
+        self.assertFalse(set(global_top[0].tolist()) & set(self.rare.tolist()))
+
+        positions = bundle.filter_positions('location', ' Pune ')
+        np.testing.assert_array_equal(positions, self.rare)
+        scores, found, stats = bundle.search_filtered(self.query, k, positions, **options)
+        # k hits, all inside the filter, best first, with their true scores.
+        self.assertEqual(len(found), k)
+        self.assertLessEqual(set(found.tolist()), set(self.rare.tolist()))
+        np.testing.assert_allclose(scores, self.matrix[found] @ self.query, rtol=1e-5, atol=1e-6)
+        self.assertTrue(np.all(np.diff(scores) <= 1e-6))
+        if exact:
+            best = self.rare[np.argsort(-(self.matrix[self.rare] @ self.query), kind='stable')[:k]]
+            self.assertEqual(found.tolist(), best.tolist())
+        return stats
+
+    def test_exact_scan_inside_the_filter(self):
+        write_bundle(self.root, [str(i) for i in range(len(self.matrix))], self.matrix, [{}] * len(self.matrix),
+                     'test-model', filters={'location': self.locations})
+        self.assertEqual(self.check(load_bundle(self.root))['strategy'], 'exact')
+
+    def test_ann_restricted_to_the_filter(self):
+        write_bundle(self.root, [str(i) for i in range(len(self.matrix))], self.matrix, [{}] * len(self.matrix),
+                     'test-model', ann_index=build_index(self.matrix, 'hnsw'), filters={'location': self.locations})
+        stats = self.check(load_bundle(self.root, ef_search=64), exact=False, exhaustive_limit=0)
+        self.assertTrue(stats['strategy'].startswith('ann'))
+
+    def test_filter_smaller_than_k(self):
+        write_bundle(self.root, [str(i) for i in range(len(self.matrix))], self.matrix, [{}] * len(self.matrix),
+                     'test-model', filters={'location': self.locations})
+        bundle = load_bundle(self.root)
+        _, found, _ = bundle.search_filtered(self.query, 50, bundle.filter_positions('location', 'pune'))
+        self.assertEqual(sorted(found.tolist()), self.rare.tolist())
+        self.assertEqual(len(bundle.filter_positions('location', 'delhi')), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# tests/test_catalog_cache.py
+# The columnar catalog cache: round trip, and when it is rebuilt or merely re-stamped.
+
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from matching import catalog_cache
+from matching.catalog_cache import cache_path_for, load_catalog_cache
+from matching.recommend import skill_matrix_for
+from matching.scoring import SkillMatrix
+
+ROWS = [
+    {'Title': 'Python Developer', 'Company': 'Acme', 'Location': 'Mumbai', 'Skills': 'Python, SQL'},
+    {'Title': 'Content Writer', 'Company': 'Acme', 'Location': 'Work from home', 'Skills': 'Blogging'},
+    {'Title': 'Sales Intern', 'Company': 'Globex', 'Location': 'Mumbai', 'Skills': ''},
+    {'Title': 'Data Analyst', 'Company': 'Globex', 'Location': 'Delhi', 'Skills': 'python ,SQL, , MS  Excel,Python'},
+]
+
+
+class CatalogCacheTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.csv_path = os.path.join(directory, 'internships.csv')
+        self.write_csv(ROWS)
+
+    def write_csv(self, rows):
+        with open(self.csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(ROWS[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def load(self):
+        """Loads the catalog, returning it with the number of builds and CSV hashes that took."""
+        with mock.patch.object(catalog_cache, 'build_catalog_cache', wraps=catalog_cache.build_catalog_cache) as build, \
+                mock.patch.object(catalog_cache, 'file_sha256', wraps=catalog_cache.file_sha256) as sha256:
+            catalog = load_catalog_cache(self.csv_path)
+        return catalog, build.call_count, sha256.call_count
+
+    def test_rows_round_trip(self):
+        catalog, builds, _ = self.load()
+        self.assertEqual(builds, 1)
+        self.assertEqual([dict(row) for row in catalog.rows()], ROWS)
+        self.assertIn('Location', catalog.categorical)
+        self.assertEqual(catalog.to_frame()['Title'].tolist(), [row['Title'] for row in ROWS])
+
+    def test_unchanged_csv_is_neither_rebuilt_nor_hashed(self):
+        self.load()
+        _, builds, hashes = self.load()
+        self.assertEqual((builds, hashes), (0, 0))
+
+    def test_touched_csv_is_hashed_once_then_trusted(self):
+        self.load()
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        _, builds, hashes = self.load()
+        self.assertEqual((builds, hashes), (0, 1))
+        catalog, builds, hashes = self.load()
+        self.assertEqual((builds, hashes), (0, 0))
+        self.assertEqual([dict(row) for row in catalog.rows()], ROWS)
+
+    def test_same_size_edit_rebuilds(self):
+        self.load()
+        edited = [dict(ROWS[0], Location='Mumbay'), *ROWS[1:]]
+        self.write_csv(edited)
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        catalog, builds, _ = self.load()
+        self.assertEqual(builds, 1)
+        self.assertEqual(catalog.row(0)['Location'], 'Mumbay')
+
+    def test_unreadable_cache_is_rebuilt(self):
+        self.load()
+        with open(cache_path_for(self.csv_path), 'wb') as f:
+            f.write(b'not a cache')
+        catalog, builds, _ = self.load()
+        self.assertEqual(builds, 1)
+        self.assertEqual(len(catalog), len(ROWS))
+
+    def test_cache_file_is_readable_by_other_users(self):
+        self.load()
+        self.assertEqual(os.stat(cache_path_for(self.csv_path)).st_mode & 0o777, 0o644)
+
+    def test_pre_split_skills_score_like_split_strings(self):
+        catalog, _, _ = self.load()
+        skills = [row['Skills'] for row in ROWS]
+        for positions in (None, [3, 0]):
+            expected = SkillMatrix(skills if positions is None else [skills[i] for i in positions])
+            matrix = catalog.skill_matrix(positions)
+            for student in ('Python, SQL', 'ms excel, sql', '', 'Blogging'):
+                np.testing.assert_allclose(matrix.jaccard(student), expected.jaccard(student))
+        # Catalog rows (as load_catalog returns them) reuse the cached split instead of re-splitting.
+        expected = SkillMatrix([skills[3], skills[1]]).jaccard('sql, blogging')
+        with mock.patch.object(SkillMatrix, '__init__', side_effect=AssertionError('re-split')):
+            matrix = skill_matrix_for([catalog.row(3), catalog.row(1)])
+        np.testing.assert_allclose(matrix.jaccard('sql, blogging'), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+# tests/test_crawler.py
+# The async crawler against scraping.fixture_server, the local stand-in for internshala.com.
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from aiohttp.test_utils import TestServer
+
+from scraping.crawler import Crawler
+from scraping.fixture_server import REQUESTS, make_app
+
+
+class CrawlerTests(unittest.IsolatedAsyncioTestCase):
+    async def serve(self, faults=None):
+        self.app = make_app(faults=faults)
+        server = TestServer(self.app)
+        await server.start_server()
+        self.addAsyncCleanup(server.close)
+        return str(server.make_url('/'))
+
+    async def crawl(self, base_url, max_pages=10, **options):
+        options = {'rate': 1000.0, 'burst': 100, 'backoff': 0.01, **options}
+        stop_after = options.pop('stop_after', None)
+        self.crawler = Crawler(base_url, **options)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return await self.crawler.crawl(max_pages=max_pages, stop_after=stop_after)
+
+    def requested_pages(self):
+        return [page for page, _ in self.app[REQUESTS]]
+
+    async def test_stops_at_the_first_page_without_listings(self):
+        results = await self.crawl(await self.serve(), concurrency=2)
+        self.assertEqual(sorted(results), [1, 2])
+        self.assertTrue(all(results.values()))
+        self.assertTrue(self.crawler.end_reached)
+        # Page 3 is empty; at most the pages already in flight by then are requested after it.
+        self.assertLessEqual(max(self.requested_pages()), 4)
+
+    async def test_missing_pages_end_the_crawl_instead_of_being_fetched_one_by_one(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            crawler = Crawler(await self.serve(), concurrency=4, rate=1000.0, burst=100)
+            results = await crawler.crawl(max_pages=50)
+        self.assertEqual(sorted(results), [1, 2])
+        # Only pages a worker had already claimed before the end was known are requested past it.
+        pages = self.requested_pages()
+        self.assertLessEqual(max(pages), 2 + 2 * 4)
+        self.assertEqual(len(pages), len(set(pages)))
+        self.assertNotIn('Error on', output.getvalue())
+
+    async def test_stop_after_keeps_the_stopping_page_and_nothing_after_it(self):
+        results = await self.crawl(await self.serve(), concurrency=1, stop_after=lambda rows: True)
+        self.assertEqual(list(results), [1])
+        self.assertFalse(self.crawler.end_reached)
+        self.assertEqual(self.requested_pages(), [1])
+
+    async def test_max_pages_is_not_the_end_of_the_listings(self):
+        results = await self.crawl(await self.serve(), concurrency=1, max_pages=1)
+        self.assertEqual(list(results), [1])
+        self.assertFalse(self.crawler.end_reached)
+
+    async def test_retries_5xx_and_429_honouring_retry_after(self):
+        base_url = await self.serve({1: [(503, {}), (429, {'Retry-After': '0.3'})]})
+        results = await self.crawl(base_url, concurrency=1)
+        self.assertTrue(results[1])
+        times = [at for page, at in self.app[REQUESTS] if page == 1]
+        self.assertEqual(len(times), 3)
+        self.assertGreaterEqual(times[2] - times[1], 0.3)
+
+    async def test_gives_up_after_max_retries(self):
+        base_url = await self.serve({1: [(500, {})] * 3})
+        results = await self.crawl(base_url, concurrency=1, max_retries=2)
+        self.assertIsNone(results[1])
+        self.assertTrue(results[2])
+        self.assertEqual(self.requested_pages().count(1), 3)
+
+    async def test_rate_limit_spaces_requests_to_one_host(self):
+        results = await self.crawl(await self.serve(), concurrency=4, rate=10.0, burst=1)
+        self.assertEqual(sorted(results), [1, 2])
+        times = sorted(at for _, at in self.app[REQUESTS])
+        # One token up front, then one every 1/rate seconds.
+        self.assertGreaterEqual(times[-1] - times[0], (len(times) - 1) / 10.0 * 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
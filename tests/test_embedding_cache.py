@@ -0,0 +1,69 @@
+# tests/test_embedding_cache.py
+# The content-addressed embedding cache: distinct texts are encoded once, and a restart after one new
+# listing encodes only that listing.
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from matching.embedding_cache import CachedEncoder, EmbeddingCache, uncached
+from matching.encoders import HashingEncoder
+
+SKILLS = ['Python, SQL', 'Blogging', 'MS-Excel, Sales', 'Python, SQL', 'Blogging', 'Adobe Photoshop']
+
+
+class CountingEncoder(HashingEncoder):
+    """Records the texts of every batch that reaches the model."""
+
+    def __init__(self):
+        super().__init__('test-model')
+        self.calls = []
+
+    def encode(self, sentences, *args, **kwargs):
+        self.calls.append(list(sentences))
+        return super().encode(sentences, *args, **kwargs)
+
+
+class EmbeddingCacheTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'embeddings.sqlite3')
+
+    def open(self):
+        cache = EmbeddingCache(self.path)
+        self.addCleanup(cache.close)
+        encoder = CountingEncoder()
+        return CachedEncoder(encoder, cache), encoder
+
+    def test_duplicate_texts_are_encoded_once(self):
+        model, encoder = self.open()
+        vectors = model.encode(SKILLS)
+        self.assertEqual(encoder.calls, [list(dict.fromkeys(SKILLS))])
+        self.assertEqual((model.cache.hits, model.cache.misses), (0, 4))
+        np.testing.assert_array_equal(vectors, HashingEncoder('test-model').encode(SKILLS))
+
+    def test_cold_start_after_one_new_listing_encodes_one_text(self):
+        self.open()[0].encode(SKILLS)
+
+        model, encoder = self.open()
+        vectors = model.encode(SKILLS + ['Content Writing'])
+        self.assertEqual(encoder.calls, [['Content Writing']])
+        self.assertEqual((model.cache.hits, model.cache.misses), (4, 1))
+        np.testing.assert_array_equal(vectors, HashingEncoder('test-model').encode(SKILLS + ['Content Writing']))
+
+    def test_uncached_bypasses_the_cache(self):
+        model, encoder = self.open()
+        self.assertIs(uncached(model), encoder)
+        self.assertIs(uncached(encoder), encoder)
+        uncached(model).encode(['Python, SQL'])
+        self.assertEqual(model.encode(['Python, SQL']).shape, (1, encoder.dim))
+        self.assertEqual(model.cache.misses, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# tests/test_encoders.py
+# Encoder backends: fingerprints, the embedding cache, and parity of the optimised backends with torch.
+# The parity tests need the model in the local Hugging Face cache (and torch / onnxruntime); they are
+# skipped otherwise. Pick the model with ENCODER_PARITY_MODEL.
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from matching.embedding_cache import CachedEncoder, EmbeddingCache
+from matching.encoders import BACKENDS, cosine_agreement, encoder_fingerprint, load_encoder, normalize
+
+PARITY_MODEL = os.environ.get('ENCODER_PARITY_MODEL', 'all-MiniLM-L6-v2')
+MIN_COSINE = {'onnx': 0.999, 'torch-int8': 0.98, 'onnx-int8': 0.98}
+
+TEXTS = [
+    'Python Developer. Skills: Python, Django, SQL',
+    'Content Writing. Skills: English Proficiency (Written), Blogging',
+    'Business Development (Sales). Skills: Effective Communication, MS-Excel',
+    'Python, SQL, Machine Learning',
+    'Hindi',
+]
+
+
+def model_is_cached(model_name):
+    """True when the model can be loaded without the network."""
+    try:
+        from huggingface_hub import try_to_load_from_cache
+    except ImportError:
+        return False
+    repo_id = model_name if '/' in model_name else f'sentence-transformers/{model_name}'
+    return isinstance(try_to_load_from_cache(repo_id, 'config.json'), str)
+
+
+class FingerprintTests(unittest.TestCase):
+    def test_every_backend_has_its_own_fingerprint(self):
+        fingerprints = {encoder_fingerprint('all-MiniLM-L6-v2', backend) for backend in BACKENDS}
+        self.assertEqual(len(fingerprints), len(BACKENDS))
+
+    def test_cache_entries_are_not_shared_between_backends(self):
+        cache = EmbeddingCache(':memory:')
+        encoder = CachedEncoder(load_encoder('test-model', 'hashing'), cache)
+        encoder.encode(TEXTS)
+        self.assertEqual(cache.misses, len(TEXTS))
+        encoder.encode(TEXTS)
+        self.assertEqual(cache.hits, len(TEXTS))
+
+        other = CachedEncoder(load_encoder('test-model', 'hashing'), cache)
+        other.backend = 'onnx'  # same vectors, different backend: must not reuse the entries above
+        other.encode(TEXTS)
+        self.assertEqual(cache.misses, 2 * len(TEXTS))
+
+    def test_normalize(self):
+        vectors = normalize(np.array([[3.0, 4.0], [0.0, 0.0]]))
+        np.testing.assert_allclose(vectors, [[0.6, 0.8], [0.0, 0.0]])
+
+
+@unittest.skipUnless(model_is_cached(PARITY_MODEL), f"{PARITY_MODEL} is not in the local Hugging Face cache")
+class BackendParityTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        try:
+            cls.reference = load_encoder(PARITY_MODEL, 'torch')
+        except ImportError as e:
+            raise unittest.SkipTest(f"torch backend unavailable: {e}")
+
+    def test_backends_agree_with_torch(self):
+        for backend, min_cosine in MIN_COSINE.items():
+            with self.subTest(backend=backend):
+                try:
+                    encoder = load_encoder(PARITY_MODEL, backend)
+                except ImportError as e:
+                    self.skipTest(f"{backend} unavailable: {e}")
+                agreement = cosine_agreement(self.reference, encoder, TEXTS)
+                self.assertGreaterEqual(float(agreement.min()), min_cosine)
+
+
+if __name__ == '__main__':
+    unittest.main()
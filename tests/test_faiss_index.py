@@ -0,0 +1,150 @@
+# tests/test_faiss_index.py
+# IncrementalIndex kept up to date from change feeds, and HotSwapIndex following new bundle versions.
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import zlib
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from matching import bundle as bundle_module
+from matching.bundle import CURRENT, load_bundle
+from matching.faiss_index import HotSwapIndex, IncrementalIndex, diff_catalog, faiss_id
+
+DIM = 16
+
+
+def encode(texts):
+    """Deterministic stand-in for the model: a unit vector seeded by the text."""
+    vectors = np.array([np.random.default_rng(zlib.crc32(text.encode('utf-8'))).standard_normal(DIM) for text in texts],
+                       dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def fresh_index(texts):
+    index = IncrementalIndex(DIM, 'test-model')
+    ids = list(texts)
+    index.upsert(ids, [texts[i] for i in ids], encode([texts[i] for i in ids]))
+    return index
+
+
+def ranked_ids(index, queries, k):
+    """Search results as internship ids (scores rounded so equal vectors compare equal)."""
+    by_faiss_id = {faiss_id(internship_id): internship_id for internship_id in index.hashes}
+    scores, found = index.search(queries, k)
+    return [[(by_faiss_id[i], round(float(score), 5)) for score, i in zip(row_scores, row) if i != -1]
+            for row_scores, row in zip(scores, found)]
+
+
+class IncrementalIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.before = {str(i): f'internship {i}' for i in range(1, 41)}
+        self.after = dict(self.before)
+        for i in ('3', '17', '40'):
+            del self.after[i]
+        for i in ('5', '22'):
+            self.after[i] = f'internship {i}, new stipend'
+        self.after.update({'abc-41': 'internship 41', '42': 'internship 42'})
+        self.queries = encode([f'query {i}' for i in range(8)])
+
+    def apply_delta(self):
+        index = fresh_index(self.before)
+        calls = []
+        changes = diff_catalog(self.after, index.hashes)
+        encoded = index.apply(changes, self.after, lambda texts: calls.append(list(texts)) or encode(texts))
+        return index, changes, encoded, calls
+
+    def test_delta_gives_the_same_results_as_a_fresh_build(self):
+        index, changes, encoded, calls = self.apply_delta()
+        self.assertEqual(sorted(changes['removed']), ['17', '3', '40'])
+        self.assertEqual(sorted(changes['updated']), ['22', '5'])
+        self.assertEqual(sorted(changes['added']), ['42', 'abc-41'])
+        # Only the added and updated texts went through the model.
+        self.assertEqual(encoded, 4)
+        self.assertEqual(len(calls), 1)
+
+        fresh = fresh_index(self.after)
+        self.assertEqual(index.ntotal, fresh.ntotal)
+        self.assertEqual(index.hashes, fresh.hashes)
+        self.assertEqual(ranked_ids(index, self.queries, 10), ranked_ids(fresh, self.queries, 10))
+
+    def test_reapplying_an_applied_delta_encodes_nothing(self):
+        index, changes, _, _ = self.apply_delta()
+        self.assertEqual(index.apply(changes, self.after, encode), 0)
+
+    def test_removed_ids_never_come_back(self):
+        index, _, _, _ = self.apply_delta()
+        found = {internship_id for row in ranked_ids(index, self.queries, index.ntotal) for internship_id, _ in row}
+        self.assertEqual(found, set(self.after))
+
+        # Nor after a round trip through a bundle.
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        index.save(root, {internship_id: {'text': text} for internship_id, text in self.after.items()})
+        reloaded = IncrementalIndex.from_bundle(load_bundle(root, verify=True))
+        self.assertEqual(reloaded.hashes, index.hashes)
+        self.assertEqual(ranked_ids(reloaded, self.queries, 10), ranked_ids(index, self.queries, 10))
+
+
+class HotSwapIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.texts = {str(i): f'internship {i}' for i in range(1, 11)}
+        self.index = fresh_index(self.texts)
+        self.index.save(self.root, {})
+        self.hot = HotSwapIndex(os.path.join(self.root, CURRENT), check_interval=0,
+                                load=lambda _: load_bundle(self.root, model_name='test-model', verify=True))
+
+    def test_picks_up_a_new_version(self):
+        self.assertEqual(self.hot.current().version, 'v000001')
+        self.index.upsert(['11'], ['internship 11'], encode(['internship 11']))
+        self.index.save(self.root, {})
+        self.assertEqual(self.hot.current().version, 'v000002')
+        self.assertEqual(self.hot.current().ntotal, 11)
+
+    def test_never_serves_a_version_that_is_still_being_written(self):
+        self.hot.current()
+        served = []
+        real_rename = os.rename
+
+        def rename_then_look(source, target):
+            # The version directory is complete but CURRENT has not moved yet.
+            served.append(self.hot.current().version)
+            real_rename(source, target)
+            served.append(self.hot.current().version)
+
+        self.index.upsert(['11'], ['internship 11'], encode(['internship 11']))
+        with mock.patch.object(bundle_module.os, 'rename', rename_then_look):
+            self.index.save(self.root, {})
+        self.assertEqual(served, ['v000001', 'v000001'])
+        self.assertEqual(self.hot.current().version, 'v000002')
+
+    def test_keeps_serving_the_old_version_when_a_write_fails(self):
+        self.hot.current()
+        with mock.patch.object(bundle_module.json, 'dump', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                self.index.save(self.root, {})
+        self.assertEqual(self.hot.current().version, 'v000001')
+        self.assertEqual(sorted(os.listdir(self.root)), [CURRENT, 'v000001'])
+
+    def test_reloads_are_logged_not_printed(self):
+        self.hot.current()
+        self.index.upsert(['11'], ['internship 11'], encode(['internship 11']))
+        self.index.save(self.root, {})
+        with self.assertLogs('matching.faiss_index', 'INFO') as logs, \
+                contextlib.redirect_stdout(io.StringIO()) as stdout:
+            self.hot.current()
+        self.assertEqual(logs.output, [f"INFO:matching.faiss_index:Reloaded {self.hot.path} (11 vectors)."])
+        self.assertEqual(stdout.getvalue(), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+# tests/test_incremental.py
+# scraping.incremental.scrape_incremental against scraping.fixture_server, serving edited copies of
+# the saved listing pages to stand in for the site changing between runs.
+
+import asyncio
+import contextlib
+import csv
+import io
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from aiohttp import web
+
+from scraping.fixture_server import FIXTURE_DIR, REQUESTS, make_app
+from scraping.incremental import EXPIRED, current_listings, read_delta, scrape_incremental
+
+PAGE_IDS = {1: [str(i) for i in range(1000, 1012)], 2: [str(i) for i in range(1012, 1024)]}
+
+
+def card_pattern(internship_id):
+    """One listing card, from its opening tag up to the next card or the end of the container."""
+    return re.compile(
+        r'      <div class="container-fluid individual_internship[^"]*" internshipid="%s">.*?\n(?=      <div class="container-fluid|    </div>)' % internship_id,
+        re.DOTALL,
+    )
+
+
+class FixtureSite:
+    """scraping.fixture_server on its own event loop thread, serving pages from a writable copy of the fixtures."""
+
+    def __init__(self):
+        self.directory = tempfile.mkdtemp()
+        shutil.copytree(FIXTURE_DIR, self.directory, dirs_exist_ok=True)
+        self.app = make_app(self.directory)
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.runner = web.AppRunner(self.app)
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+
+    async def _start(self):
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        host, port = self.runner.addresses[0][:2]
+        self.url = f'http://{host}:{port}'
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        shutil.rmtree(self.directory)
+
+    def page_path(self, page):
+        return os.path.join(self.directory, 'internships', f'page-{page}')
+
+    def edit(self, page, change):
+        with open(self.page_path(page), encoding='utf-8') as f:
+            html = f.read()
+        edited = change(html)
+        assert edited != html, "the edit changed nothing"
+        with open(self.page_path(page), 'w', encoding='utf-8') as f:
+            f.write(edited)
+
+    def requested_pages(self):
+        pages = [page for page, _ in self.app[REQUESTS]]
+        self.app[REQUESTS].clear()
+        return pages
+
+
+class ScrapeIncrementalTests(unittest.TestCase):
+    def setUp(self):
+        self.site = FixtureSite()
+        self.addCleanup(self.site.close)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.output = os.path.join(directory, 'internships.csv')
+
+    def scrape(self, **options):
+        with contextlib.redirect_stdout(io.StringIO()):
+            delta = scrape_incremental(self.site.url, self.output, rate=1000.0, **options)
+        self.assertEqual(read_delta(os.path.splitext(self.output)[0] + '.delta.json'), delta)
+        return delta
+
+    def log_rows(self):
+        with open(self.output, newline='', encoding='utf-8') as f:
+            return list(csv.DictReader(f))
+
+    def test_first_run_adds_every_listing(self):
+        delta = self.scrape()
+        self.assertEqual(delta['added'], PAGE_IDS[1] + PAGE_IDS[2])
+        self.assertEqual((delta['updated'], delta['removed']), ([], []))
+        self.assertEqual(len(self.log_rows()), 24)
+        self.assertEqual(self.site.requested_pages(), [1, 2, 3])
+
+    def test_stops_at_the_first_page_of_seen_listings(self):
+        self.scrape()
+        self.site.requested_pages()
+        delta = self.scrape()
+        self.assertEqual(self.site.requested_pages(), [1])
+        self.assertEqual((delta['added'], delta['updated'], delta['removed']), ([], [], []))
+        self.assertEqual(len(self.log_rows()), 24)
+
+    def test_changed_listing_is_appended_as_an_update(self):
+        self.scrape()
+        self.site.edit(1, lambda html: html.replace('>Anchoring</a>', '>Anchoring &amp; Hosting</a>'))
+        delta = self.scrape()
+        self.assertEqual((delta['added'], delta['updated'], delta['removed']), ([], ['1001'], []))
+        versions = [row for row in self.log_rows() if row['Id'] == '1001']
+        self.assertEqual([row['Title'] for row in versions], ['Anchoring', 'Anchoring & Hosting'])
+        live = current_listings(self.output)
+        self.assertEqual(len(live), 24)
+        self.assertEqual(next(row for row in live if row['Id'] == '1001')['Title'], 'Anchoring & Hosting')
+
+    def test_vanished_listing_expires_once_the_last_page_is_reached(self):
+        self.scrape()
+        self.site.edit(2, lambda html: card_pattern('1013').sub('', html))
+        # Page 1 is unchanged, so the crawl stops there and cannot tell that 1013 is gone.
+        self.assertEqual(self.scrape()['removed'], [])
+        delta = self.scrape(full=True)
+        self.assertEqual((delta['added'], delta['updated'], delta['removed']), ([], [], ['1013']))
+        self.assertEqual(self.log_rows()[-1]['Status'], EXPIRED)
+        self.assertNotIn('1013', {row['Id'] for row in current_listings(self.output)})
+
+    def test_delta_lists_exactly_the_added_updated_and_removed_ids(self):
+        self.scrape()
+
+        def add_and_change(html):
+            new_card = card_pattern('1001').search(html).group(0)
+            new_card = new_card.replace('1001', '2000').replace('>Anchoring</a>', '>Event Hosting</a>')
+            html = html.replace('<div id="internship_list_container">\n', '<div id="internship_list_container">\n' + new_card)
+            return html.replace('>Anchoring</a>', '>Anchoring &amp; Hosting</a>')
+
+        self.site.edit(1, add_and_change)
+        self.site.edit(2, lambda html: card_pattern('1013').sub('', html))
+        delta = self.scrape(full=True)
+        self.assertEqual((delta['added'], delta['updated'], delta['removed']), (['2000'], ['1001'], ['1013']))
+        self.assertEqual(len(self.log_rows()), 24 + 3)
+        self.assertEqual(len(current_listings(self.output)), 24)
+
+
+if __name__ == '__main__':
+    unittest.main()
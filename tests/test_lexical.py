@@ -0,0 +1,87 @@
+# tests/test_lexical.py
+# The TF-IDF lexical index and the opt-in first stage CatalogScorer builds on it.
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from matching.lexical import LexicalIndex
+from matching.recommend import CatalogScorer
+
+SKILLS = [
+    'Python, Django, SQL',
+    'English Proficiency (Written), Blogging, Content Writing',
+    'Effective Communication, MS-Excel, Sales',
+    'Python, Machine Learning, Data Analytics',
+    'Adobe Photoshop, Graphic Design',
+    'SQL, MS-Excel, Data Analytics',
+]
+
+
+class LexicalIndexTests(unittest.TestCase):
+    def test_adding_documents_scores_like_a_refit(self):
+        grown = LexicalIndex.fit(SKILLS[:3])
+        self.assertEqual(grown.add(SKILLS[3:]).tolist(), [3, 4, 5])
+        refit = LexicalIndex.fit(SKILLS)
+        for query in ('python sql', 'data analytics', 'excel sales', 'photoshop'):
+            np.testing.assert_allclose(grown.scores(query), refit.scores(query), rtol=1e-6, atol=1e-7)
+            self.assertEqual(grown.candidates(query, 3).tolist(), refit.candidates(query, 3).tolist())
+
+    def test_save_and_load_round_trip(self):
+        index = LexicalIndex.fit(SKILLS)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'lexical.npz')
+            index.save(path)
+            loaded = LexicalIndex.load(path)
+        self.assertEqual(loaded.vocabulary, index.vocabulary)
+        np.testing.assert_array_equal(loaded.document_frequency, index.document_frequency)
+        np.testing.assert_allclose(loaded.scores('python data analytics'), index.scores('python data analytics'))
+        # A loaded index keeps growing like the original.
+        loaded.add(['Python, Flask'])
+        index.add(['Python, Flask'])
+        np.testing.assert_allclose(loaded.scores('python flask'), index.scores('python flask'))
+
+    def test_candidates_stay_within_rows(self):
+        index = LexicalIndex.fit(SKILLS)
+        self.assertEqual(set(index.candidates('python sql data analytics', 10)), {0, 3, 5})
+        self.assertEqual(index.candidates('python sql data analytics', 10, rows=[1, 2, 3, 4]).tolist(), [3])
+        self.assertEqual(index.candidates('python', 10, rows=[1, 2]).tolist(), [])
+
+    def test_unknown_terms_match_nothing(self):
+        index = LexicalIndex.fit(SKILLS)
+        self.assertEqual(index.candidates('kubernetes', 10).tolist(), [])
+
+
+class FirstStageTests(unittest.TestCase):
+    def setUp(self):
+        self.internships = [{'Skills': skills, 'Location': 'Mumbai'} for skills in SKILLS]
+        # Row 4 shares no term with the query but is its closest embedding (a paraphrase match).
+        self.embeddings = np.eye(len(SKILLS), dtype=np.float32)
+        self.query = self.embeddings[4]
+        self.profile = {'skills': 'Python, SQL', 'location': 'Mumbai'}
+
+    def test_every_row_is_scored_by_default(self):
+        scorer = CatalogScorer(self.internships, self.embeddings)
+        positions, _, in_location = scorer.rank(self.profile, self.query, top_n=1)
+        self.assertEqual(positions.tolist(), [4])
+        self.assertEqual(in_location, len(SKILLS))
+
+    def test_shortlist_that_cannot_fill_first_stage_falls_back_to_the_location(self):
+        scorer = CatalogScorer(self.internships, self.embeddings, first_stage=4)
+        positions, _, _ = scorer.rank(self.profile, self.query, top_n=1)
+        self.assertEqual(positions.tolist(), [4])
+
+    def test_full_shortlist_limits_scoring_to_keyword_matches(self):
+        scorer = CatalogScorer(self.internships, self.embeddings, first_stage=2)
+        positions, _, in_location = scorer.rank(self.profile, self.query, top_n=5)
+        self.assertEqual(len(positions), 2)
+        self.assertNotIn(4, positions.tolist())
+        self.assertEqual(in_location, len(SKILLS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# tests/test_parsing.py
+# Every extraction backend must give exactly the rows of the original html.parser extractor on the
+# saved listing pages in scraping/fixtures, in-process and in a process pool.
+
+import contextlib
+import functools
+import io
+import os
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from aiohttp.test_utils import TestServer
+
+from scraping.crawler import Crawler
+from scraping.fixture_server import FIXTURE_DIR, make_app
+from scraping.parsing import EXTRACTORS, extract_internships, extract_with_html_parser
+
+PAGES_DIR = os.path.join(FIXTURE_DIR, 'internships')
+
+
+def load_pages():
+    pages = {}
+    for name in sorted(os.listdir(PAGES_DIR)):
+        with open(os.path.join(PAGES_DIR, name), 'rb') as f:
+            pages[name] = f.read()
+    return pages
+
+
+class ExtractorParityTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pages = load_pages()
+        cls.expected = {name: extract_with_html_parser(body, with_ids=True) for name, body in cls.pages.items()}
+
+    def test_fixtures_cover_listings_and_the_empty_last_page(self):
+        self.assertTrue(all(self.expected[name] for name in ('page-1', 'page-2')))
+        self.assertEqual(self.expected['page-3'], [])
+
+    def test_fast_backends_match_html_parser(self):
+        for backend in EXTRACTORS:
+            for name, body in self.pages.items():
+                with self.subTest(backend=backend, page=name):
+                    self.assertEqual(extract_internships(body, with_ids=True, backend=backend), self.expected[name])
+                    without_ids = [row[:-1] for row in self.expected[name]]
+                    self.assertEqual(extract_internships(body, backend=backend), without_ids)
+
+    def test_no_container_is_none_for_every_backend(self):
+        for backend in EXTRACTORS:
+            with self.subTest(backend=backend):
+                self.assertIsNone(extract_internships(b'<html><body><p>Blocked</p></body></html>', backend=backend))
+
+    def test_process_pool_matches_html_parser(self):
+        names = list(self.pages)
+        with ProcessPoolExecutor(2) as pool:
+            for backend in EXTRACTORS:
+                parse = functools.partial(extract_internships, with_ids=True, backend=backend)
+                with self.subTest(backend=backend):
+                    rows = list(pool.map(parse, [self.pages[name] for name in names]))
+                    self.assertEqual(rows, [self.expected[name] for name in names])
+
+
+class CrawlerParseWorkersTests(unittest.IsolatedAsyncioTestCase):
+    async def test_crawl_with_parse_workers_matches_html_parser(self):
+        server = TestServer(make_app())
+        await server.start_server()
+        self.addAsyncCleanup(server.close)
+        pages = load_pages()
+        for backend in EXTRACTORS:
+            with self.subTest(backend=backend):
+                crawler = Crawler(str(server.make_url('/')), concurrency=2, rate=1000.0, burst=100, parse_workers=2)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results = await crawler.crawl(max_pages=5, parse=functools.partial(extract_internships, backend=backend))
+                self.assertEqual(results, {
+                    1: extract_with_html_parser(pages['page-1']),
+                    2: extract_with_html_parser(pages['page-2']),
+                })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# tests/test_quantization.py
+# float16/int8 bundle storage: the compact copy only ranks candidates, so after exact rescoring the
+# top-k must match a float32 scan.
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from matching.bundle import load_bundle, write_bundle
+from matching.quantization import coarse_scores, quantize, rescore
+
+K = 10
+
+
+def clustered_rows(count, dim=64, clusters=32, seed=0):
+    """L2-normalised vectors around topic centres, like listing embeddings."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    rows = centres[rng.integers(0, clusters, size=count)] + 0.6 * rng.standard_normal((count, dim)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+class QuantizeTests(unittest.TestCase):
+    def test_coarse_scores_stay_close_to_float32(self):
+        matrix = clustered_rows(500)
+        queries = clustered_rows(20, seed=1)
+        exact = queries @ matrix.T
+        for precision, tolerance in (('float16', 2e-3), ('int8', 5e-2)):
+            with self.subTest(precision=precision):
+                compact, scale = quantize(matrix, precision)
+                self.assertEqual(compact.dtype, np.dtype(precision))
+                np.testing.assert_allclose(coarse_scores(compact, scale, queries), exact, atol=tolerance)
+                rows = np.array([3, 99, 250])
+                np.testing.assert_allclose(coarse_scores(compact, scale, queries, rows), exact[:, rows], atol=tolerance)
+
+    def test_rescore_is_exact(self):
+        matrix = clustered_rows(100)
+        candidates = np.array([40, 2, 77])
+        np.testing.assert_allclose(rescore(matrix, matrix[0], candidates), matrix[candidates] @ matrix[0], rtol=1e-6)
+
+
+class CompactBundleTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.matrix = clustered_rows(3000)
+        cls.queries = clustered_rows(100, seed=1)
+        cls.roots = {}
+        for precision in ('float32', 'float16', 'int8'):
+            root = cls.roots[precision] = tempfile.mkdtemp()
+            write_bundle(root, [str(i) for i in range(len(cls.matrix))], cls.matrix, [{}] * len(cls.matrix),
+                         'test-model', precision=precision)
+        scores, positions = load_bundle(cls.roots['float32']).search(cls.queries, K)
+        cls.expected_scores, cls.expected = scores, positions
+
+    @classmethod
+    def tearDownClass(cls):
+        for root in cls.roots.values():
+            shutil.rmtree(root)
+
+    def test_rescored_top_k_matches_float32(self):
+        for precision in ('float16', 'int8'):
+            with self.subTest(precision=precision):
+                bundle = load_bundle(self.roots[precision], rescore=100)
+                self.assertEqual(bundle.scan_bytes(), self.matrix.nbytes // (2 if precision == 'float16' else 4))
+                scores, positions = bundle.search(self.queries, K)
+                np.testing.assert_array_equal(positions, self.expected)
+                np.testing.assert_allclose(scores, self.expected_scores, rtol=1e-5, atol=1e-6)
+
+    def test_filtered_scan_matches_float32(self):
+        rows = np.arange(0, len(self.matrix), 7)
+        expected = [rows[np.argsort(-(self.matrix[rows] @ query), kind='stable')[:K]].tolist() for query in self.queries[:20]]
+        for precision in ('float16', 'int8'):
+            with self.subTest(precision=precision):
+                bundle = load_bundle(self.roots[precision], rescore=100)
+                found = [bundle.search_filtered(query, K, rows)[1].tolist() for query in self.queries[:20]]
+                self.assertEqual(found, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
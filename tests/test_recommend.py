@@ -0,0 +1,126 @@
+# tests/test_recommend.py
+# The shared recommendation core (matching.recommend.Recommender) and the batch CLI built on it, run
+# with the offline hashing encoder.
+
+import contextlib
+import csv
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import batch_recommend
+from matching.embedding_cache import CachedEncoder, EmbeddingCache
+from matching.encoders import load_encoder
+from matching.recommend import Recommender
+
+INTERNSHIPS = [
+    {'Title': 'Python Developer', 'Company': 'Acme', 'Location': 'Mumbai', 'Skills': 'Python, Django, SQL'},
+    {'Title': 'Content Writer', 'Company': 'Acme', 'Location': 'Work from home', 'Skills': 'Blogging, Content Writing'},
+    {'Title': 'Sales Intern', 'Company': 'Globex', 'Location': 'Mumbai', 'Skills': 'Effective Communication, MS-Excel'},
+    {'Title': 'Data Analyst', 'Company': 'Initech', 'Location': 'Delhi', 'Skills': 'Python, SQL, Data Analytics'},
+    {'Title': 'Graphic Designer', 'Company': 'Globex', 'Location': 'Work from home', 'Skills': 'Adobe Photoshop'},
+    {'Title': 'ML Intern', 'Company': 'Initech', 'Location': 'Mumbai', 'Skills': 'Python, Machine Learning'},
+    {'Title': 'Excel Intern', 'Company': 'Acme', 'Location': 'Delhi', 'Skills': 'MS-Excel, Data Analytics'},
+]
+
+PROFILES = [
+    {'id': 'a', 'skills': 'Python, SQL', 'location': 'Mumbai'},
+    {'id': 'b', 'skills': ['Blogging', 'Adobe Photoshop'], 'location': 'Work From Home'},
+    {'id': 'c', 'skills': 'MS-Excel, Data Analytics'},
+    {'id': 'd', 'skills': 'Python', 'location': 'Pune'},
+    {'id': 'e', 'skills': '', 'location': 'Delhi'},
+]
+
+
+def ranking(recommendations):
+    return [(rec['internship']['Title'], round(rec['final_score'], 6)) for rec in recommendations]
+
+
+class RecommenderTests(unittest.TestCase):
+    def setUp(self):
+        self.recommender = Recommender(INTERNSHIPS, load_encoder('test-model', 'hashing'), batch_size=2)
+
+    def test_recommend_many_ranks_like_recommend(self):
+        results = list(self.recommender.recommend_many(PROFILES, top_n=3))
+        self.assertEqual([profile['id'] for profile, _, _ in results], [profile['id'] for profile in PROFILES])
+        for profile, recommendations, in_location in results:
+            expected, expected_in_location = self.recommender.recommend(profile, top_n=3)
+            self.assertEqual(ranking(recommendations), ranking(expected))
+            self.assertEqual(in_location, expected_in_location)
+
+    def test_process_pool_matches_a_single_process(self):
+        single = list(self.recommender.recommend_many(PROFILES, top_n=3, workers=1))
+        pooled = list(self.recommender.recommend_many(PROFILES, top_n=3, workers=2))
+        self.assertEqual([(ranking(recs), n) for _, recs, n in pooled], [(ranking(recs), n) for _, recs, n in single])
+
+    def test_location_filter(self):
+        recommendations, in_location = self.recommender.recommend(PROFILES[0], top_n=5)
+        self.assertEqual(in_location, 3)
+        self.assertEqual({rec['internship']['Location'] for rec in recommendations}, {'Mumbai'})
+        self.assertEqual(self.recommender.recommend(PROFILES[3]), ([], 0))
+
+    def test_profiles_are_not_written_to_the_embedding_cache(self):
+        cache = EmbeddingCache(':memory:')
+        recommender = Recommender(INTERNSHIPS, CachedEncoder(load_encoder('test-model', 'hashing'), cache))
+        self.assertEqual(cache.misses, len(INTERNSHIPS))
+        list(recommender.recommend_many(PROFILES))
+        self.assertEqual((cache.hits, cache.misses), (0, len(INTERNSHIPS)))
+
+
+class BatchCLITests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.catalog = os.path.join(self.directory, 'internships.csv')
+        with open(self.catalog, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(INTERNSHIPS[0]))
+            writer.writeheader()
+            writer.writerows(INTERNSHIPS)
+
+    def run_cli(self, profiles_path, *options):
+        output = os.path.join(self.directory, 'ranked.jsonl')
+        argv = ['batch_recommend.py', profiles_path, '--output', output, '--catalog', self.catalog,
+                '--model', 'test-model', '--backend', 'hashing', '--workers', '1', '--top-n', '2', *options]
+        in_memory = lambda encoder: CachedEncoder(encoder, EmbeddingCache(':memory:'))
+        with mock.patch.object(sys, 'argv', argv), mock.patch.object(batch_recommend, 'CachedEncoder', in_memory), \
+                contextlib.redirect_stderr(io.StringIO()):
+            batch_recommend.main()
+        with open(output, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def expected(self, profiles):
+        recommender = Recommender(INTERNSHIPS, load_encoder('test-model', 'hashing'))
+        return [[rec['internship']['Title'] for rec in recommender.recommend(profile, top_n=2)[0]] for profile in profiles]
+
+    def test_jsonl_input(self):
+        path = os.path.join(self.directory, 'profiles.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(profile) + '\n\n' for profile in PROFILES)
+        lines = self.run_cli(path)
+        self.assertEqual([line['index'] for line in lines], list(range(len(PROFILES))))
+        self.assertEqual([line['id'] for line in lines], [profile['id'] for profile in PROFILES])
+        self.assertEqual([[rec['Title'] for rec in line['recommendations']] for line in lines], self.expected(PROFILES))
+        self.assertEqual(lines[3], {'index': 3, 'id': 'd', 'internships_in_location': 0, 'recommendations': []})
+
+    def test_csv_input(self):
+        profiles = [{'id': p['id'], 'skills': p['skills'], 'location': p.get('location', '')}
+                    for p in PROFILES if isinstance(p['skills'], str)]
+        path = os.path.join(self.directory, 'profiles.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=['id', 'skills', 'location'])
+            writer.writeheader()
+            writer.writerows(profiles)
+        lines = self.run_cli(path, '--workers', '2')
+        self.assertEqual([line['id'] for line in lines], [profile['id'] for profile in profiles])
+        self.assertEqual([[rec['Title'] for rec in line['recommendations']] for line in lines], self.expected(profiles))
+        self.assertTrue(all('score' in rec for line in lines for rec in line['recommendations']))
+
+
+if __name__ == '__main__':
+    unittest.main()
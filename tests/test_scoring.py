@@ -0,0 +1,77 @@
+# tests/test_scoring.py
+# SkillMatrix.jaccard against the per-pair set Jaccard the scripts computed before it was vectorised.
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from matching.scoring import SkillMatrix, top_k
+
+INTERNSHIP_SKILLS = [
+    'Python, Django, SQL',
+    '',
+    'python ,  SQL,Python, sql',
+    'MS-Excel, , Sales',
+    'Adobe Photoshop',
+    'PYTHON, Machine Learning, Data Analytics',
+    None,
+]
+
+STUDENT_SKILLS = [
+    'Python, SQL',
+    '  python,sql  ',
+    'Python, Python, SQL, SQL',
+    '',
+    'Sales, , MS-Excel',
+    'Kubernetes',
+    'machine learning, DATA ANALYTICS, python, Photoshop',
+]
+
+
+def keyword_score(student_skills, internship_skills):
+    """The per-pair Jaccard score the recommendation scripts used to compute for every internship."""
+    student_set = set([skill.strip().lower() for skill in student_skills.split(',')])
+    internship_set = set([skill.strip().lower() for skill in (internship_skills or '').split(',')])
+    intersection = student_set.intersection(internship_set)
+    union = student_set.union(internship_set)
+    return 0.0 if not union else len(intersection) / len(union)
+
+
+class SkillMatrixTests(unittest.TestCase):
+    def setUp(self):
+        self.matrix = SkillMatrix(INTERNSHIP_SKILLS)
+
+    def test_jaccard_matches_the_set_based_score(self):
+        for student in STUDENT_SKILLS:
+            with self.subTest(student=student):
+                expected = [keyword_score(student, internship) for internship in INTERNSHIP_SKILLS]
+                np.testing.assert_allclose(self.matrix.jaccard(student), expected, rtol=1e-6)
+
+    def test_jaccard_on_a_subset_of_rows(self):
+        rows = np.array([5, 0, 2])
+        for student in STUDENT_SKILLS:
+            with self.subTest(student=student):
+                expected = [keyword_score(student, INTERNSHIP_SKILLS[row]) for row in rows]
+                np.testing.assert_allclose(self.matrix.jaccard(student, rows=rows), expected, rtol=1e-6)
+
+
+
+class TopKTests(unittest.TestCase):
+    def test_ties_keep_catalog_order(self):
+        scores = np.array([0.5, 0.9, 0.5, 0.1, 0.9, 0.5])
+        self.assertEqual(top_k(scores, 3).tolist(), [1, 4, 0])
+        self.assertEqual(top_k(scores, 4).tolist(), [1, 4, 0, 2])
+        self.assertEqual(top_k(scores).tolist(), [1, 4, 0, 2, 5, 3])
+        self.assertEqual(top_k(scores, 0).tolist(), [])
+
+    def test_matches_a_stable_sort(self):
+        scores = np.random.default_rng(0).integers(0, 5, size=1000).astype(np.float32)
+        for k in (1, 7, 200, 999):
+            with self.subTest(k=k):
+                self.assertEqual(top_k(scores, k).tolist(), np.argsort(-scores, kind='stable')[:k].tolist())
+
+if __name__ == '__main__':
+    unittest.main()